@@ -0,0 +1,234 @@
+"""Baseline schema
+
+Creates every table the application needs. Tables that already exist
+(databases previously bootstrapped with create_all) are left untouched, so
+this revision is safe to run against both empty and legacy databases.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+CAMPAIGN_STATUSES = (
+    "DRAFT", "SUBMITTED", "PENDING_REVIEW", "APPROVED", "REJECTED",
+    "CHANGES_REQUIRED", "ACTIVE", "PAUSED", "COMPLETED", "PENDING",
+)
+COVERAGE_TYPES = ("RADIUS_30", "STATE", "COUNTRY")
+MEDIA_APPROVAL_STATUSES = ("PENDING", "APPROVED", "REJECTED")
+NOTIFICATION_TYPES = (
+    "CAMPAIGN_APPROVED", "CAMPAIGN_REJECTED", "CHANGES_REQUIRED", "CAMPAIGN_SUBMITTED", "SYSTEM",
+)
+
+
+def _enum(name, values):
+    """Enum column type; on Postgres the named type is created once, up front."""
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        postgresql.ENUM(*values, name=name).create(bind, checkfirst=True)
+        return postgresql.ENUM(*values, name=name, create_type=False)
+    return sa.Enum(*values, name=name)
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    campaign_status = _enum("campaignstatus", CAMPAIGN_STATUSES)
+    coverage_type = _enum("coveragetype", COVERAGE_TYPES)
+    media_approval_status = _enum("mediaapprovalstatus", MEDIA_APPROVAL_STATUSES)
+    notification_type = _enum("notificationtype", NOTIFICATION_TYPES)
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("email", sa.String(255), nullable=False),
+            sa.Column("password_hash", sa.String(255), nullable=True),
+            sa.Column("role", sa.String(50), nullable=False),
+            sa.Column("country", sa.String(100), nullable=True),
+            sa.Column("industry", sa.String(255), nullable=True),
+            sa.Column("managed_country", sa.String(10), nullable=True),
+            sa.Column("oauth_provider", sa.String(50), nullable=True),
+            sa.Column("oauth_id", sa.String(255), nullable=True),
+            sa.Column("profile_picture", sa.String(500), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("last_login", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+        op.create_index("ix_users_role", "users", ["role"])
+        op.create_index("ix_users_country", "users", ["country"])
+        op.create_index("ix_users_managed_country", "users", ["managed_country"])
+
+    if "campaigns" not in existing:
+        op.create_table(
+            "campaigns",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("advertiser_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("industry_type", sa.String(100), nullable=False),
+            sa.Column("start_date", sa.Date(), nullable=False),
+            sa.Column("end_date", sa.Date(), nullable=False),
+            sa.Column("budget", sa.Float(), nullable=False),
+            sa.Column("calculated_price", sa.Float(), nullable=True),
+            sa.Column("status", campaign_status, nullable=False),
+            sa.Column("coverage_type", coverage_type, nullable=False),
+            sa.Column("coverage_area", sa.String(255), nullable=True),
+            sa.Column("target_postcode", sa.String(20), nullable=True),
+            sa.Column("target_state", sa.String(100), nullable=True),
+            sa.Column("target_country", sa.String(100), nullable=True),
+            sa.Column("impressions", sa.Integer(), nullable=True),
+            sa.Column("clicks", sa.Integer(), nullable=True),
+            sa.Column("headline", sa.String(500), nullable=True),
+            sa.Column("landing_page_url", sa.String(500), nullable=True),
+            sa.Column("ad_format", sa.String(100), nullable=True),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("tags", sa.JSON(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("submitted_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("admin_message", sa.Text(), nullable=True),
+            sa.Column("reviewed_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("reviewed_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_campaigns_id", "campaigns", ["id"])
+
+    if "invoices" not in existing:
+        op.create_table(
+            "invoices",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("campaign_id", sa.Integer(), sa.ForeignKey("campaigns.id"), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("invoice_number", sa.String(50), nullable=False),
+            sa.Column("amount", sa.Float(), nullable=False),
+            sa.Column("tax_rate", sa.Float(), nullable=True),
+            sa.Column("tax_amount", sa.Float(), nullable=True),
+            sa.Column("total_amount", sa.Float(), nullable=False),
+            sa.Column("currency", sa.String(10), nullable=True),
+            sa.Column("country", sa.String(100), nullable=True),
+            sa.Column("billing_date", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("due_date", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("status", sa.String(20), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("paid_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_invoices_id", "invoices", ["id"])
+        op.create_index("ix_invoices_invoice_number", "invoices", ["invoice_number"], unique=True)
+
+    if "media" not in existing:
+        op.create_table(
+            "media",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("campaign_id", sa.Integer(), sa.ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("file_path", sa.String(500), nullable=False),
+            sa.Column("file_type", sa.String(50), nullable=False),
+            sa.Column("file_size", sa.Integer(), nullable=False),
+            sa.Column("mime_type", sa.String(100), nullable=True),
+            sa.Column("width", sa.Integer(), nullable=True),
+            sa.Column("height", sa.Integer(), nullable=True),
+            sa.Column("duration", sa.Integer(), nullable=True),
+            sa.Column("approved_status", media_approval_status, nullable=True),
+            sa.Column("approved_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("approved_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("rejection_reason", sa.Text(), nullable=True),
+            sa.Column("uploaded_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_media_id", "media", ["id"])
+
+    if "pricing_matrix" not in existing:
+        op.create_table(
+            "pricing_matrix",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("industry_type", sa.String(100), nullable=False),
+            sa.Column("advert_type", sa.String(100), nullable=False),
+            sa.Column("coverage_type", coverage_type, nullable=False),
+            sa.Column("base_rate", sa.Float(), nullable=False),
+            sa.Column("multiplier", sa.Float(), nullable=True),
+            sa.Column("state_discount", sa.Float(), nullable=True),
+            sa.Column("national_discount", sa.Float(), nullable=True),
+            sa.Column("country_id", sa.String(100), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_pricing_matrix_id", "pricing_matrix", ["id"])
+
+    if "geodata" not in existing:
+        op.create_table(
+            "geodata",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("country_code", sa.String(100), nullable=False),
+            sa.Column("state_code", sa.String(100), nullable=True),
+            sa.Column("state_name", sa.String(100), nullable=True),
+            sa.Column("land_area_sq_km", sa.Float(), nullable=False),
+            sa.Column("population", sa.Integer(), nullable=False),
+            sa.Column("radius_areas_count", sa.Integer(), nullable=True),
+            sa.Column("density_multiplier", sa.Float(), nullable=True),
+            sa.Column("urban_percentage", sa.Float(), nullable=True),
+            sa.Column("tax_rate", sa.Float(), nullable=True),
+            sa.Column("fips", sa.Integer(), nullable=True),
+            sa.Column("density_mi", sa.Float(), nullable=True),
+            sa.Column("rank", sa.Integer(), nullable=True),
+            sa.Column("population_percent", sa.Float(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_geodata_id", "geodata", ["id"])
+        op.create_index("ix_geodata_country_code", "geodata", ["country_code"])
+        op.create_index("ix_geodata_state_code", "geodata", ["state_code"])
+        op.create_index("ix_geodata_state_name", "geodata", ["state_name"])
+
+    if "payment_transactions" not in existing:
+        op.create_table(
+            "payment_transactions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("campaign_id", sa.Integer(), sa.ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("stripe_payment_intent_id", sa.String(255), nullable=False, unique=True),
+            sa.Column("stripe_charge_id", sa.String(255), nullable=True),
+            sa.Column("amount", sa.Float(), nullable=False),
+            sa.Column("currency", sa.String(10), nullable=True),
+            sa.Column("status", sa.String(50), nullable=False),
+            sa.Column("payment_method", sa.String(50), nullable=True),
+            sa.Column("receipt_url", sa.String(500), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_payment_transactions_id", "payment_transactions", ["id"])
+
+    if "notifications" not in existing:
+        op.create_table(
+            "notifications",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("campaign_id", sa.Integer(), sa.ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=True),
+            sa.Column("notification_type", notification_type, nullable=False),
+            sa.Column("title", sa.String(255), nullable=False),
+            sa.Column("message", sa.Text(), nullable=False),
+            sa.Column("is_read", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("read_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_notifications_id", "notifications", ["id"])
+
+
+def downgrade() -> None:
+    for table in (
+        "notifications", "payment_transactions", "geodata", "pricing_matrix",
+        "media", "invoices", "campaigns", "users",
+    ):
+        op.drop_table(table)
+    if op.get_bind().dialect.name == "postgresql":
+        for name in ("notificationtype", "mediaapprovalstatus", "coveragetype", "campaignstatus"):
+            op.execute(f"DROP TYPE IF EXISTS {name}")
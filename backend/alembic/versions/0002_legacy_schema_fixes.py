@@ -0,0 +1,86 @@
+"""Legacy schema fixes
+
+Folds the ad hoc fix-up scripts (add_tax_rate_col.py, migrate_invoices.py,
+migrate_add_industry_column.py, migrate_postgres.py, ...) and the boot-time
+ALTERs that used to live in init_db() into one revision. Every step checks
+the live schema first, so databases that already received some of the
+fixes are upgraded cleanly.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+# Columns that were added to the models after the first deployments
+LATE_COLUMNS = {
+    "users": [
+        sa.Column("industry", sa.String(255), nullable=True),
+        sa.Column("managed_country", sa.String(10), nullable=True),
+        sa.Column("oauth_provider", sa.String(50), nullable=True),
+        sa.Column("oauth_id", sa.String(255), nullable=True),
+        sa.Column("profile_picture", sa.String(500), nullable=True),
+        sa.Column("last_login", sa.DateTime(timezone=True), nullable=True),
+    ],
+    "campaigns": [
+        sa.Column("headline", sa.String(500), nullable=True),
+        sa.Column("landing_page_url", sa.String(500), nullable=True),
+        sa.Column("ad_format", sa.String(100), nullable=True),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("admin_message", sa.Text(), nullable=True),
+        sa.Column("reviewed_by", sa.Integer(), nullable=True),
+        sa.Column("reviewed_at", sa.DateTime(timezone=True), nullable=True),
+    ],
+    "geodata": [
+        sa.Column("radius_areas_count", sa.Integer(), nullable=True, server_default="1"),
+        sa.Column("urban_percentage", sa.Float(), nullable=True),
+        sa.Column("tax_rate", sa.Float(), nullable=True, server_default="0"),
+        sa.Column("fips", sa.Integer(), nullable=True),
+        sa.Column("density_mi", sa.Float(), nullable=True),
+        sa.Column("rank", sa.Integer(), nullable=True),
+        sa.Column("population_percent", sa.Float(), nullable=True),
+    ],
+    "invoices": [
+        sa.Column("country", sa.String(100), nullable=True),
+        sa.Column("tax_rate", sa.Float(), nullable=True, server_default="0"),
+        sa.Column("tax_amount", sa.Float(), nullable=True, server_default="0"),
+    ],
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, columns in LATE_COLUMNS.items():
+        present = {col["name"] for col in inspector.get_columns(table)}
+        missing = [col for col in columns if col.name not in present]
+        if not missing:
+            continue
+        with op.batch_alter_table(table) as batch:
+            for column in missing:
+                batch.add_column(column)
+
+    if bind.dialect.name == "postgresql":
+        # Early Railway deployments created users.role as a native 'userrole' enum.
+        # The model stores it as a plain string so mixed-case legacy values load.
+        row = bind.execute(sa.text(
+            "SELECT data_type, udt_name FROM information_schema.columns "
+            "WHERE table_name = 'users' AND column_name = 'role'"
+        )).fetchone()
+        if row and (row[0] == "USER-DEFINED" or row[1] == "userrole"):
+            op.execute("ALTER TABLE users ALTER COLUMN role TYPE VARCHAR(50) USING role::text")
+
+
+def downgrade() -> None:
+    # The legacy columns are part of the baseline models; nothing to undo.
+    pass
@@ -0,0 +1,41 @@
+"""Performance indexes
+
+Indexes for the lookups that run on every pricing request and login:
+- pricing_matrix by (country, industry, advert type, coverage)
+- geodata by (country, state)
+- users by lower(email) (case-insensitive login)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_pricing_matrix_lookup", "pricing_matrix", ["country_id", "industry_type", "advert_type", "coverage_type"]),
+    ("ix_pricing_matrix_country_advert", "pricing_matrix", ["country_id", "advert_type"]),
+    ("ix_geodata_country_state", "geodata", ["country_code", "state_code"]),
+    ("ix_users_email_lower", "users", [sa.text("lower(email)")]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name in {ix["name"] for ix in inspector.get_indexes(table)}:
+            continue
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
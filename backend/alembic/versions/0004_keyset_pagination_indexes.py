@@ -0,0 +1,54 @@
+"""Keyset pagination indexes
+
+Composite (…, created_at, id) indexes so cursor-paginated listings seek
+straight to the page instead of scanning past an offset:
+- campaigns: all, per advertiser, per target country
+- users: all, per country (country admins)
+- payment_transactions: all, per user
+
+Rows created before created_at had a server default are backfilled, since
+the keyset comparison skips NULLs.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_campaigns_created_id", "campaigns", ["created_at", "id"]),
+    ("ix_campaigns_advertiser_created_id", "campaigns", ["advertiser_id", "created_at", "id"]),
+    ("ix_campaigns_country_created_id", "campaigns", ["target_country", "created_at", "id"]),
+    ("ix_users_created_id", "users", ["created_at", "id"]),
+    ("ix_users_country_created_id", "users", ["country", "created_at", "id"]),
+    ("ix_payment_transactions_created_id", "payment_transactions", ["created_at", "id"]),
+    ("ix_payment_transactions_user_created_id", "payment_transactions", ["user_id", "created_at", "id"]),
+]
+
+
+BACKFILL_TABLES = ["campaigns", "users", "payment_transactions"]
+
+
+def upgrade() -> None:
+    for table in BACKFILL_TABLES:
+        op.execute(sa.text(f"UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"))
+
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name in {ix["name"] for ix in inspector.get_indexes(table)}:
+            continue
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
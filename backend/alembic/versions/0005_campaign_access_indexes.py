@@ -0,0 +1,52 @@
+"""Campaign access-pattern indexes
+
+Derived from the queries the routers actually run:
+- campaigns: advertiser + country (advertiser list), country + status
+  (country admin views), status + submitted_at (approval queue); plain
+  advertiser_id lookups use the 0004 (advertiser_id, created_at, id) prefix
+- invoices / media / notifications / payment_transactions: foreign keys
+  (also used by cascade deletes) and the status columns they are filtered by
+
+Check with scripts/check_query_plans.py.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_campaigns_advertiser_country_created", "campaigns", ["advertiser_id", "target_country", "created_at"]),
+    ("ix_campaigns_country_status", "campaigns", ["target_country", "status"]),
+    ("ix_campaigns_status_submitted", "campaigns", ["status", "submitted_at"]),
+    ("ix_invoices_campaign_id", "invoices", ["campaign_id"]),
+    ("ix_invoices_user_status", "invoices", ["user_id", "status"]),
+    ("ix_media_campaign_id", "media", ["campaign_id"]),
+    ("ix_media_status_uploaded", "media", ["approved_status", "uploaded_at"]),
+    ("ix_notifications_user_created", "notifications", ["user_id", "created_at"]),
+    ("ix_notifications_user_unread", "notifications", ["user_id", "is_read"]),
+    ("ix_notifications_campaign_id", "notifications", ["campaign_id"]),
+    ("ix_payment_transactions_campaign_status", "payment_transactions", ["campaign_id", "status"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name in {ix["name"] for ix in inspector.get_indexes(table)}:
+            continue
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,107 @@
+"""Campaign full-text search
+
+Search index over campaign name, tags, headline and description (weighted
+in that order), used by GET /api/admin/campaigns/search (app/search.py):
+
+- PostgreSQL: a stored generated tsvector column plus a GIN index; the
+  database keeps it current on every insert/update.
+- SQLite: an external-content FTS5 table kept in sync by triggers, so bulk
+  inserts and raw SQL writes are indexed too.
+
+Other databases get nothing and search falls back to LIKE filters.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(tags::text, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(headline, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+SQLITE_COLUMNS = "name, headline, description, tags"
+
+SQLITE_TRIGGERS = {
+    "campaigns_fts_ai": f"""
+        CREATE TRIGGER campaigns_fts_ai AFTER INSERT ON campaigns BEGIN
+            INSERT INTO campaigns_fts(rowid, {SQLITE_COLUMNS})
+            VALUES (new.id, new.name, new.headline, new.description, new.tags);
+        END""",
+    "campaigns_fts_ad": f"""
+        CREATE TRIGGER campaigns_fts_ad AFTER DELETE ON campaigns BEGIN
+            INSERT INTO campaigns_fts(campaigns_fts, rowid, {SQLITE_COLUMNS})
+            VALUES ('delete', old.id, old.name, old.headline, old.description, old.tags);
+        END""",
+    "campaigns_fts_au": f"""
+        CREATE TRIGGER campaigns_fts_au AFTER UPDATE OF {SQLITE_COLUMNS} ON campaigns BEGIN
+            INSERT INTO campaigns_fts(campaigns_fts, rowid, {SQLITE_COLUMNS})
+            VALUES ('delete', old.id, old.name, old.headline, old.description, old.tags);
+            INSERT INTO campaigns_fts(rowid, {SQLITE_COLUMNS})
+            VALUES (new.id, new.name, new.headline, new.description, new.tags);
+        END""",
+}
+
+
+def _upgrade_postgresql(inspector) -> None:
+    if "search_vector" not in {c["name"] for c in inspector.get_columns("campaigns")}:
+        op.execute(sa.text(
+            f"ALTER TABLE campaigns ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({POSTGRES_VECTOR}) STORED"
+        ))
+    op.execute(sa.text("CREATE INDEX IF NOT EXISTS ix_campaigns_search_vector ON campaigns USING gin (search_vector)"))
+
+
+def _upgrade_sqlite(inspector) -> None:
+    bind = op.get_bind()
+    if "campaigns_fts" not in inspector.get_table_names():
+        try:
+            op.execute(sa.text(
+                f"CREATE VIRTUAL TABLE campaigns_fts USING fts5({SQLITE_COLUMNS}, "
+                "content='campaigns', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')"
+            ))
+        except sa.exc.OperationalError as e:
+            # SQLite built without FTS5: search falls back to LIKE filters
+            logger.warning("FTS5 unavailable, campaign search will scan: %s", e)
+            return
+    existing = {row[0] for row in bind.execute(sa.text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))}
+    for name, ddl in SQLITE_TRIGGERS.items():
+        if name not in existing:
+            op.execute(sa.text(ddl))
+    # Index the campaigns that already exist
+    op.execute(sa.text("INSERT INTO campaigns_fts(campaigns_fts) VALUES ('rebuild')"))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if bind.dialect.name == "postgresql":
+        _upgrade_postgresql(inspector)
+    elif bind.dialect.name == "sqlite":
+        _upgrade_sqlite(inspector)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(sa.text("DROP INDEX IF EXISTS ix_campaigns_search_vector"))
+        op.execute(sa.text("ALTER TABLE campaigns DROP COLUMN IF EXISTS search_vector"))
+    elif bind.dialect.name == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            op.execute(sa.text(f"DROP TRIGGER IF EXISTS {name}"))
+        op.execute(sa.text("DROP TABLE IF EXISTS campaigns_fts"))
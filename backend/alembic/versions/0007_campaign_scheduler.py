@@ -0,0 +1,65 @@
+"""Campaign lifecycle scheduler
+
+- scheduler_leases: one row per periodic job; the worker holding an
+  unexpired lease runs it (app/scheduler.py)
+- notificationtype: CAMPAIGN_ACTIVATED and CAMPAIGN_COMPLETED
+- ix_campaigns_approved_start / ix_campaigns_active_end: partial indexes
+  for the scheduler's "APPROVED and started" / "ACTIVE and ended" scans
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+NEW_NOTIFICATION_TYPES = ("CAMPAIGN_ACTIVATED", "CAMPAIGN_COMPLETED")
+
+# (name, table, columns, partial-index predicate)
+INDEXES = [
+    ("ix_campaigns_approved_start", "campaigns", ["status", "start_date"], "status = 'APPROVED'"),
+    ("ix_campaigns_active_end", "campaigns", ["status", "end_date"], "status = 'ACTIVE'"),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "scheduler_leases" not in inspector.get_table_names():
+        op.create_table(
+            "scheduler_leases",
+            sa.Column("name", sa.String(100), primary_key=True),
+            sa.Column("owner", sa.String(255), nullable=True),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("last_run_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+    if bind.dialect.name == "postgresql":
+        # ALTER TYPE ... ADD VALUE cannot run inside a transaction block before PG 12
+        with op.get_context().autocommit_block():
+            for value in NEW_NOTIFICATION_TYPES:
+                op.execute(sa.text(f"ALTER TYPE notificationtype ADD VALUE IF NOT EXISTS '{value}'"))
+
+    for name, table, columns, where in INDEXES:
+        if name in {ix["name"] for ix in inspector.get_indexes(table)}:
+            continue
+        op.create_index(
+            name, table, columns,
+            postgresql_where=sa.text(where), sqlite_where=sa.text(where),
+        )
+
+
+def downgrade() -> None:
+    # Postgres cannot drop enum values; the two notification types stay
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_table("scheduler_leases")
@@ -0,0 +1,41 @@
+"""Advertiser dashboard summaries
+
+advertiser_summaries: one row per advertiser with campaign counts by
+status, budget, spend, impressions, clicks and unread notifications,
+maintained by app/summaries.py. Rows are created on the advertiser's next
+write or dashboard load; `python -m app.summaries` rebuilds them all.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "advertiser_summaries" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "advertiser_summaries",
+        sa.Column("advertiser_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("total_campaigns", sa.Integer(), nullable=False),
+        sa.Column("status_counts", sa.JSON(), nullable=False),
+        sa.Column("total_budget", sa.Float(), nullable=False),
+        sa.Column("total_spent", sa.Float(), nullable=False),
+        sa.Column("impressions", sa.BigInteger(), nullable=False),
+        sa.Column("clicks", sa.BigInteger(), nullable=False),
+        sa.Column("unread_notifications", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("advertiser_summaries")
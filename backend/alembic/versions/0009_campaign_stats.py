@@ -0,0 +1,46 @@
+"""Campaign time series tables
+
+campaign_stats_hourly: impressions/clicks per campaign per UTC hour,
+written by event ingestion. campaign_stats_daily: the same per UTC day,
+rolled up from the hourly rows by the scheduler (see app/timeseries.py).
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if "campaign_stats_hourly" not in tables:
+        op.create_table(
+            "campaign_stats_hourly",
+            sa.Column("campaign_id", sa.Integer(), sa.ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("bucket", sa.DateTime(), primary_key=True),
+            sa.Column("impressions", sa.BigInteger(), nullable=False),
+            sa.Column("clicks", sa.BigInteger(), nullable=False),
+        )
+        op.create_index("ix_campaign_stats_hourly_bucket", "campaign_stats_hourly", ["bucket"])
+    if "campaign_stats_daily" not in tables:
+        op.create_table(
+            "campaign_stats_daily",
+            sa.Column("campaign_id", sa.Integer(), sa.ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("bucket", sa.Date(), primary_key=True),
+            sa.Column("impressions", sa.BigInteger(), nullable=False),
+            sa.Column("clicks", sa.BigInteger(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("campaign_stats_daily")
+    op.drop_index("ix_campaign_stats_hourly_bucket", table_name="campaign_stats_hourly")
+    op.drop_table("campaign_stats_hourly")
@@ -0,0 +1,52 @@
+"""Campaign breakdown tables
+
+dimension_values: dictionary of event dimension values (device, state,
+ad_format) to small integer ids. campaign_stats_breakdown:
+impressions/clicks per campaign per UTC day and combination of dimension
+ids, written by event ingestion, and campaign_stats_breakdown_monthly: the
+same per calendar month (see app/dimensions.py, app/timeseries.py).
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if "dimension_values" not in tables:
+        op.create_table(
+            "dimension_values",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("dimension", sa.String(20), nullable=False),
+            sa.Column("value", sa.String(64), nullable=False),
+        )
+        op.create_index("ix_dimension_values_dimension_value", "dimension_values", ["dimension", "value"], unique=True)
+    for name in ("campaign_stats_breakdown", "campaign_stats_breakdown_monthly"):
+        if name not in tables:
+            op.create_table(
+                name,
+                sa.Column("campaign_id", sa.Integer(), sa.ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True),
+                sa.Column("bucket", sa.Date(), primary_key=True),
+                sa.Column("device_id", sa.Integer(), primary_key=True, autoincrement=False),
+                sa.Column("state_id", sa.Integer(), primary_key=True, autoincrement=False),
+                sa.Column("ad_format_id", sa.Integer(), primary_key=True, autoincrement=False),
+                sa.Column("impressions", sa.BigInteger(), nullable=False),
+                sa.Column("clicks", sa.BigInteger(), nullable=False),
+            )
+
+
+def downgrade() -> None:
+    op.drop_table("campaign_stats_breakdown_monthly")
+    op.drop_table("campaign_stats_breakdown")
+    op.drop_index("ix_dimension_values_dimension_value", table_name="dimension_values")
+    op.drop_table("dimension_values")
@@ -0,0 +1,32 @@
+"""Campaign reach sketches
+
+campaign_reach_daily: a HyperLogLog sketch of each campaign's distinct
+viewers per UTC day, merged into by event ingestion (see app/reach.py).
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "campaign_reach_daily" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "campaign_reach_daily",
+            sa.Column("campaign_id", sa.Integer(), sa.ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("bucket", sa.Date(), primary_key=True),
+            sa.Column("sketch", sa.LargeBinary(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("campaign_reach_daily")
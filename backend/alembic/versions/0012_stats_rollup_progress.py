@@ -0,0 +1,30 @@
+"""Campaign stats rollup progress
+
+scheduler_leases.rolled_up_through: the last day the daily stats rollup
+has written for good (see app/timeseries.py), so a rollup that has not run
+for a while catches up instead of skipping days.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "rolled_up_through" not in {c["name"] for c in sa.inspect(op.get_bind()).get_columns("scheduler_leases")}:
+        with op.batch_alter_table("scheduler_leases") as batch:
+            batch.add_column(sa.Column("rolled_up_through", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("scheduler_leases") as batch:
+        batch.drop_column("rolled_up_through")
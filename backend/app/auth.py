@@ -4,6 +4,7 @@ Provides secure user authentication and authorization.
 """
 from datetime import datetime, timedelta
 from typing import Optional, Union
+import logging
 from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status, Request
@@ -11,10 +12,12 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from .config import settings
-from .database import get_db
+from .database import get_db, bookkeeping
 from . import models, schemas
 from .utils import geo_ip
 
+logger = logging.getLogger(__name__)
+
 # Password hashing context removed in favor of direct bcrypt usage
 
 # OAuth2 scheme for token extraction from Authorization header
@@ -32,7 +35,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
             hashed_password.encode("utf-8")
         )
     except Exception as e:
-        print(f"❌ Password verification error: {e}")
+        logger.warning("❌ Password verification error: %s", e)
         return False
 
 
@@ -118,7 +121,7 @@ def decode_token(token: str) -> dict:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError as e:
-        print(f"JWT DECODE ERROR: {e}")
+        logger.info("JWT DECODE ERROR: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -171,40 +174,39 @@ async def get_current_user(
     )
     
     try:
-        # Debug: Log the token arrival (masked)
-        token_preview = f"{token[:10]}...{token[-10:]}" if token and len(token) > 20 else "short_token"
-        
         payload = decode_token(token)
         sub = payload.get("sub")
         if sub is None:
-            print(f"❌ AUTH ERROR: Token payload missing 'sub'. Payload: {payload}")
+            logger.warning("❌ AUTH ERROR: Token payload missing 'sub'. Payload: %s", payload)
             raise credentials_exception
         try:
             user_id = int(sub)
         except (ValueError, TypeError):
-            print(f"❌ AUTH ERROR: Invalid user ID format in token sub: '{sub}' (expects integer)")
+            logger.warning("❌ AUTH ERROR: Invalid user ID format in token sub: '%s' (expects integer)", sub)
             raise credentials_exception
     except HTTPException as e:
         # Re-raise our own 401s
         raise e
     except Exception as e:
-        print(f"❌ AUTH ERROR: Token decode failed: {type(e).__name__} - {str(e)}")
+        logger.warning("❌ AUTH ERROR: Token decode failed: %s - %s", type(e).__name__, e)
         raise credentials_exception
     
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if user is None:
-        print(f"❌ AUTH ERROR: User ID {user_id} found in token payload but NOT in database tables.")
+        logger.warning("❌ AUTH ERROR: User ID %s found in token payload but NOT in database tables.", user_id)
         raise credentials_exception
     
-    print(f"✅ AUTH: Validated user {user.email} (ID: {user.id})")
+    logger.debug("✅ AUTH: Validated user %s (ID: %s)", user.email, user.id)
     
     # Update last login (non-critical, wrap in try to prevent request crash)
+    # Bookkeeping write: must not pin the rest of the request to the primary
     try:
-        user.last_login = datetime.utcnow()
-        db.commit()
+        with bookkeeping(db):
+            user.last_login = datetime.utcnow()
+            db.commit()
     except Exception as e:
         db.rollback()
-        print(f"⚠️ Warning: Failed to update last_login: {e}")
+        logger.warning("⚠️ Failed to update last_login: %s", e)
     
     return user
 
@@ -234,8 +236,9 @@ async def get_current_user_optional(
         user = db.query(models.User).filter(models.User.id == user_id).first()
         if user:
             try:
-                user.last_login = datetime.utcnow()
-                db.commit()
+                with bookkeeping(db):
+                    user.last_login = datetime.utcnow()
+                    db.commit()
             except Exception:
                 db.rollback()
             return user
@@ -339,14 +342,14 @@ async def verify_geo_access(
     role = str(current_user.role).lower() if current_user.role else ""
     if role == "admin" or skip_check:
         if skip_check:
-            print(f"⏩ GEO BYPASS: Skipping geo-check for {current_user.email} (SKIP_GEO_CHECK=true)")
+            logger.debug("⏩ GEO BYPASS: Skipping geo-check for %s (SKIP_GEO_CHECK=true)", current_user.email)
         return (current_user.country or "US").upper()
 
     # 3. Detect country from IP
     detected_country = await geo_ip.get_country_from_ip(request)
     user_country = (current_user.country or "US").upper()
     
-    print(f"🌍 GEO CHECK: User={current_user.email}, Profile={user_country}, Detected={detected_country}")
+    logger.debug("🌍 GEO CHECK: User=%s, Profile=%s, Detected=%s", current_user.email, user_country, detected_country)
     
     if detected_country:
         detected_country = detected_country.upper()
@@ -357,7 +360,7 @@ async def verify_geo_access(
             
             # If the user is clearly a tester/dev (indicated by email or role), we could be more lenient
             # For now, let's keep it strict but documented
-            print(f"❌ GEO DENIED: {detected_country} != {user_country}")
+            logger.warning("❌ GEO DENIED: %s != %s (user %s)", detected_country, user_country, current_user.email)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access Denied: Your IP location ({detected_country}) does not match your registered country ({user_country}). To bypass this, set SKIP_GEO_CHECK=true in environment."
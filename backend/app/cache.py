@@ -0,0 +1,234 @@
+"""
+Table-version response caching.
+
+Every table has an in-process version counter that is bumped after a commit
+that wrote to it (ORM flushes and bulk insert/update/delete statements are
+both tracked). The @cached_response decorator derives an ETag from the
+route, its parameters, the caller's principal scope and the versions of the
+tables the endpoint reads:
+
+- If-None-Match matches  -> 304 Not Modified, the endpoint is not called
+- cached body still valid -> served from memory (gzip/brotli variants are
+  kept alongside, so no per-request encoding either)
+- otherwise               -> the endpoint runs and its body is cached
+
+Versions are per process. Writes made by another worker (or raw SQL) are
+only picked up once the CACHE_TTL window rolls over (the window is part of
+the ETag), and the process id is too, so one worker never answers 304 for
+another worker's body.
+"""
+import functools
+import hashlib
+import inspect
+import time
+import uuid
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import orjson
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_mapper
+
+from . import metrics
+from .config import settings
+from .responses import PrecompressedJSON
+
+_PENDING_KEY = "cache_written_tables"
+_INSTANCE = uuid.uuid4().hex[:8]
+# Bodies larger than this are compressed at the middleware levels rather than
+# the maximum, so a cache miss on a big listing stays cheap
+_MAX_LEVEL_BODY_SIZE = 64 * 1024
+
+_versions: Dict[str, int] = {}
+# key -> (etag, payload); OrderedDict as an LRU
+_store: "OrderedDict[Tuple, Tuple[str, PrecompressedJSON]]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "not_modified": 0}
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+# ==================== Table versions ====================
+
+def table_versions(tables: Iterable[str]) -> Tuple[int, ...]:
+    return tuple(_versions.get(name, 0) for name in tables)
+
+
+def bump(*tables: str):
+    """Mark tables as changed, invalidating every cached response that reads them."""
+    for name in tables:
+        _versions[name] = _versions.get(name, 0) + 1
+
+
+def clear():
+    """Drop all cached bodies (versions are kept)."""
+    _store.clear()
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    pending = _pending(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        pending.update(table.name for table in object_mapper(obj).tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            _pending(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session):
+    # Bump only once the data is visible to other sessions
+    tables = session.info.pop(_PENDING_KEY, None)
+    if tables:
+        bump(*tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ==================== Response cache ====================
+
+def _digest(key: Tuple, versions: Tuple[int, ...], ttl: int) -> str:
+    window = int(time.time() // ttl) if ttl > 0 else 0
+    return hashlib.blake2b(repr((key, versions, window, _INSTANCE)).encode(), digest_size=12).hexdigest()
+
+
+def _etag(key: Tuple, versions: Tuple[int, ...], ttl: int) -> str:
+    return f'W/"{_digest(key, versions, ttl)}"'
+
+
+def version_tag(key: Any, *tables: Any, ttl: Optional[int] = None) -> str:
+    """
+    Opaque tag for data identified by `key` that is derived from `tables`
+    (models or table names): it changes whenever one of them is written, or
+    the CACHE_TTL window rolls over, exactly like a @cached_response ETag.
+    """
+    names = tuple(getattr(t, "__tablename__", t) for t in tables)
+    return _digest(key, table_versions(names), ttl if ttl is not None else settings.CACHE_TTL)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    # Weak comparison: W/"x" matches "x"
+    opaque = etag[2:]
+    return any(tag.removeprefix("W/") == opaque for tag in candidates)
+
+
+def _serialize(request: Request, result: Any) -> bytes:
+    """Encode `result` the way FastAPI would for this route's response_model."""
+    route = request.scope.get("route")
+    response_model = getattr(route, "response_model", None)
+    if response_model is None:
+        return orjson.dumps(jsonable_encoder(result), option=orjson.OPT_NON_STR_KEYS)
+    adapter = _adapters.get(response_model)
+    if adapter is None:
+        adapter = _adapters[response_model] = TypeAdapter(response_model)
+    return adapter.dump_json(adapter.validate_python(result, from_attributes=True), by_alias=True)
+
+
+def _store_payload(key: Tuple, etag: str, payload: PrecompressedJSON):
+    _store[key] = (etag, payload)
+    _store.move_to_end(key)
+    while len(_store) > settings.CACHE_MAX_ENTRIES:
+        _store.popitem(last=False)
+
+
+def cached_response(*tables: Any, principal: Optional[Callable[[Dict[str, Any]], Any]] = None, ttl: Optional[int] = None):
+    """
+    Cache a read-only async GET endpoint by table versions.
+
+    Args:
+        tables: Models (or table names) the endpoint reads. Any committed
+            write to one of them invalidates the cached body and changes the
+            ETag.
+        principal: Maps the endpoint's resolved arguments to whatever part of
+            the caller the response depends on (e.g. role, managed country).
+            Leave unset for responses that are the same for every caller.
+        ttl: Upper bound, in seconds, on the age of a cached body or ETag
+            (default CACHE_TTL; 0 relies on table versions alone).
+
+    Place it under the @router.get decorator. Dependencies (auth, sessions)
+    still run; the database is only queried by them, not by the endpoint.
+    """
+    table_names = tuple(getattr(t, "__tablename__", t) for t in tables)
+
+    def decorator(endpoint):
+        if not inspect.iscoroutinefunction(endpoint):
+            raise TypeError(f"@cached_response needs an async endpoint: {endpoint.__name__}")
+
+        signature = inspect.signature(endpoint)
+        request_param = next((name for name, p in signature.parameters.items() if p.annotation is Request), None)
+        injected = request_param is None
+        if injected:
+            request_param = "_cache_request"
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(request_param, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ])
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs.pop(request_param) if injected else kwargs[request_param]
+            scope = principal(kwargs) if principal else None
+            key = (request.url.path, tuple(sorted(request.query_params.multi_items())), scope)
+            etag = _etag(key, table_versions(table_names), ttl if ttl is not None else settings.CACHE_TTL)
+            headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+            if _etag_matches(request.headers.get("if-none-match"), etag):
+                _stats["not_modified"] += 1
+                return Response(status_code=304, headers=headers)
+
+            accept_encoding = request.headers.get("accept-encoding", "")
+            entry = _store.get(key)
+            if entry is not None and entry[0] == etag:
+                _stats["hits"] += 1
+                _store.move_to_end(key)
+                return entry[1].response(accept_encoding, headers)
+
+            _stats["misses"] += 1
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+
+            body = _serialize(request, result)
+            levels = None
+            if len(body) > _MAX_LEVEL_BODY_SIZE:
+                levels = {"gzip": settings.COMPRESSION_GZIP_LEVEL, "br": settings.COMPRESSION_BROTLI_QUALITY}
+            payload = PrecompressedJSON(body, min_size=settings.COMPRESSION_MIN_SIZE, levels=levels)
+            # Stored under the versions read *before* the endpoint ran, so a
+            # write that lands meanwhile just causes one more miss
+            _store_payload(key, etag, payload)
+            return payload.response(accept_encoding, headers)
+
+        if injected:
+            wrapper.__signature__ = signature
+        return wrapper
+    return decorator
+
+
+def user_scope(user) -> Optional[Tuple]:
+    """Principal scope for responses tailored by role, managed country or industry."""
+    if user is None:
+        return None
+    return (str(user.role).lower(), user.managed_country, user.industry)
+
+
+metrics.register_cache("responses", lambda: (_stats["hits"] + _stats["not_modified"], _stats["misses"]))
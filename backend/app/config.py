@@ -4,7 +4,7 @@ Loads environment variables and provides typed configuration.
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
-from typing import List, Any, Union, Optional
+from typing import Dict, List, Any, Union, Optional
 import os
 import json
 
@@ -30,6 +30,27 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 0
     
+    # Read replicas (Optional) - comma separated list of URLs
+    DATABASE_REPLICA_URLS: str = ""
+    DATABASE_REPLICA_CHECK_INTERVAL: int = 15  # seconds between health checks
+    DATABASE_REPLICA_MAX_LAG: float = 30.0  # seconds; lagging replicas are skipped
+    
+    # SQL instrumentation
+    SQL_REPEAT_THRESHOLD: int = 10  # same statement more than N times per request = N+1 suspect
+    SQL_STRICT_MODE: bool = False  # fail the request instead of logging (use in tests)
+    
+    # Metrics (/metrics, Prometheus text format)
+    METRICS_TOKEN: str = ""  # if set, scrapes must send "Authorization: Bearer <token>"
+    
+    # Response compression (gzip always; brotli when the package is installed)
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11; precompressed payloads always use 11
+    
+    # Response cache for read-mostly endpoints (app/cache.py)
+    CACHE_TTL: int = 300  # seconds; bounds staleness from writes made by other workers
+    CACHE_MAX_ENTRIES: int = 1024
+    
     # JWT - Load from environment with proper defaults
     SECRET_KEY: str = os.environ.get("JWT_SECRET", "dev_secret_key_change_me_in_production")
     ALGORITHM: str = "HS256"
@@ -46,6 +67,25 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 10485760  # 10MB
     ALLOWED_EXTENSIONS: str = "jpg,jpeg,png,mp4,csv"
     
+    # Bulk campaign import (POST /api/campaigns/bulk)
+    BULK_IMPORT_MAX_ROWS: int = 5000
+    
+    # Campaign lifecycle scheduler (app/scheduler.py)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_INTERVAL: int = 300  # seconds between passes
+    SCHEDULER_BATCH_SIZE: int = 500  # campaigns per UPDATE/commit
+    
+    # Event ingestion (app/ingestion.py)
+    INGEST_FLUSH_INTERVAL_MS: int = 250  # how often queued counts are written
+    INGEST_FLUSH_BATCH_SIZE: int = 1000  # campaigns per UPDATE batch/commit
+    INGEST_MAX_PENDING_EVENTS: int = 1000000  # beyond this, new events get 503
+    INGEST_BATCH_MAX_EVENTS: int = 10000  # entries per POST /analytics/events:batch
+    
+    # Campaign time series (app/timeseries.py)
+    STATS_LATE_EVENT_DAYS: int = 2  # older events are refused
+    STATS_HOURLY_RETENTION_DAYS: int = 35  # hourly rows older than this are deleted after rollup
+    STATS_DIMENSION_MAX_VALUES: int = 10000  # distinct values per breakdown dimension (app/dimensions.py)
+    
     # AWS S3 (Optional)
     # AWS S3 (Optional)
     USE_S3: bool = False
@@ -65,12 +105,17 @@ class Settings(BaseSettings):
     
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    LOG_QUEUE_SIZE: int = 10000  # records buffered before new ones are dropped
+    LOG_SAMPLE_DEFAULT: float = 1.0  # fraction of successful requests logged
+    LOG_SAMPLE_RATES: str = "/api/health=0,/=0"  # per-route overrides: "/api/x=0.1,/api/y=0"
     
     # SMTP Settings (Optional)
     SMTP_HOST: str = ""
     SMTP_PORT: int = 587
     SMTP_USER: str = ""
-    SMTP_PASS: str = ""
+    SMTP_PASSWORD: str = ""
+    FROM_EMAIL: str = ""  # defaults to SMTP_USER
     EMAILS_FROM_EMAIL: str = "support@adplatform.com"
     EMAILS_FROM_NAME: str = "AdPlatform Support"
 
@@ -91,6 +136,25 @@ class Settings(BaseSettings):
         origins = [self.FRONTEND_URL, "http://localhost:5173", "http://localhost:3000"]
         return [o for o in origins if o]
 
+    @property
+    def replica_urls_list(self) -> List[str]:
+        """Parse read replica URLs, applying the same postgres:// fix as DATABASE_URL."""
+        urls = [u.strip() for u in self.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+        return [
+            u.replace("postgres://", "postgresql://", 1) if u.startswith("postgres://") else u
+            for u in urls
+        ]
+
+    @property
+    def log_sample_rates_map(self) -> Dict[str, float]:
+        """Parse per-route log sample rates ("route=rate" pairs)."""
+        rates = {}
+        for pair in self.LOG_SAMPLE_RATES.split(","):
+            route, sep, rate = pair.strip().rpartition("=")
+            if sep and route:
+                rates[route] = float(rate)
+        return rates
+
     @property
     def allowed_extensions_list(self) -> List[str]:
         """Get allowed file extensions as a list."""
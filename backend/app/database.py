@@ -1,37 +1,202 @@
 """
 Database configuration and session management.
 Sets up SQLAlchemy engine, session maker, and base model.
+Optionally routes read-only sessions to read replicas.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import Table, create_engine, event, insert, inspect, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generator, List, Mapping, Optional, Sequence
+import itertools
+import threading
+import time
+from fastapi import Request
 from .config import settings
 
-# Create database engine
-# Create database engine
-connect_args = {}
-engine_args = {
-    "pool_pre_ping": True,
-    "echo": settings.DEBUG,
-}
-
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args["check_same_thread"] = False
-    # SQLite does not support pool_size/max_overflow with default pool
-else:
-    # Postgres/MySQL optimization
-    engine_args["pool_size"] = settings.DATABASE_POOL_SIZE
-    engine_args["max_overflow"] = settings.DATABASE_MAX_OVERFLOW
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=connect_args,
-    **engine_args
-)
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection (for /metrics)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_seconds = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_count += 1
+            self.wait_seconds += time.perf_counter() - start
+
+
+def _build_engine(url: str) -> Engine:
+    """Create an engine with the pool settings appropriate for the backend."""
+    connect_args = {}
+    engine_args = {
+        "pool_pre_ping": True,
+        "echo": settings.DEBUG,
+    }
+
+    if url.startswith("sqlite"):
+        connect_args["check_same_thread"] = False
+        # SQLite does not support pool_size/max_overflow with default pool
+    else:
+        # Postgres/MySQL optimization
+        engine_args["poolclass"] = TimedQueuePool
+        engine_args["pool_size"] = settings.DATABASE_POOL_SIZE
+        engine_args["max_overflow"] = settings.DATABASE_MAX_OVERFLOW
+
+    return create_engine(url, connect_args=connect_args, **engine_args)
+
+
+def sanitize_url(raw_url: str) -> str:
+    """Hide credentials in a database URL for logging."""
+    if "@" in raw_url:
+        prefix, rest = raw_url.split("://", 1)
+        creds, host = rest.split("@", 1)
+        return f"{prefix}://****@{host}"
+    return raw_url
+
+
+# Create database engine (primary - all writes go here)
+engine = _build_engine(settings.DATABASE_URL)
+
+
+class ReplicaSet:
+    """
+    Round-robin pool of read replica engines.
+    
+    A background thread runs SELECT 1 plus a replication lag probe against
+    every replica. Replicas that fail, disconnect, or lag more than
+    DATABASE_REPLICA_MAX_LAG seconds are skipped until they recover.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.engines = [_build_engine(url) for url in urls]
+        self._healthy = list(self.engines)
+        self._lag = {}
+        self._errors = {}
+        self._cycle = itertools.count()
+        self._lock = threading.Lock()
+        self._monitor = None
+        for replica in self.engines:
+            event.listen(replica, "handle_error", self._on_error)
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def pick(self) -> Optional[Engine]:
+        """Return the next healthy replica, or None if all are down."""
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._cycle) % len(healthy)]
+
+    def mark_down(self, replica: Engine, reason: str):
+        """Take a replica out of rotation until the next successful health check."""
+        with self._lock:
+            if replica in self._healthy:
+                self._healthy = [e for e in self._healthy if e is not replica]
+                logger.warning("⚠️ Replica %s marked down: %s", sanitize_url(str(replica.url)), reason)
+            self._errors[replica] = reason
+
+    def _on_error(self, context):
+        if context.is_disconnect and context.engine is not None:
+            self.mark_down(context.engine, str(context.original_exception))
+
+    def _measure_lag(self, conn) -> float:
+        if conn.dialect.name != "postgresql":
+            return 0.0
+        lag = conn.execute(text("""
+            SELECT CASE WHEN pg_is_in_recovery()
+                THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                ELSE 0 END
+        """)).scalar()
+        return float(lag or 0.0)
+
+    def check_health(self):
+        """Probe every replica and rebuild the healthy rotation."""
+        healthy = []
+        for replica in self.engines:
+            try:
+                with replica.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                    lag = self._measure_lag(conn)
+                self._lag[replica] = lag
+                if lag > settings.DATABASE_REPLICA_MAX_LAG:
+                    self._errors[replica] = f"lag {lag:.1f}s exceeds {settings.DATABASE_REPLICA_MAX_LAG}s"
+                    continue
+                self._errors.pop(replica, None)
+                healthy.append(replica)
+            except Exception as e:
+                self._errors[replica] = str(e)
+        with self._lock:
+            self._healthy = healthy
+
+    def start_monitor(self):
+        """Start the background health check thread (idempotent)."""
+        if self._monitor is not None or not self.engines:
+            return
+
+        def run():
+            while True:
+                try:
+                    self.check_health()
+                except Exception as e:
+                    logger.error("❌ Replica health check failed: %s", e)
+                time.sleep(settings.DATABASE_REPLICA_CHECK_INTERVAL)
+
+        self._monitor = threading.Thread(target=run, name="replica-monitor", daemon=True)
+        self._monitor.start()
+
+    def status(self) -> List[dict]:
+        """Health and lag for each replica (used by debug/metrics endpoints)."""
+        healthy = self._healthy
+        return [
+            {
+                "url": sanitize_url(str(replica.url)),
+                "healthy": replica in healthy,
+                "lag_seconds": self._lag.get(replica),
+                "error": self._errors.get(replica),
+            }
+            for replica in self.engines
+        ]
+
+
+replicas = ReplicaSet(settings.replica_urls_list)
+
+
+class RoutingSession(Session):
+    """
+    Session that routes reads to a replica when flagged read-only.
+    
+    Flushes and bulk UPDATE/DELETE/INSERT statements always go to the primary,
+    so a read-only session that ends up writing stays correct.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self.info.get("read_only")
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            # Stick to one replica for the lifetime of the session
+            if "replica" not in self.info:
+                self.info["replica"] = replicas.pick()
+            if self.info["replica"] is not None:
+                return self.info["replica"]
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
 
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
@@ -43,77 +208,131 @@ logger = logging.getLogger(__name__)
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
 
-def get_db() -> Generator[Session, None, None]:
+def _pin_to_primary(session: Session):
+    """Flag the owning request so later read-only sessions use the primary."""
+    if session.info.get("bookkeeping"):
+        return
+    state = session.info.get("request_state")
+    if state is not None:
+        state.stick_to_primary = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    _pin_to_primary(session)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _after_bulk_write(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        _pin_to_primary(orm_execute_state.session)
+
+
+@contextmanager
+def bookkeeping(session: Session):
+    """
+    Mark writes that should not pin the request to the primary
+    (e.g. last_login updates done by the auth dependency).
+    """
+    session.info["bookkeeping"] = True
+    try:
+        yield session
+    finally:
+        session.info.pop("bookkeeping", None)
+
+
+def get_db(request: Request) -> Generator[Session, None, None]:
     """
     Dependency function that yields database session.
     Automatically closes session after request completes.
+    Always bound to the primary.
     """
     db = SessionLocal()
+    db.info["request_state"] = request.state
     try:
         yield db
     finally:
         db.close()
 
 
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Dependency for read-only endpoints.
+    Uses a replica when DATABASE_REPLICA_URLS is configured, unless this
+    request already wrote through the primary (read-after-write).
+    """
+    db = SessionLocal()
+    db.info["request_state"] = request.state
+    if replicas and not getattr(request.state, "stick_to_primary", False):
+        db.info["read_only"] = True
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def upsert(
+    db: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    key: Sequence[str],
+    set_: Optional[Callable[[Mapping[str, Any]], Dict[str, Any]]] = None,
+):
+    """
+    Insert `rows` into `table` (no commit). A row whose `key` columns match
+    an existing one is skipped, or, with `set_`, updates it with
+    set_(excluded): column name -> value, where excluded[name] is the
+    value the row would have inserted.
+    
+    One INSERT ... ON CONFLICT on PostgreSQL and SQLite; row by row
+    elsewhere.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(table)
+        if set_ is None:
+            statement = statement.on_conflict_do_nothing(index_elements=list(key))
+        else:
+            statement = statement.on_conflict_do_update(index_elements=list(key), set_=set_(statement.excluded))
+        db.execute(statement, rows)
+        return
+    for row in rows:
+        if set_ is not None:
+            where = [table.c[name] == row[name] for name in key]
+            if db.execute(update(table).where(*where).values(**set_(row))).rowcount:
+                continue
+        try:
+            with db.begin_nested():
+                db.execute(insert(table).values(**row))
+        except IntegrityError:
+            pass  # a concurrent writer added it first
+
+
 def init_db() -> bool:
     """
-    Initialize database tables and test connection.
-    Returns True if successful, False otherwise.
+    Test the database connection and check that migrations have been applied.
+    Schema changes are made by `python -m app.migrate`, never at app startup.
+    Returns True if the connection works, False otherwise.
     """
     try:
         # Sanitize URL for logging (hide password)
-        raw_url = settings.DATABASE_URL
-        if "@" in raw_url:
-            prefix, rest = raw_url.split("://", 1)
-            creds, host = rest.split("@", 1)
-            sanitized_url = f"{prefix}://****@{host}"
-        else:
-            sanitized_url = raw_url
+        sanitized_url = sanitize_url(settings.DATABASE_URL)
             
-        logger.info(f"🔗 Testing connection to: {sanitized_url}")
+        logger.info("🔗 Testing connection to: %s", sanitized_url)
         
-        # Import all models here to ensure they're registered with Base
-        from . import models  # noqa
-        
-        # Create tables
-        Base.metadata.create_all(bind=engine)
-        
-        # Test connection with a simple query
-        from sqlalchemy import text
         with engine.connect() as conn:
             conn.execute(text("SELECT 1"))
-            
-            # --- RAILWAY ENUM FIX ---
-            # If we are on Postgres, ensure the 'role' column is VARCHAR(50) 
-            # to avoid (psycopg2.errors.InvalidTextRepresentation) for Enums
-            if "postgresql" in settings.DATABASE_URL.lower():
-                try:
-                    logger.info("🔍 Checking 'role' column type for ENUM issues...")
-                    # Use a separate autocommit connection for ALTER TYPE/TABLE
-                    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as fix_conn:
-                        res = fix_conn.execute(text("""
-                            SELECT data_type, udt_name 
-                            FROM information_schema.columns 
-                            WHERE table_name = 'users' AND column_name = 'role'
-                        """)).fetchone()
-                        
-                        if res and (res[0] == 'USER-DEFINED' or res[1] == 'userrole'):
-                            logger.warn("⚠️  Detected ENUM type for 'role'. Converting to VARCHAR(50)...")
-                            fix_conn.execute(text("ALTER TABLE users ALTER COLUMN role TYPE VARCHAR(50) USING role::text"))
-                            logger.info("✅ 'role' column successfully converted to VARCHAR(50)")
-                            
-                            # Also ensure the enum has the values just in case other parts of DB use it
-                            roles = ['admin', 'country_admin', 'user', 'advertiser']
-                            for r in roles:
-                                try:
-                                    fix_conn.execute(text(f"ALTER TYPE userrole ADD VALUE IF NOT EXISTS '{r}'"))
-                                except: pass
-                except Exception as fix_err:
-                    logger.error(f"⚠️  Role column fix failed (not critical): {fix_err}")
-            # ------------------------
+            if not inspect(conn).has_table("alembic_version"):
+                logger.warning("⚠️  Database has no migration history. Run `python -m app.migrate` before serving traffic.")
         
         logger.info("✅ Database connection test: SUCCESS")
         return True
     except Exception as e:
-        logger.error(f"❌ Database connection test: FAILED - {e}")
+        logger.error("❌ Database connection test: FAILED - %s", e)
         return False
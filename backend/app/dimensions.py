@@ -0,0 +1,125 @@
+"""
+Event breakdown dimensions and their dictionary encoding.
+
+Events may carry a few low-cardinality dimensions (DIMENSIONS: device
+class, state, ad format). campaign_stats_breakdown does not store their
+strings: each (dimension, value) pair gets a small integer id in
+dimension_values, so breakdown rows are a handful of integer columns and
+breakdown queries GROUP BY integers.
+
+Ids never change once assigned, so both directions are cached in process
+for good; only values a worker has not seen yet hit the database. Each
+dimension takes at most STATS_DIMENSION_MAX_VALUES distinct values; events
+with new values beyond that are refused.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .database import SessionLocal, upsert
+
+logger = logging.getLogger(__name__)
+
+# Column order of the *_id columns in campaign_stats_breakdown
+DIMENSIONS = ("device", "state", "ad_format")
+# Id stored for a dimension the event did not report
+NOT_REPORTED = 0
+NO_DIMENSIONS = (NOT_REPORTED,) * len(DIMENSIONS)
+
+_LOWERCASE = {"device", "ad_format"}
+_MAX_LENGTH = 64
+
+# (dimension, value) -> id and back
+_ids: Dict[Tuple[str, str], int] = {}
+_values: Dict[int, Tuple[str, str]] = {}
+
+
+def normalize(dimension: str, value: Optional[str]) -> Optional[str]:
+    """The stored form of `value` (trimmed; device and ad_format lowercased), or None if blank."""
+    if value is None:
+        return None
+    value = value.strip()[:_MAX_LENGTH]
+    if dimension in _LOWERCASE:
+        value = value.lower()
+    return value or None
+
+
+def _remember(rows: Iterable[Tuple[int, str, str]]):
+    for value_id, dimension, value in rows:
+        _ids[(dimension, value)] = value_id
+        _values[value_id] = (dimension, value)
+
+
+def _load(pairs: Set[Tuple[str, str]]):
+    """Look up (and create, capacity permitting) ids for `pairs`, on the primary."""
+    Value = models.DimensionValue
+    db = SessionLocal()
+    try:
+        for dimension in DIMENSIONS:
+            values = sorted(value for name, value in pairs if name == dimension)
+            if not values:
+                continue
+            lookup = select(Value.id, Value.dimension, Value.value).where(Value.dimension == dimension, Value.value.in_(values))
+            _remember(db.execute(lookup))
+            new = [value for value in values if (dimension, value) not in _ids]
+            if not new:
+                continue
+            room = settings.STATS_DIMENSION_MAX_VALUES - db.scalar(select(func.count()).where(Value.dimension == dimension))
+            if room < len(new):
+                logger.warning("⚠️ Dimension %r is full (%d values); refusing %d new ones",
+                               dimension, settings.STATS_DIMENSION_MAX_VALUES, len(new) - max(room, 0))
+            if room > 0:
+                upsert(
+                    db, models.DimensionValue.__table__,
+                    [{"dimension": dimension, "value": value} for value in new[:room]], ["dimension", "value"],
+                )
+                db.commit()
+                _remember(db.execute(lookup))
+    finally:
+        db.close()
+
+
+def encode(dims: Sequence[Optional[Dict[str, str]]]) -> List[Optional[Tuple[int, ...]]]:
+    """
+    Dimension ids, in DIMENSIONS order, for each event's `dims`. Names
+    outside DIMENSIONS are ignored; unreported ones are NOT_REPORTED. None
+    where a value is new and its dimension is full.
+    """
+    normalized = [
+        tuple(normalize(dimension, entry.get(dimension)) for dimension in DIMENSIONS) if entry else None
+        for entry in dims
+    ]
+    missing = {
+        (dimension, value)
+        for values in set(normalized) if values
+        for dimension, value in zip(DIMENSIONS, values)
+        if value is not None and (dimension, value) not in _ids
+    }
+    if missing:
+        _load(missing)
+
+    encoded = []
+    for values in normalized:
+        if values is None:
+            encoded.append(NO_DIMENSIONS)
+            continue
+        ids = tuple(
+            NOT_REPORTED if value is None else _ids.get((dimension, value))
+            for dimension, value in zip(DIMENSIONS, values)
+        )
+        encoded.append(None if None in ids else ids)
+    return encoded
+
+
+def decode(db: Session, ids: Iterable[int]) -> Dict[int, Optional[str]]:
+    """Value for each id (None for NOT_REPORTED)."""
+    wanted = set(ids)
+    missing = wanted - _values.keys() - {NOT_REPORTED}
+    if missing:
+        Value = models.DimensionValue
+        _remember(db.execute(select(Value.id, Value.dimension, Value.value).where(Value.id.in_(missing))))
+    return {value_id: _values[value_id][1] if value_id in _values else None for value_id in wanted}
@@ -0,0 +1,369 @@
+"""
+Campaign event ingestion.
+
+Impressions and clicks are not written one event at a time. record() adds
+them to counters in memory, one per (campaign, UTC hour, dimension ids); a
+background loop
+swaps the counters out every INGEST_FLUSH_INTERVAL_MS and applies them as
+batched, atomic increments:
+
+    UPDATE campaigns SET impressions = impressions + :impressions,
+                         clicks = clicks + :clicks
+    WHERE id = :campaign_id
+
+plus the same increments on the owners' advertiser_summaries rows (see
+app/summaries.py) and upserts adding the counts to campaign_stats_hourly
+and campaign_stats_breakdown (see app/timeseries.py). Viewers reported with
+events go into a HyperLogLog sketch per (campaign, UTC day), merged into
+the stored ones at flush time (see app/reach.py). Concurrent workers never
+overwrite each other's
+counts, and any number of events for a campaign cost one row update per
+flush (and hour). Counts for campaigns that no longer exist are dropped at
+flush time.
+
+Backpressure: if flushes fall behind (or fail and are retried) and
+INGEST_MAX_PENDING_EVENTS events are waiting, record() raises
+IngestionBacklog until the backlog drains; the API answers 503 with
+Retry-After. The shutdown event flushes whatever is left.
+"""
+import asyncio
+import logging
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from . import dimensions, models, reach, summaries, timeseries
+from .config import settings
+from .database import SessionLocal
+from .utils.hyperloglog import HyperLogLog
+
+logger = logging.getLogger(__name__)
+
+# Event type -> index in a campaign's pending counters
+EVENT_TYPES = {"impression": 0, "click": 1}
+
+
+class IngestionBacklog(RuntimeError):
+    """Raised by record()/record_many() while too many events are waiting to be flushed."""
+
+
+# Exposed on /metrics
+STATS = {
+    "events": {"accepted": 0, "rejected": 0, "written": 0, "dropped": 0},
+    "flushes": {"ok": 0, "error": 0},
+    "last_flush_duration": 0.0,
+}
+
+# (campaign_id, hour bucket, dimension ids in dimensions.DIMENSIONS order)
+Key = Tuple[int, datetime, Tuple[int, ...]]
+
+_lock = threading.Lock()
+# Serializes flushes (background loop vs. shutdown / manual calls)
+_flush_lock = threading.Lock()
+# Key -> [impressions, clicks]
+_pending: Dict[Key, List[int]] = {}
+# (campaign_id, day) -> sketch of the viewers seen since the last flush
+_pending_reach: Dict[Tuple[int, date], HyperLogLog] = {}
+_pending_events = 0
+_task: Optional[asyncio.Task] = None
+# Campaign ids known to exist (see existing_campaigns)
+_known_ids: Set[int] = set()
+_known_window = 0
+# (hours since the epoch, that hour's bucket)
+_hour = (0, datetime.utcfromtimestamp(0))
+
+_campaigns = models.Campaign.__table__
+_INCREMENT = (
+    update(_campaigns)
+    .where(_campaigns.c.id == bindparam("campaign_id"))
+    .values(
+        impressions=func.coalesce(_campaigns.c.impressions, 0) + bindparam("d_impressions"),
+        clicks=func.coalesce(_campaigns.c.clicks, 0) + bindparam("d_clicks"),
+    )
+)
+_summaries = models.AdvertiserSummary.__table__
+_ADD_TO_SUMMARY = (
+    update(_summaries)
+    .where(_summaries.c.advertiser_id == bindparam("s_advertiser_id"))
+    .values(
+        impressions=_summaries.c.impressions + bindparam("d_impressions"),
+        clicks=_summaries.c.clicks + bindparam("d_clicks"),
+        updated_at=bindparam("s_updated_at"),
+    )
+)
+
+
+def pending_events() -> int:
+    return _pending_events
+
+
+def _current_hour() -> datetime:
+    # Cached: building the bucket from utcnow() on every event costs more than the rest of record()
+    global _hour
+    hour = int(time.time() // 3600)
+    if hour != _hour[0]:
+        _hour = (hour, datetime.utcfromtimestamp(hour * 3600))
+    return _hour[1]
+
+
+# ==================== Recording ====================
+
+def record(
+    campaign_id: int,
+    event_type: str,
+    count: int = 1,
+    bucket: Optional[datetime] = None,
+    dimension_ids: Tuple[int, ...] = dimensions.NO_DIMENSIONS,
+):
+    """
+    Queue `count` events of `event_type` ('impression' or 'click') for
+    `campaign_id`, in hour `bucket` (default: the current hour), with
+    `dimension_ids` from dimensions.encode(). Raises ValueError for an
+    unknown event type and IngestionBacklog when the queue is full.
+    """
+    index = EVENT_TYPES.get(event_type)
+    if index is None:
+        raise ValueError(f"Unknown event type: {event_type!r}")
+    key = (campaign_id, bucket or _current_hour(), dimension_ids)
+    global _pending_events
+    with _lock:
+        if _pending_events + count > settings.INGEST_MAX_PENDING_EVENTS:
+            STATS["events"]["rejected"] += count
+            raise IngestionBacklog(f"{_pending_events} events waiting to be flushed")
+        counters = _pending.get(key)
+        if counters is None:
+            counters = _pending[key] = [0, 0]
+        counters[index] += count
+        _pending_events += count
+        STATS["events"]["accepted"] += count
+
+
+def record_many(deltas: Dict[Key, List[int]], viewers: Optional[Dict[Tuple[int, date], List[int]]] = None):
+    """
+    Queue pre-aggregated counts, (campaign_id, hour bucket, dimension ids) ->
+    [impressions, clicks], and the viewers behind them, (campaign_id, day)
+    -> hyperloglog.hash_item() values, all or nothing: raises
+    IngestionBacklog without queueing any of them if they don't fit.
+    """
+    global _pending_events
+    events = sum(impressions + clicks for impressions, clicks in deltas.values())
+    with _lock:
+        if _pending_events + events > settings.INGEST_MAX_PENDING_EVENTS:
+            STATS["events"]["rejected"] += events
+            raise IngestionBacklog(f"{_pending_events} events waiting to be flushed")
+        for key, (impressions, clicks) in deltas.items():
+            counters = _pending.get(key)
+            if counters is None:
+                counters = _pending[key] = [0, 0]
+            counters[0] += impressions
+            counters[1] += clicks
+        for key, hashes in (viewers or {}).items():
+            sketch = _pending_reach.get(key)
+            if sketch is None:
+                sketch = _pending_reach[key] = HyperLogLog()
+            sketch.add_hashes(hashes)
+        _pending_events += events
+        STATS["events"]["accepted"] += events
+
+
+def existing_campaigns(db: Session, campaign_ids: Iterable[int]) -> Set[int]:
+    """
+    The subset of `campaign_ids` that are campaigns. Ids seen before are
+    answered from memory; only new ones are looked up. The set is dropped
+    every CACHE_TTL, and counts for campaigns deleted meanwhile are dropped
+    at flush time anyway.
+    """
+    global _known_window
+    ttl = settings.CACHE_TTL
+    window = int(time.time() // ttl) if ttl > 0 else 0
+    if window != _known_window:
+        _known_ids.clear()
+        _known_window = window
+    wanted = set(campaign_ids)
+    unknown = sorted(wanted - _known_ids)
+    size = settings.INGEST_FLUSH_BATCH_SIZE
+    for start in range(0, len(unknown), size):
+        chunk = unknown[start:start + size]
+        _known_ids.update(db.scalars(select(models.Campaign.id).where(models.Campaign.id.in_(chunk))))
+    return wanted & _known_ids
+
+
+def _take() -> Tuple[Dict[Key, List[int]], Dict[Tuple[int, date], HyperLogLog]]:
+    global _pending, _pending_events, _pending_reach
+    with _lock:
+        batch, _pending = _pending, {}
+        sketches, _pending_reach = _pending_reach, {}
+        _pending_events = 0
+    return batch, sketches
+
+
+def _restore(batch: Dict[Key, List[int]], sketches: Dict[Tuple[int, date], HyperLogLog]):
+    """Put counts and viewers that could not be written back in front of the queue."""
+    global _pending_events
+    with _lock:
+        for key, (impressions, clicks) in batch.items():
+            counters = _pending.setdefault(key, [0, 0])
+            counters[0] += impressions
+            counters[1] += clicks
+            _pending_events += impressions + clicks
+        for key, sketch in sketches.items():
+            pending = _pending_reach.get(key)
+            if pending is None:
+                _pending_reach[key] = sketch
+            else:
+                pending.merge(sketch)
+
+
+# ==================== Flushing ====================
+
+def _write(db: Session, batch: Dict[Key, List[int]]) -> int:
+    """
+    Apply `batch` in chunks of INGEST_FLUSH_BATCH_SIZE counters, one commit
+    each. Written counters are removed from `batch`,
+    so after a failure it holds exactly what still has to be written.
+    """
+    Campaign = models.Campaign
+    keys = sorted(batch)  # same lock order in every worker
+    size = settings.INGEST_FLUSH_BATCH_SIZE
+    written = 0
+    for start in range(0, len(keys), size):
+        chunk = keys[start:start + size]
+        campaign_ids = {key[0] for key in chunk}
+        owners = dict(db.execute(select(Campaign.id, Campaign.advertiser_id).where(Campaign.id.in_(campaign_ids))).all())
+
+        # The same counts summed per campaign, per (campaign, hour) and per (campaign, day, dimensions)
+        totals: Dict[int, List[int]] = {}
+        hourly: Dict[Tuple[int, datetime], List[int]] = {}
+        daily: Dict[Tuple[int, date, Tuple[int, ...]], List[int]] = {}
+        for key in chunk:
+            campaign_id, bucket, dimension_ids = key
+            if campaign_id not in owners:
+                continue
+            impressions, clicks = batch[key]
+            for sums in (
+                totals.setdefault(campaign_id, [0, 0]),
+                hourly.setdefault((campaign_id, bucket), [0, 0]),
+                daily.setdefault((campaign_id, bucket.date(), dimension_ids), [0, 0]),
+            ):
+                sums[0] += impressions
+                sums[1] += clicks
+        if totals:
+            db.execute(_INCREMENT, [
+                {"campaign_id": campaign_id, "d_impressions": impressions, "d_clicks": clicks}
+                for campaign_id, (impressions, clicks) in totals.items()
+            ])
+            timeseries.add_hourly(db, [
+                {"campaign_id": campaign_id, "bucket": bucket, "impressions": impressions, "clicks": clicks}
+                for (campaign_id, bucket), (impressions, clicks) in hourly.items()
+            ])
+            timeseries.add_breakdown(db, [
+                {
+                    "campaign_id": campaign_id, "bucket": day,
+                    **{f"{name}_id": value_id for name, value_id in zip(dimensions.DIMENSIONS, dimension_ids)},
+                    "impressions": impressions, "clicks": clicks,
+                }
+                for (campaign_id, day, dimension_ids), (impressions, clicks) in daily.items()
+            ])
+            # Straight onto the summary rows, summed per advertiser in id
+            # order (the lock order); rows built just now already count them
+            existing = summaries.ensure_rows(db, owners.values())
+            per_advertiser: Dict[int, List[int]] = {}
+            for campaign_id, (impressions, clicks) in totals.items():
+                if owners[campaign_id] in existing:
+                    sums = per_advertiser.setdefault(owners[campaign_id], [0, 0])
+                    sums[0] += impressions
+                    sums[1] += clicks
+            if per_advertiser:
+                now = datetime.utcnow()
+                db.execute(_ADD_TO_SUMMARY, [
+                    {"s_advertiser_id": advertiser_id, "d_impressions": impressions, "d_clicks": clicks, "s_updated_at": now}
+                    for advertiser_id, (impressions, clicks) in sorted(per_advertiser.items())
+                ])
+        db.commit()
+        summaries.bump({owners[campaign_id] for campaign_id in totals})
+
+        for key in chunk:
+            events = sum(batch.pop(key))
+            if key[0] in owners:
+                written += events
+            else:
+                STATS["events"]["dropped"] += events
+    return written
+
+
+def _write_reach(db: Session, sketches: Dict[Tuple[int, date], HyperLogLog]):
+    """
+    Merge `sketches` into campaign_reach_daily in chunks of
+    INGEST_FLUSH_BATCH_SIZE, one commit each, removing them from `sketches`
+    as they are written. Sketches of deleted campaigns are dropped.
+    """
+    keys = sorted(sketches)  # same lock order in every worker
+    size = settings.INGEST_FLUSH_BATCH_SIZE
+    for start in range(0, len(keys), size):
+        chunk = keys[start:start + size]
+        existing = set(db.scalars(select(models.Campaign.id).where(models.Campaign.id.in_({key[0] for key in chunk}))))
+        reach.merge(db, {key: sketches[key] for key in chunk if key[0] in existing})
+        db.commit()
+        for key in chunk:
+            del sketches[key]
+
+
+def flush() -> int:
+    """Write every queued count and viewer to the database now; returns the number of events written."""
+    with _flush_lock:
+        batch, sketches = _take()
+        if not batch and not sketches:
+            return 0
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            written = _write(db, batch)
+            _write_reach(db, sketches)
+        except Exception:
+            db.rollback()
+            _restore(batch, sketches)
+            STATS["flushes"]["error"] += 1
+            raise
+        finally:
+            db.close()
+        STATS["flushes"]["ok"] += 1
+        STATS["events"]["written"] += written
+        STATS["last_flush_duration"] = time.perf_counter() - start
+        return written
+
+
+# ==================== Background loop ====================
+
+async def _run_forever(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Sessions are synchronous; keep the event loop free
+            await asyncio.to_thread(flush)
+        except Exception as e:
+            logger.error("❌ Event flush failed (%d events kept for retry): %s", _pending_events, e, exc_info=True)
+
+
+def start():
+    """Start the periodic flush in this process. Call from the startup event."""
+    global _task
+    if _task is None:
+        _task = asyncio.get_running_loop().create_task(_run_forever(settings.INGEST_FLUSH_INTERVAL_MS / 1000))
+
+
+async def stop():
+    """Stop the loop and flush what is left. Call from the shutdown event."""
+    global _task
+    if _task is not None:
+        _task.cancel()
+        _task = None
+    try:
+        written = await asyncio.to_thread(flush)
+        if written:
+            logger.info("📈 Flushed %d queued events on shutdown", written)
+    except Exception as e:
+        logger.error("❌ Final event flush failed, %d events lost: %s", _pending_events, e, exc_info=True)
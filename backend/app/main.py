@@ -4,17 +4,20 @@ import sys
 import os
 import time
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+from app.logging_config import setup_logging, stop_logging
+
+# Non-blocking JSON logging (records are written by a background thread)
+setup_logging()
 logger = logging.getLogger("startup")
 
-print(f"🔥 [DEBUG] Starting process at {time.ctime()}", flush=True)
-print(f"🔥 [DEBUG] PYTHON PATH: {sys.path}", flush=True)
-print(f"🔥 [DEBUG] PORT: {os.environ.get('PORT', '8000')}", flush=True)
-print(f"🔥 [DEBUG] CWD: {os.getcwd()}", flush=True)
+logger.info("🔥 Starting process at %s", time.ctime())
+logger.debug("🔥 PYTHON PATH: %s", sys.path)
+logger.info("🔥 PORT: %s | CWD: %s", os.environ.get('PORT', '8000'), os.getcwd())
 
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.config import settings
+from app.middleware import CompressionMiddleware, RequestLogMiddleware
 
 # Create app IMMEDIATELY for health checks
 app = FastAPI(title="AdPlatform API")
@@ -30,28 +33,20 @@ BASE_ALLOWED_ORIGINS = [
 env_origins = os.environ.get("ALLOWED_ORIGINS", "").split(",") if os.environ.get("ALLOWED_ORIGINS") else []
 ALLOWED_ORIGINS = list(set(BASE_ALLOWED_ORIGINS + [o.strip() for o in env_origins if o.strip()]))
 
-logger.info(f"🌐 CORS Allowed Origins: {ALLOWED_ORIGINS}")
+logger.info("🌐 CORS Allowed Origins: %s", ALLOWED_ORIGINS)
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request, call_next):
-    start_time = time.time()
-    origin = request.headers.get("origin")
-    path = request.url.path
-    method = request.method
-    
-    try:
-        response = await call_next(request)
-        process_time = (time.time() - start_time) * 1000
-        logger.info(f"REQ: {method} {path} | Origin: {origin} | Status: {response.status_code} | Time: {process_time:.2f}ms")
-        return response
-    except Exception as e:
-        process_time = (time.time() - start_time) * 1000
-        logger.error(f"REQ ERROR: {method} {path} | Origin: {origin} | Error: {str(e)} | Time: {process_time:.2f}ms", exc_info=True)
-        return JSONResponse(
-            status_code=500,
-            content={"detail": "Internal Server Error", "error": str(e)}
-        )
+# gzip/brotli for JSON bodies above COMPRESSION_MIN_SIZE (innermost: outer
+# middleware only add headers, so it sees the final body)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+# Request timing / access log / error shaping (pure ASGI, inside CORS so
+# error responses still carry CORS headers)
+app.add_middleware(RequestLogMiddleware)
 
 # CORS - Proper configuration for credentials
 # If ALLOWED_ORIGINS contains "*", we must be careful with allow_credentials=True
@@ -87,7 +82,9 @@ try:
     # Use absolute imports for Railway compatibility
     from app.config import settings
     from app.database import engine, Base, init_db, SessionLocal
-    from app import models, auth
+    from app import models, auth, ingestion, scheduler
+    from app.sql_stats import QueryStatsMiddleware
+    from app.metrics import MetricsMiddleware, start_loop_lag_monitor
     from app.routers import (
         auth as auth_router, campaigns, media, pricing,
         analytics, admin, payment, frontend_compat,
@@ -104,6 +101,11 @@ try:
     else:
         logger.error("❌ Database initialization FAILED")
     
+    # Per-request SQL statement counts / Server-Timing
+    app.add_middleware(QueryStatsMiddleware)
+    # Prometheus /metrics and per-route latency histograms
+    app.add_middleware(MetricsMiddleware)
+    
     # 4. Register routers
     logger.info("🔌 Registering API routers...")
     app.include_router(auth_router.router, prefix="/api")
@@ -121,18 +123,34 @@ try:
     logger.info("✅ All routers registered successfully.")
     initialization_status["loaded"] = True
 except Exception as e:
-    logger.error(f"❌ Initialization error: {e}", exc_info=True)
-    print(f"❌ FATAL ERROR: {e}", flush=True)
+    logger.error("❌ Initialization error: %s", e, exc_info=True)
     import traceback
-    traceback.print_exc()
     initialization_status["error"] = str(e)
     initialization_status["traceback"] = traceback.format_exc()
     # App will still respond to health checks even if initialization fails
 
 @app.on_event("startup")
 async def startup_event():
+    if initialization_status["loaded"]:
+        start_loop_lag_monitor()
+        ingestion.start()
+        from app.database import replicas
+        if replicas:
+            replicas.start_monitor()
+            logger.info("📚 Read replica monitor started (%d replicas)", len(replicas.engines))
+        if settings.SCHEDULER_ENABLED:
+            scheduler.start()
+            logger.info("🗓️ Campaign lifecycle scheduler started (every %ss)", settings.SCHEDULER_INTERVAL)
     logger.info("🚀 Server startup complete.")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    logger.info("👋 Server shutting down.")
+    if initialization_status["loaded"]:
+        await scheduler.stop()
+        await ingestion.stop()
+    stop_logging()
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
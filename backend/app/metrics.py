@@ -0,0 +1,283 @@
+"""
+Prometheus metrics.
+
+Pure ASGI middleware that records per-route request counts and latency
+histograms (labelled with the route template, not the raw path) and serves
+everything in Prometheus text format at /metrics:
+
+- http_requests_total / http_request_duration_seconds
+- SQLAlchemy pool size, checked-out, overflow and checkout wait time
+- event-loop lag
+- hit ratios of in-process caches registered with register_cache()
+- SQL statement totals, replica health and dropped log records
+"""
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import settings
+from .utils.routing import route_template
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram; `observe` is a bisect plus two additions."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str, lines: List[str]):
+        cumulative = 0
+        sep = "," if labels else ""
+        for bound, n in zip(self.buckets, self.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.total}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+
+
+# (method, route, status) -> count and (method, route) -> latency histogram
+_request_counts: Dict[Tuple[str, str, int], int] = {}
+_request_latency: Dict[Tuple[str, str], Histogram] = {}
+
+_loop_lag = Histogram(LOOP_LAG_BUCKETS)
+_loop_lag_last = 0.0
+_loop_lag_task: Optional[asyncio.Task] = None
+
+# name -> callable returning (hits, misses)
+_caches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], Tuple[int, int]]):
+    """Expose an in-process cache's hit ratio. `stats` returns (hits, misses)."""
+    _caches[name] = stats
+
+
+def register_lru_cache(name: str, cached_function):
+    """Expose a functools.lru_cache-wrapped function's hit ratio."""
+    def stats():
+        info = cached_function.cache_info()
+        return info.hits, info.misses
+    register_cache(name, stats)
+
+
+def observe_request(method: str, route: str, status_code: int, seconds: float):
+    key = (method, route, status_code)
+    _request_counts[key] = _request_counts.get(key, 0) + 1
+    histogram = _request_latency.get((method, route))
+    if histogram is None:
+        histogram = _request_latency[(method, route)] = Histogram(LATENCY_BUCKETS)
+    histogram.observe(seconds)
+
+
+async def _monitor_loop_lag(interval: float):
+    global _loop_lag_last
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        _loop_lag_last = max(0.0, loop.time() - expected)
+        _loop_lag.observe(_loop_lag_last)
+
+
+def start_loop_lag_monitor(interval: float = 0.5):
+    """Start sampling event-loop lag. Call from the startup event."""
+    global _loop_lag_task
+    if _loop_lag_task is None:
+        _loop_lag_task = asyncio.get_running_loop().create_task(_monitor_loop_lag(interval))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _header(lines: List[str], name: str, kind: str, help_text: str):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _render_pools(lines: List[str]):
+    from .database import engine, replicas
+
+    engines = [("primary", engine)] + [(f"replica{i}", e) for i, e in enumerate(replicas.engines)]
+    gauges = (
+        ("db_pool_size", "size", "Configured pool size"),
+        ("db_pool_checked_out", "checkedout", "Connections currently checked out"),
+        ("db_pool_overflow", "overflow", "Connections open beyond pool_size"),
+    )
+    for name, method, help_text in gauges:
+        _header(lines, name, "gauge", help_text)
+        for label, eng in engines:
+            fn = getattr(eng.pool, method, None)
+            if fn is not None:
+                # QueuePool.overflow() counts up from -pool_size
+                lines.append(f'{name}{{pool="{label}"}} {max(fn(), 0)}')
+    _header(lines, "db_pool_checkout_wait_seconds", "summary", "Time spent waiting for a pooled connection")
+    for label, eng in engines:
+        if hasattr(eng.pool, "wait_seconds"):
+            lines.append(f'db_pool_checkout_wait_seconds_sum{{pool="{label}"}} {eng.pool.wait_seconds}')
+            lines.append(f'db_pool_checkout_wait_seconds_count{{pool="{label}"}} {eng.pool.wait_count}')
+
+    status = replicas.status()
+    if status:
+        _header(lines, "db_replica_up", "gauge", "1 if the replica is receiving reads")
+        for i, replica in enumerate(status):
+            lines.append(f'db_replica_up{{pool="replica{i}"}} {int(replica["healthy"])}')
+        _header(lines, "db_replica_lag_seconds", "gauge", "Last measured replication lag")
+        for i, replica in enumerate(status):
+            if replica["lag_seconds"] is not None:
+                lines.append(f'db_replica_lag_seconds{{pool="replica{i}"}} {replica["lag_seconds"]}')
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format."""
+    from . import ingestion
+    from .logging_config import dropped_records
+    from .scheduler import STATS as SCHEDULER
+    from .sql_stats import TOTALS
+
+    lines: List[str] = []
+
+    _header(lines, "http_requests_total", "counter", "HTTP requests by route template and status")
+    for (method, route, status_code), n in list(_request_counts.items()):
+        lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status_code}"}} {n}')
+
+    _header(lines, "http_request_duration_seconds", "histogram", "HTTP request latency by route template")
+    for (method, route), histogram in list(_request_latency.items()):
+        histogram.render("http_request_duration_seconds", f'method="{method}",route="{_escape(route)}"', lines)
+
+    _render_pools(lines)
+
+    _header(lines, "event_loop_lag_seconds", "histogram", "Delay between scheduled and actual wake-up of the event loop")
+    _loop_lag.render("event_loop_lag_seconds", "", lines)
+    _header(lines, "event_loop_lag_last_seconds", "gauge", "Most recent event-loop lag sample")
+    lines.append(f"event_loop_lag_last_seconds {_loop_lag_last}")
+
+    if _caches:
+        cache_stats = [(name, *stats()) for name, stats in list(_caches.items())]
+        _header(lines, "cache_hits_total", "counter", "In-process cache hits")
+        for name, hits, _ in cache_stats:
+            lines.append(f'cache_hits_total{{cache="{name}"}} {hits}')
+        _header(lines, "cache_misses_total", "counter", "In-process cache misses")
+        for name, _, misses in cache_stats:
+            lines.append(f'cache_misses_total{{cache="{name}"}} {misses}')
+        _header(lines, "cache_hit_ratio", "gauge", "In-process cache hit ratio")
+        for name, hits, misses in cache_stats:
+            lookups = hits + misses
+            lines.append(f'cache_hit_ratio{{cache="{name}"}} {hits / lookups if lookups else 0.0}')
+
+    _header(lines, "sql_statements_total", "counter", "SQL statements issued while handling requests")
+    lines.append(f'sql_statements_total {TOTALS["statements"]}')
+    _header(lines, "sql_duration_seconds_total", "counter", "Time spent in SQL while handling requests")
+    lines.append(f'sql_duration_seconds_total {TOTALS["db_seconds"]}')
+    _header(lines, "sql_n_plus_one_requests_total", "counter", "Requests that repeated a statement more than SQL_REPEAT_THRESHOLD times")
+    lines.append(f'sql_n_plus_one_requests_total {TOTALS["n_plus_one_requests"]}')
+
+    _header(lines, "scheduler_runs_total", "counter", "Campaign lifecycle scheduler passes by outcome")
+    for result, n in SCHEDULER["runs"].items():
+        lines.append(f'scheduler_runs_total{{result="{result}"}} {n}')
+    _header(lines, "scheduler_campaign_transitions_total", "counter", "Campaigns moved by the lifecycle scheduler")
+    for transition, n in SCHEDULER["transitions"].items():
+        lines.append(f'scheduler_campaign_transitions_total{{transition="{transition}"}} {n}')
+    _header(lines, "scheduler_stats_rollup_rows_total", "counter", "Daily campaign stats rows written by the rollup")
+    lines.append(f'scheduler_stats_rollup_rows_total {SCHEDULER["rollup_rows"]}')
+    _header(lines, "scheduler_last_run_timestamp_seconds", "gauge", "Unix time of the last completed scheduler pass in this process")
+    lines.append(f'scheduler_last_run_timestamp_seconds {SCHEDULER["last_run"]}')
+    _header(lines, "scheduler_last_run_duration_seconds", "gauge", "Duration of the last completed scheduler pass")
+    lines.append(f'scheduler_last_run_duration_seconds {SCHEDULER["last_duration"]}')
+
+    _header(lines, "ingest_events_total", "counter", "Campaign events by outcome (accepted, rejected by backpressure, written, dropped for unknown campaigns)")
+    for result, n in ingestion.STATS["events"].items():
+        lines.append(f'ingest_events_total{{result="{result}"}} {n}')
+    _header(lines, "ingest_flushes_total", "counter", "Event counter flushes by outcome")
+    for result, n in ingestion.STATS["flushes"].items():
+        lines.append(f'ingest_flushes_total{{result="{result}"}} {n}')
+    _header(lines, "ingest_pending_events", "gauge", "Events queued in memory, not yet written")
+    lines.append(f"ingest_pending_events {ingestion.pending_events()}")
+    _header(lines, "ingest_last_flush_duration_seconds", "gauge", "Duration of the last successful event flush")
+    lines.append(f'ingest_last_flush_duration_seconds {ingestion.STATS["last_flush_duration"]}')
+
+    _header(lines, "log_records_dropped_total", "counter", "Log records dropped because the log queue was full")
+    lines.append(f"log_records_dropped_total {dropped_records()}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware that times every HTTP request and serves /metrics.
+    If METRICS_TOKEN is set, scrapes must send `Authorization: Bearer <token>`.
+    """
+
+    def __init__(self, app, path: str = "/metrics"):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == self.path:
+            await self._serve(scope, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = route_template(scope) if scope.get("route") is not None else "unmatched"
+            observe_request(scope["method"], route, status_code, time.perf_counter() - start)
+
+    async def _serve(self, scope, send):
+        if settings.METRICS_TOKEN:
+            headers = dict(scope["headers"])
+            if headers.get(b"authorization", b"") != f"Bearer {settings.METRICS_TOKEN}".encode():
+                await _respond(send, 401, b"Unauthorized\n")
+                return
+        await _respond(send, 200, render().encode())
+
+
+async def _respond(send, status_code: int, body: bytes):
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"text/plain; version=0.0.4; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _register_builtin_caches():
+    from .sql_stats import fingerprint
+    register_lru_cache("sql_fingerprint", fingerprint)
+
+
+_register_builtin_caches()
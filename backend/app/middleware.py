@@ -0,0 +1,167 @@
+"""
+Pure ASGI middleware.
+
+Unlike @app.middleware("http") (BaseHTTPMiddleware), these wrap the
+ASGI `send` callable directly: no extra task or memory stream per request,
+and streaming responses pass through untouched.
+"""
+import json
+import logging
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from .logging_config import ACCESS_LOGGER
+from .utils.compression import compress, is_compressible, negotiate_encoding
+from .utils.routing import route_template
+
+access_logger = logging.getLogger(ACCESS_LOGGER)
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class RequestLogMiddleware:
+    """
+    Times each request, writes one access-log record and tags the response
+    with an X-Request-ID (taken from the request when the client sent one).
+
+    Unhandled exceptions are logged with their traceback and answered with a
+    generic 500 body that carries only the request id, never exception text.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        origin = None
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value.decode("latin-1")
+            elif name == b"x-request-id" and len(value) <= 128:
+                request_id = value.decode("latin-1")
+        request_id = request_id or uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        status_code = 500
+        response_started = False
+
+        async def send_with_request_id(message):
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = True
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception as exc:
+            self._log(scope, 500, start, origin, request_id, exc)
+            if response_started:
+                raise
+            body = json.dumps({"detail": "Internal Server Error", "request_id": request_id}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (REQUEST_ID_HEADER.encode(), request_id.encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        self._log(scope, status_code, start, origin, request_id)
+
+    @staticmethod
+    def _log(scope, status_code, start, origin, request_id, exc=None):
+        duration_ms = (time.perf_counter() - start) * 1000
+        method, path = scope["method"], scope["path"]
+        extra = {
+            "method": method, "path": path, "route": route_template(scope),
+            "status_code": status_code, "duration_ms": round(duration_ms, 2),
+            "origin": origin, "request_id": request_id,
+        }
+        if exc is None:
+            access_logger.info("REQ: %s %s | Status: %d | Time: %.2fms", method, path, status_code, duration_ms, extra=extra)
+        else:
+            access_logger.error(
+                "REQ ERROR: %s %s | Error: %s | Time: %.2fms", method, path, exc, duration_ms,
+                extra=extra, exc_info=(type(exc), exc, exc.__traceback__),
+            )
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli compression for complete (non-streaming) responses.
+
+    The encoding is negotiated from Accept-Encoding (q-values honoured,
+    brotli preferred when installed). Responses are left untouched when they
+    are smaller than `minimum_size`, not a text/JSON type, already encoded
+    (e.g. precompressed variants) or streamed in several body chunks.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not is_compressible(headers.get("content-type", "")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message  # held until the body size is known
+                return
+
+            # First body chunk: decide, then pass everything after it through
+            passthrough = True
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            compressed = compress(body, encoding, self.levels[encoding])
+            if len(compressed) < len(body):
+                body = compressed
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(body))
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # The encoded bytes differ from the identity representation
+                    headers["etag"] = f"W/{etag}"
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
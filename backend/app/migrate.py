@@ -0,0 +1,41 @@
+"""
+Database migrations entry point.
+
+Applies the Alembic migration tree in backend/alembic. Run once per deploy,
+before the API processes start:
+
+    python -m app.migrate            # upgrade to head
+    python -m app.migrate 0002       # upgrade (or stay) at a specific revision
+"""
+import logging
+import os
+import sys
+
+from .database import sanitize_url
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def get_alembic_config():
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return config
+
+
+def run_migrations(revision: str = "head") -> None:
+    """Upgrade the configured database to `revision`."""
+    from alembic import command
+
+    logger.info("🗄️ Migrating %s to %s", sanitize_url(settings.DATABASE_URL), revision)
+    command.upgrade(get_alembic_config(), revision)
+    logger.info("✅ Migrations applied")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    run_migrations(sys.argv[1] if len(sys.argv) > 1 else "head")
@@ -3,9 +3,10 @@ Database models for Advertiser Dashboard.
 Defines SQLAlchemy ORM models for all entities.
 """
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, Boolean, 
-    ForeignKey, Enum, Text, Date, JSON
+    Column, Integer, BigInteger, String, Float, DateTime, Boolean, 
+    ForeignKey, Enum, Text, Date, JSON, Index, LargeBinary, case, cast, text
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -87,6 +88,13 @@ class User(Base):
     campaigns = relationship("Campaign", back_populates="advertiser", cascade="all, delete-orphan", foreign_keys="Campaign.advertiser_id")
     reviewed_campaigns = relationship("Campaign", back_populates="reviewer", foreign_keys="Campaign.reviewed_by")
     
+    __table_args__ = (
+        Index("ix_users_email_lower", func.lower(email)),
+        # Keyset pagination (newest first), optionally per country
+        Index("ix_users_created_id", "created_at", "id"),
+        Index("ix_users_country_created_id", "country", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<User {self.email} ({self.role})>"
 
@@ -151,13 +159,40 @@ class Campaign(Base):
     payment_transactions = relationship("PaymentTransaction", back_populates="campaign", cascade="all, delete-orphan")
     notifications = relationship("Notification", back_populates="campaign", cascade="all, delete-orphan")
     
-    @property
+    __table_args__ = (
+        # Keyset pagination (newest first): all, per advertiser, per country
+        Index("ix_campaigns_created_id", "created_at", "id"),
+        Index("ix_campaigns_advertiser_created_id", "advertiser_id", "created_at", "id"),
+        Index("ix_campaigns_country_created_id", "target_country", "created_at", "id"),
+        # Advertiser list (own campaigns in the verified country)
+        Index("ix_campaigns_advertiser_country_created", "advertiser_id", "target_country", "created_at"),
+        # Country admin views filtered by status
+        Index("ix_campaigns_country_status", "target_country", "status"),
+        # Approval queue (pending statuses, oldest submission first)
+        Index("ix_campaigns_status_submitted", "status", "submitted_at"),
+        # Lifecycle scheduler: approved campaigns that started, active ones that ended.
+        # Partial, so they stay small and don't compete with the approval queue index.
+        Index("ix_campaigns_approved_start", "status", "start_date",
+              postgresql_where=text("status = 'APPROVED'"), sqlite_where=text("status = 'APPROVED'")),
+        Index("ix_campaigns_active_end", "status", "end_date",
+              postgresql_where=text("status = 'ACTIVE'"), sqlite_where=text("status = 'ACTIVE'")),
+    )
+    
+    @hybrid_property
     def ctr(self) -> float:
         """Calculate Click-Through Rate."""
         if self.impressions == 0:
             return 0.0
         return (self.clicks / self.impressions) * 100
     
+    @ctr.expression
+    def ctr(cls):
+        # Same rule in SQL, so list queries can select it as a column
+        return case(
+            (func.coalesce(cls.impressions, 0) == 0, 0.0),
+            else_=cast(func.coalesce(cls.clicks, 0), Float) / cls.impressions * 100,
+        )
+    
     def __repr__(self):
         return f"<Campaign {self.name} ({self.status})>"
 
@@ -190,6 +225,11 @@ class Invoice(Base):
     campaign = relationship("Campaign", back_populates="invoices")
     user = relationship("User")
 
+    __table_args__ = (
+        Index("ix_invoices_campaign_id", "campaign_id"),
+        Index("ix_invoices_user_status", "user_id", "status"),
+    )
+
     def __repr__(self):
         return f"<Invoice {self.invoice_number} ({self.status})>"
 
@@ -224,6 +264,12 @@ class Media(Base):
     # Relationships
     campaign = relationship("Campaign", back_populates="media_files")
     
+    __table_args__ = (
+        Index("ix_media_campaign_id", "campaign_id"),
+        # Moderation queue (pending first, newest upload first)
+        Index("ix_media_status_uploaded", "approved_status", "uploaded_at"),
+    )
+    
     def __repr__(self):
         return f"<Media {self.file_type} for Campaign {self.campaign_id}>"
 
@@ -252,6 +298,11 @@ class PricingMatrix(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index("ix_pricing_matrix_lookup", "country_id", "industry_type", "advert_type", "coverage_type"),
+        Index("ix_pricing_matrix_country_advert", "country_id", "advert_type"),
+    )
+    
     def __repr__(self):
         return f"<PricingMatrix {self.industry_type} - {self.coverage_type}>"
 
@@ -285,6 +336,10 @@ class GeoData(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index("ix_geodata_country_state", "country_code", "state_code"),
+    )
+    
     def __repr__(self):
         return f"<GeoData {self.state_name or self.country_code}>"
 
@@ -314,6 +369,14 @@ class PaymentTransaction(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
+    __table_args__ = (
+        # Keyset pagination (newest first): all, per user
+        Index("ix_payment_transactions_created_id", "created_at", "id"),
+        Index("ix_payment_transactions_user_created_id", "user_id", "created_at", "id"),
+        # "Already paid?" / pending-payment lookups per campaign
+        Index("ix_payment_transactions_campaign_status", "campaign_id", "status"),
+    )
+    
     def __repr__(self):
         return f"<Payment {self.stripe_payment_intent_id} - {self.status}>"
 
@@ -327,6 +390,8 @@ class NotificationType(str, enum.Enum):
     CAMPAIGN_REJECTED = "campaign_rejected"
     CHANGES_REQUIRED = "changes_required"
     CAMPAIGN_SUBMITTED = "campaign_submitted"
+    CAMPAIGN_ACTIVATED = "campaign_activated"
+    CAMPAIGN_COMPLETED = "campaign_completed"
     SYSTEM = "system"
 
 
@@ -350,8 +415,167 @@ class Notification(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     read_at = Column(DateTime(timezone=True), nullable=True)
     
+    __table_args__ = (
+        # Notification feed (latest N per user) and unread count / mark-all-read
+        Index("ix_notifications_user_created", "user_id", "created_at"),
+        Index("ix_notifications_user_unread", "user_id", "is_read"),
+        Index("ix_notifications_campaign_id", "campaign_id"),
+    )
+    
     def __repr__(self):
         return f"<Notification {self.title} for User {self.user_id}>"
 
     # Relationship
     campaign = relationship("Campaign", back_populates="notifications")
+
+
+class SchedulerLease(Base):
+    """
+    Lease row for a periodic job: only the worker holding an unexpired lease
+    runs it (see app/scheduler.py).
+    """
+    __tablename__ = "scheduler_leases"
+    
+    name = Column(String(100), primary_key=True)
+    owner = Column(String(255), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+    rolled_up_through = Column(Date, nullable=True)  # stats rollup progress (app/timeseries.py)
+    
+    def __repr__(self):
+        return f"<SchedulerLease {self.name} held by {self.owner}>"
+
+
+class AdvertiserSummary(Base):
+    """
+    Dashboard read model: one row per advertiser with campaign counts and
+    totals, added to whenever a commit writes that advertiser's campaigns
+    or notifications (see app/summaries.py).
+    """
+    __tablename__ = "advertiser_summaries"
+    
+    advertiser_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_campaigns = Column(Integer, nullable=False, default=0)
+    status_counts = Column(JSON, nullable=False, default=dict)  # lowercase status -> count
+    total_budget = Column(Float, nullable=False, default=0.0)
+    total_spent = Column(Float, nullable=False, default=0.0)  # approved, active and completed campaigns
+    impressions = Column(BigInteger, nullable=False, default=0)
+    clicks = Column(BigInteger, nullable=False, default=0)
+    unread_notifications = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<AdvertiserSummary {self.advertiser_id}: {self.total_campaigns} campaigns>"
+
+
+class CampaignStatsHourly(Base):
+    """
+    Impressions and clicks per campaign per UTC hour, added to by event
+    ingestion (see app/timeseries.py). Kept for STATS_HOURLY_RETENTION_DAYS.
+    """
+    __tablename__ = "campaign_stats_hourly"
+    
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(DateTime, primary_key=True)  # start of the hour, UTC
+    impressions = Column(BigInteger, nullable=False, default=0)
+    clicks = Column(BigInteger, nullable=False, default=0)
+    
+    __table_args__ = (
+        # Rollup and retention scan by time across all campaigns
+        Index("ix_campaign_stats_hourly_bucket", "bucket"),
+    )
+    
+    def __repr__(self):
+        return f"<CampaignStatsHourly {self.campaign_id} @ {self.bucket}>"
+
+
+class CampaignStatsDaily(Base):
+    """
+    Impressions and clicks per campaign per UTC day, rolled up from
+    campaign_stats_hourly (see app/timeseries.py).
+    """
+    __tablename__ = "campaign_stats_daily"
+    
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(Date, primary_key=True)
+    impressions = Column(BigInteger, nullable=False, default=0)
+    clicks = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<CampaignStatsDaily {self.campaign_id} @ {self.bucket}>"
+
+
+class DimensionValue(Base):
+    """
+    Dictionary for event breakdown dimensions: each (dimension, value) pair,
+    e.g. ("device", "mobile"), gets a small integer id that
+    campaign_stats_breakdown stores instead of the string (see
+    app/dimensions.py).
+    """
+    __tablename__ = "dimension_values"
+    
+    id = Column(Integer, primary_key=True)
+    dimension = Column(String(20), nullable=False)
+    value = Column(String(64), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_dimension_values_dimension_value", "dimension", "value", unique=True),
+    )
+    
+    def __repr__(self):
+        return f"<DimensionValue {self.id}: {self.dimension}={self.value}>"
+
+
+class CampaignStatsBreakdown(Base):
+    """
+    Impressions and clicks per campaign per UTC day and combination of
+    dimension ids (dimension_values.id; 0 = not reported), added to by event
+    ingestion (see app/timeseries.py).
+    """
+    __tablename__ = "campaign_stats_breakdown"
+    
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(Date, primary_key=True)
+    device_id = Column(Integer, primary_key=True, autoincrement=False, default=0)
+    state_id = Column(Integer, primary_key=True, autoincrement=False, default=0)
+    ad_format_id = Column(Integer, primary_key=True, autoincrement=False, default=0)
+    impressions = Column(BigInteger, nullable=False, default=0)
+    clicks = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<CampaignStatsBreakdown {self.campaign_id} @ {self.bucket}>"
+
+
+class CampaignStatsBreakdownMonthly(Base):
+    """
+    campaign_stats_breakdown summed per calendar month (bucket: the 1st),
+    added to alongside it, so breakdowns over long ranges read whole months.
+    """
+    __tablename__ = "campaign_stats_breakdown_monthly"
+    
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(Date, primary_key=True)
+    device_id = Column(Integer, primary_key=True, autoincrement=False, default=0)
+    state_id = Column(Integer, primary_key=True, autoincrement=False, default=0)
+    ad_format_id = Column(Integer, primary_key=True, autoincrement=False, default=0)
+    impressions = Column(BigInteger, nullable=False, default=0)
+    clicks = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<CampaignStatsBreakdownMonthly {self.campaign_id} @ {self.bucket}>"
+
+
+class CampaignReachDaily(Base):
+    """
+    HyperLogLog sketch of the distinct viewers of a campaign per UTC day
+    (app/utils/hyperloglog.py), merged into by event ingestion (see
+    app/reach.py).
+    """
+    __tablename__ = "campaign_reach_daily"
+    
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(Date, primary_key=True)
+    sketch = Column(LargeBinary, nullable=False)
+    
+    def __repr__(self):
+        return f"<CampaignReachDaily {self.campaign_id} @ {self.bucket}>"
@@ -2,13 +2,17 @@
 Dynamic Pricing Engine for Ad Campaigns.
 Calculates pricing based on coverage type, industry, location, and population density.
 """
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
-from typing import Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional
+import logging
 import math
 from fastapi import Depends
 from . import models, schemas
 from .database import get_db
 
+logger = logging.getLogger(__name__)
+
 
 class PricingEngine:
     """
@@ -46,6 +50,60 @@ class PricingEngine:
     
     def __init__(self, db: Session):
         self.db = db
+        # Set by preload(): lookups served from memory instead of per-call queries
+        self._batch: Optional[Dict[str, Any]] = None
+    
+    def preload(self, industry_types: Iterable[str], countries: Iterable[Optional[str]]):
+        """
+        Load every pricing matrix and geodata row a batch of calculations can
+        touch (two queries), so calculate_price() no longer queries per call.
+        """
+        countries = {c for c in countries if c}
+        matrices = self.db.query(models.PricingMatrix).filter(
+            models.PricingMatrix.industry_type.in_(set(industry_types))
+        ).order_by(models.PricingMatrix.id).all()
+        geodata = self.db.query(models.GeoData).filter(
+            or_(models.GeoData.country_code.in_(countries), models.GeoData.state_code.is_(None))
+        ).order_by(models.GeoData.id).all()
+        
+        batch = {"matrices": {}, "states": {}, "countries": {}, "country_sums": {}, "density": None}
+        for matrix in matrices:
+            key = (matrix.industry_type, matrix.advert_type, matrix.coverage_type)
+            batch["matrices"].setdefault(key, []).append(matrix)
+        for row in geodata:
+            if row.state_code is None:
+                batch["countries"].setdefault(row.country_code, row)
+                if batch["density"] is None:
+                    batch["density"] = row.density_multiplier
+            else:
+                batch["states"].setdefault(row.state_code, []).append(row)
+            if row.radius_areas_count is not None and row.density_multiplier is not None:
+                sums = batch["country_sums"]
+                sums[row.country_code] = sums.get(row.country_code, 0) + row.radius_areas_count * row.density_multiplier
+        self._batch = batch
+    
+    def calculate_prices(self, items: List[Dict[str, Any]]) -> List[Optional[schemas.PricingCalculateResponse]]:
+        """
+        Price many campaigns in one pass: calculate_price(**item) for each item,
+        with lookups preloaded and identical inputs priced once. Items the
+        engine cannot price come back as None.
+        """
+        self.preload((item["industry_type"] for item in items), (item.get("target_country") for item in items))
+        results: Dict[tuple, Optional[schemas.PricingCalculateResponse]] = {}
+        priced = []
+        try:
+            for item in items:
+                key = tuple(sorted(item.items()))
+                if key not in results:
+                    try:
+                        results[key] = self.calculate_price(**item)
+                    except Exception as e:
+                        logger.warning("⚠️ Pricing failed for %s: %s", item, e)
+                        results[key] = None
+                priced.append(results[key])
+        finally:
+            self._batch = None
+        return priced
     
     def calculate_price(
         self,
@@ -91,9 +149,12 @@ class PricingEngine:
         
         elif coverage_type == models.CoverageType.COUNTRY and target_country:
             # For country-wide, sum up all states for that country if available
-            country_sum = self.db.query(
-                func.sum(models.GeoData.radius_areas_count * models.GeoData.density_multiplier)
-            ).filter(models.GeoData.country_code == target_country).scalar()
+            if self._batch is not None:
+                country_sum = self._batch["country_sums"].get(target_country)
+            else:
+                country_sum = self.db.query(
+                    func.sum(models.GeoData.radius_areas_count * models.GeoData.density_multiplier)
+                ).filter(models.GeoData.country_code == target_country).scalar()
             
             if country_sum:
                 coverage_multiplier = float(country_sum)
@@ -113,7 +174,7 @@ class PricingEngine:
         
         # 4. Calculate estimated reach
         estimated_reach = self._calculate_reach(
-            coverage_type, target_postcode, target_state, target_country
+            coverage_type, target_postcode, target_state, target_country, radius
         )
         
         # 5. Apply Discounts
@@ -183,6 +244,12 @@ class PricingEngine:
         country_id: Optional[str] = None
     ) -> Optional[models.PricingMatrix]:
         """Retrieve pricing matrix from database."""
+        if self._batch is not None:
+            candidates = self._batch["matrices"].get((industry_type, advert_type, coverage_type), [])
+            if country_id:
+                candidates = [m for m in candidates if m.country_id == country_id]
+            return candidates[0] if candidates else None
+        
         query = self.db.query(models.PricingMatrix).filter(
             models.PricingMatrix.industry_type == industry_type,
             models.PricingMatrix.advert_type == advert_type,
@@ -228,7 +295,8 @@ class PricingEngine:
         coverage_type: models.CoverageType,
         target_postcode: Optional[str] = None,
         target_state: Optional[str] = None,
-        target_country: Optional[str] = None
+        target_country: Optional[str] = None,
+        radius: int = 30
     ) -> int:
         """
         Calculate estimated reach (number of people).
@@ -267,9 +335,12 @@ class PricingEngine:
         """Get population density for a postcode, falling back to national average."""
         # For this implementation, we'll try to find any GeoData record to use as a density source
         # or use the default national density.
-        avg_density = self.db.query(models.GeoData.density_multiplier).filter(
-            models.GeoData.state_code.is_(None)
-        ).scalar()
+        if self._batch is not None:
+            avg_density = self._batch["density"]
+        else:
+            avg_density = self.db.query(models.GeoData.density_multiplier).filter(
+                models.GeoData.state_code.is_(None)
+            ).scalar()
         
         return (avg_density or 1.0) * self.RADIUS_30_REACH_PER_SQ_MILE
 
@@ -281,6 +352,12 @@ class PricingEngine:
         if not state_code:
             return None
         
+        if self._batch is not None:
+            candidates = self._batch["states"].get(state_code, [])
+            if country_code:
+                candidates = [g for g in candidates if g.country_code == country_code]
+            return candidates[0] if candidates else None
+        
         query = self.db.query(models.GeoData).filter(
             models.GeoData.state_code == state_code
         )
@@ -297,6 +374,9 @@ class PricingEngine:
         if not country_code:
             return None
         
+        if self._batch is not None:
+            return self._batch["countries"].get(country_code)
+        
         return self.db.query(models.GeoData).filter(
             models.GeoData.country_code == country_code,
             models.GeoData.state_code.is_(None)  # Country-level record
@@ -0,0 +1,58 @@
+"""
+Response classes.
+
+ORJSONResponse serializes with orjson, which is several times faster than
+the stdlib encoder and handles datetime/date/UUID natively.
+
+Routes that declare a response_model are best left on FastAPI's default
+response class: FastAPI then dumps the model straight to JSON bytes with
+pydantic-core, which is faster still. Use ORJSONResponse for routes that
+return plain dicts/lists (as a router default, or returned directly to
+also skip jsonable_encoder).
+"""
+from typing import Any, Dict
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+
+from .utils.compression import available_encodings, compress, negotiate_encoding
+
+# Precompressed bodies are built once, so by default spend the CPU on the best ratio
+MAX_LEVELS = {"gzip": 9, "br": 11}
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class PrecompressedJSON:
+    """
+    A JSON payload encoded once, with gzip/brotli variants compressed once at
+    maximum level. Cache an instance and call `response()` per request; the
+    matching variant is served without any per-request encoding work.
+    """
+
+    def __init__(self, body: bytes, min_size: int = 0, levels: Dict[str, int] = None):
+        self.body = body
+        self.variants: Dict[str, bytes] = {}
+        if len(self.body) >= min_size:
+            levels = levels or MAX_LEVELS
+            for encoding in available_encodings():
+                self.variants[encoding] = compress(self.body, encoding, levels[encoding])
+
+    @classmethod
+    def from_content(cls, content: Any, min_size: int = 0, levels: Dict[str, int] = None) -> "PrecompressedJSON":
+        return cls(orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS), min_size, levels)
+
+    def response(self, accept_encoding: str = "", headers: Dict[str, str] = None, status_code: int = 200) -> Response:
+        headers = dict(headers or {})
+        encoding = negotiate_encoding(accept_encoding, self.variants) if self.variants else None
+        if self.variants:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding is None:
+            return Response(self.body, status_code, headers, media_type="application/json")
+        headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], status_code, headers, media_type="application/json")
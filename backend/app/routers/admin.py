@@ -2,35 +2,45 @@
 Admin router for user, campaign, and system management.
 Provides comprehensive administrative controls.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy import String, cast, func
+from typing import List, Literal, Optional, Union
+from datetime import date, datetime, time, timedelta
 import logging
 logger = logging.getLogger(__name__)
 
-from ..database import get_db
-from .. import models, schemas, auth
+from ..database import get_db, get_read_db
+from .. import models, schemas, auth, search
+from ..cache import cached_response
+from ..responses import ORJSONResponse
+from ..utils.export import ENCODERS, MEDIA_TYPES, stream_query
+from ..utils.pagination import page_response, page_result, paginate
+from ..utils.projection import campaign_summary_columns, columns_for, rows_as_dicts
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
 # ==================== User Management ====================
 
-@router.get("/users", response_model=List[schemas.UserResponse])
+@router.get("/users", response_model=Union[List[schemas.UserResponse], schemas.CursorPage[schemas.UserResponse]])
 async def get_all_users(
+    response: Response,
     role: Optional[str] = Query(None, description="Filter by user role"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     current_user: models.User = Depends(auth.get_any_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all users (Admin/Country Admin).
     
     - **role**: Filter by role ('advertiser' or 'admin')
-    - **skip**: Pagination offset
+    - **skip**: Pagination offset (legacy; prefer cursor)
     - **limit**: Maximum number of results
+    - **cursor**: Keyset cursor; returns {items, next_cursor} (empty for the first page)
     """
     query = db.query(models.User)
     
@@ -40,7 +50,7 @@ async def get_all_users(
         if current_user.managed_country:
             query = query.filter(models.User.country == current_user.managed_country)
         else:
-            return []
+            return page_result([], None, cursor, response)
 
     # Apply filter if provided in query parameter
     if role:
@@ -54,14 +64,16 @@ async def get_all_users(
     
     try:
         # Fetch users
-        users = query.order_by(models.User.created_at.desc()).offset(skip).limit(limit).all()
+        users, next_cursor = paginate(query, models.User, cursor, limit, offset=skip)
         
         # Log success
-        logger.info(f"✅ Fetched {len(users)} users for admin {current_user.email}")
+        logger.info("✅ Fetched %s users for admin %s", len(users), current_user.email)
         
-        return users
+        return page_result(users, next_cursor, cursor, response)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"❌ User Directory Error: {str(e)}")
+        logger.error("❌ User Directory Error: %s", e)
         # If columns are missing, this will fail. Suggest running fix-db.
         if "column" in str(e).lower() or "no such column" in str(e).lower():
              raise HTTPException(
@@ -75,7 +87,7 @@ async def get_all_users(
 async def get_user_count(
     role: Optional[str] = Query(None, description="Filter by user role"),
     current_user: models.User = Depends(auth.get_any_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get the total count of users (Admin/Country Admin).
@@ -162,18 +174,18 @@ async def update_user(
                 setattr(user, field, role_val)
             elif field == 'role' and value is None:
                 # Never allow role to be set to null
-                logger.warning(f"Attempted to set user {user.id}'s role to null by admin {current_user.email}. Ignoring.")
+                logger.warning("Attempted to set user %s's role to null by admin %s. Ignoring.", user.id, current_user.email)
                 continue
             else:
                 setattr(user, field, value)
         
         db.commit()
         db.refresh(user)
-        logger.info(f"✅ User {user.email} (ID: {user.id}) updated by admin {current_user.email} (ID: {current_user.id})")
+        logger.info("✅ User %s (ID: %s) updated by admin %s (ID: %s)", user.email, user.id, current_user.email, current_user.id)
         return user
     except Exception as e:
         db.rollback()
-        logger.error(f"❌ User Update Error for user {user_id} by admin {current_user.email}: {str(e)}")
+        logger.error("❌ User Update Error for user %s by admin %s: %s", user_id, current_user.email, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -214,24 +226,28 @@ async def delete_user(
 
 # ==================== Campaign Management ====================
 
-@router.get("/campaigns", response_model=List[schemas.CampaignResponse])
+@router.get("/campaigns", response_model=Union[List[schemas.CampaignSummary], schemas.CursorPage[schemas.CampaignSummary]])
 async def get_all_campaigns(
     status: Optional[str] = Query(None),
     advertiser_id: Optional[int] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     current_user: models.User = Depends(auth.get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all campaigns (Admin only).
     
     - **status**: Filter by campaign status
     - **advertiser_id**: Filter by advertiser
-    - **skip**: Pagination offset
+    - **skip**: Pagination offset (legacy; prefer cursor)
     - **limit**: Maximum number of results
+    - **cursor**: Keyset cursor; returns {items, next_cursor} (empty for the first page)
+    
+    Rows are summaries; GET /campaigns/{id} returns the full campaign.
     """
-    query = db.query(models.Campaign)
+    query = db.query(*campaign_summary_columns())
     
     if status:
         try:
@@ -246,9 +262,106 @@ async def get_all_campaigns(
     if advertiser_id:
         query = query.filter(models.Campaign.advertiser_id == advertiser_id)
     
-    campaigns = query.order_by(models.Campaign.created_at.desc()).offset(skip).limit(limit).all()
+    campaigns, next_cursor = paginate(query, models.Campaign, cursor, limit, offset=skip)
     
-    return campaigns
+    return page_response(rows_as_dicts(campaigns, schemas.CampaignSummary), next_cursor, cursor)
+
+
+@router.get("/campaigns/search", response_model=schemas.CampaignSearchPage)
+async def search_campaigns(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in name, tags, headline or description"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by campaign status"),
+    country: Optional[str] = Query(None, description="Filter by target country"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page"),
+    current_user: models.User = Depends(auth.get_any_admin_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Full-text campaign search (Admin/Country Admin), best match first.
+    
+    Every word must match (as a prefix). Country admins only search their
+    managed country. The first page also carries status and country facet
+    counts; pass next_cursor as ?cursor= for further pages.
+    """
+    status_enum = None
+    if status_filter:
+        try:
+            status_enum = models.CampaignStatus(status_filter.upper())
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid status: {status_filter}"
+            )
+    
+    user_role = str(current_user.role).lower() if current_user.role else ""
+    if user_role == "country_admin":
+        if not current_user.managed_country:
+            return ORJSONResponse({"items": [], "next_cursor": None, "facets": None})
+        country = current_user.managed_country
+    
+    items, next_cursor = search.search_campaigns(db, q, country=country, status=status_enum, cursor=cursor, limit=limit)
+    facets = None if cursor else search.search_facets(db, q, country=country, status=status_enum)
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor, "facets": facets})
+
+
+@router.get("/campaigns/export")
+async def export_campaigns(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson or csv"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by campaign status"),
+    country: Optional[str] = Query(None, description="Filter by target country"),
+    created_from: Optional[date] = Query(None, description="Created on or after this date"),
+    created_to: Optional[date] = Query(None, description="Created on or before this date"),
+    current_user: models.User = Depends(auth.get_any_admin_user),
+):
+    """
+    Stream every matching campaign (Admin/Country Admin) as NDJSON or CSV.
+    
+    Rows have the CampaignResponse fields and come in id order. Country
+    admins only export their managed country. The body is streamed from a
+    server-side cursor, so large exports do not build up in memory.
+    """
+    status_enum = None
+    if status_filter:
+        try:
+            status_enum = models.CampaignStatus(status_filter.upper())
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid status: {status_filter}"
+            )
+    
+    user_role = str(current_user.role).lower() if current_user.role else ""
+    if user_role == "country_admin":
+        # No managed country matches nothing, as in search
+        country = current_user.managed_country or ""
+    
+    columns = columns_for(
+        models.Campaign,
+        schemas.CampaignResponse,
+        status=func.lower(cast(models.Campaign.status, String)),
+    )
+    
+    def build_query(db: Session):
+        query = db.query(*columns)
+        if status_enum:
+            query = query.filter(models.Campaign.status == status_enum)
+        if country is not None:
+            query = query.filter(models.Campaign.target_country == country.upper())
+        if created_from:
+            query = query.filter(models.Campaign.created_at >= datetime.combine(created_from, time.min))
+        if created_to:
+            query = query.filter(models.Campaign.created_at < datetime.combine(created_to + timedelta(days=1), time.min))
+        return query.order_by(models.Campaign.id)
+    
+    names = list(schemas.CampaignResponse.model_fields)
+    filename = f"campaigns-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    logger.info("📤 Campaign export (%s) started by %s", format, current_user.email)
+    return StreamingResponse(
+        ENCODERS[format](stream_query(build_query), names),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.put("/campaigns/{campaign_id}/status", response_model=schemas.CampaignResponse)
@@ -287,10 +400,11 @@ async def update_campaign_status(
 # ==================== Geographic Data Management ====================
 
 @router.get("/geodata", response_model=List[schemas.GeoDataResponse])
+@cached_response(models.GeoData)
 async def get_all_geodata(
     country_code: Optional[str] = Query(None),
     current_user: models.User = Depends(auth.get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all geographic data entries (Admin only).
@@ -399,7 +513,7 @@ async def seed_bd_data(
 @router.get("/stats")
 async def get_system_stats(
     current_user: models.User = Depends(auth.get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get system-wide statistics (Admin only).
@@ -1,12 +1,19 @@
 """
 Analytics router for campaign performance metrics.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from datetime import date, datetime, timedelta
+
+import orjson
 
 from ..database import get_db
-from .. import models, schemas, auth
+from .. import models, schemas, auth, dimensions, ingestion, reach, summaries, timeseries
+from ..config import settings
+from ..utils.hyperloglog import hash_item
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
@@ -26,6 +33,7 @@ async def get_campaign_analytics(
     - CTR (Click-Through Rate)
     - Budget vs Spent
     - Campaign dates and status
+    - Unique reach (estimated distinct viewers)
     """
     campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
     
@@ -58,12 +66,175 @@ async def get_campaign_analytics(
         remaining_budget=max(campaign.budget - spent, 0),
         start_date=campaign.start_date,
         end_date=campaign.end_date,
-        status=campaign.status
+        status=campaign.status,
+        unique_reach=reach.estimate(db, [campaign.id])
     )
     
     return analytics
 
 
+def _check_campaign_access(db: Session, campaign_id: int, current_user: models.User):
+    """404 if the campaign doesn't exist, 403 if it isn't the user's (admins see all)."""
+    campaign = db.execute(
+        select(models.Campaign.id, models.Campaign.advertiser_id).where(models.Campaign.id == campaign_id)
+    ).first()
+    
+    if not campaign:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campaign not found"
+        )
+    
+    # Check ownership
+    role = str(current_user.role).lower() if current_user.role else ""
+    if role != "admin" and campaign.advertiser_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view analytics for this campaign"
+        )
+
+
+def _check_range(start: date, end: date, granularity: str):
+    """400 unless start <= end and the range fits in MAX_POINTS buckets."""
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'"
+        )
+    days = (end - start).days + 1
+    if days * (24 if granularity == "hour" else 1) > timeseries.MAX_POINTS[granularity]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {timeseries.MAX_POINTS[granularity]} {granularity}s per request"
+        )
+
+
+@router.get("/campaign/{campaign_id}/timeseries", response_model=schemas.CampaignTimeseries)
+async def get_campaign_timeseries(
+    campaign_id: int,
+    start: Optional[date] = Query(None, alias="from", description="First day (UTC, inclusive); default: 7 days (hour) or 30 days (day) before `to`"),
+    end: Optional[date] = Query(None, alias="to", description="Last day (UTC, inclusive); default: today"),
+    granularity: Literal["hour", "day"] = Query("day"),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Impressions, clicks and CTR per hour or per day, for charts.
+    
+    Every bucket in the range is returned (zero-filled). Hourly data is
+    kept for STATS_HOURLY_RETENTION_DAYS days; daily data for the
+    campaign's lifetime.
+    """
+    _check_campaign_access(db, campaign_id, current_user)
+    
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=6 if granularity == "hour" else 29)
+    _check_range(start, end, granularity)
+    
+    return schemas.CampaignTimeseries(
+        campaign_id=campaign_id,
+        granularity=granularity,
+        start=start,
+        end=end,
+        points=timeseries.series(db, campaign_id, start, end, granularity)
+    )
+
+
+@router.get("/campaign/{campaign_id}/breakdown", response_model=schemas.CampaignBreakdown)
+async def get_campaign_breakdown(
+    campaign_id: int,
+    by: str = Query(..., description=f"Comma-separated dimensions to group by: {', '.join(dimensions.DIMENSIONS)}"),
+    start: Optional[date] = Query(None, alias="from", description="First day (UTC, inclusive); default: 30 days before `to`"),
+    end: Optional[date] = Query(None, alias="to", description="Last day (UTC, inclusive); default: today"),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Impressions, clicks and CTR per combination of dimension values
+    (e.g. `by=device,state`), most impressions first.
+    
+    Dimensions come from the `dims` of events sent to /events:batch; events
+    that didn't report a dimension are grouped under null.
+    """
+    names = list(dict.fromkeys(name.strip() for name in by.split(",") if name.strip()))
+    unknown = [name for name in names if name not in dimensions.DIMENSIONS]
+    if not names or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"'by' must list dimensions from: {', '.join(dimensions.DIMENSIONS)}"
+        )
+    _check_campaign_access(db, campaign_id, current_user)
+    
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    _check_range(start, end, "day")
+    
+    return schemas.CampaignBreakdown(
+        campaign_id=campaign_id,
+        by=names,
+        start=start,
+        end=end,
+        rows=timeseries.breakdown(db, campaign_id, names, start, end)
+    )
+
+
+_MAX_REACH_CAMPAIGNS = 1000
+
+
+@router.get("/reach", response_model=schemas.ReachEstimate)
+async def get_unique_reach(
+    campaign_ids: Optional[List[int]] = Query(None, alias="campaign_id", description="Repeat for several campaigns; default: all of yours"),
+    start: Optional[date] = Query(None, alias="from", description="First day (UTC, inclusive); default: no limit"),
+    end: Optional[date] = Query(None, alias="to", description="Last day (UTC, inclusive); default: no limit"),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Estimated distinct viewers across the given campaigns and days.
+    
+    A viewer reached by several campaigns or on several days counts once.
+    Estimated from HyperLogLog sketches (about 1.6% standard error) of the
+    `viewer` reported with events sent to /events:batch.
+    """
+    if start is not None and end is not None and start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'"
+        )
+    if campaign_ids:
+        campaign_ids = sorted(set(campaign_ids))
+        if len(campaign_ids) > _MAX_REACH_CAMPAIGNS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {_MAX_REACH_CAMPAIGNS} campaigns per request"
+            )
+        owners = dict(db.execute(
+            select(models.Campaign.id, models.Campaign.advertiser_id).where(models.Campaign.id.in_(campaign_ids))
+        ).all())
+        if len(owners) < len(campaign_ids):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Campaign not found"
+            )
+        role = str(current_user.role).lower() if current_user.role else ""
+        if role != "admin" and any(owner != current_user.id for owner in owners.values()):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to view analytics for this campaign"
+            )
+        scope = campaign_ids
+    else:
+        campaign_ids = None
+        scope = select(models.Campaign.id).where(models.Campaign.advertiser_id == current_user.id)
+    
+    return schemas.ReachEstimate(
+        campaign_ids=campaign_ids,
+        start=start,
+        end=end,
+        unique_reach=reach.estimate(db, scope, start, end)
+    )
+
+
 @router.get("/user/summary", response_model=dict)
 async def get_user_analytics_summary(
     current_user: models.User = Depends(auth.get_current_active_user),
@@ -72,46 +243,21 @@ async def get_user_analytics_summary(
     """
     Get analytics summary for the current user.
     
-    Returns aggregated metrics across all user campaigns.
-    """
-    # Get all user campaigns
-    campaigns = db.query(models.Campaign).filter(
-        models.Campaign.advertiser_id == current_user.id
-    ).all()
-    
-    if not campaigns:
-        return {
-            "total_campaigns": 0,
-            "active_campaigns": 0,
-            "total_impressions": 0,
-            "total_clicks": 0,
-            "average_ctr": 0.0,
-            "total_spent": 0.0,
-            "total_budget": 0.0
-        }
-    
-    # Aggregate metrics
-    total_impressions = sum(c.impressions for c in campaigns)
-    total_clicks = sum(c.clicks for c in campaigns)
-    average_ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0.0
-    
-    active_campaigns = sum(1 for c in campaigns if c.status in [models.CampaignStatus.APPROVED, models.CampaignStatus.ACTIVE])
-    
-    total_spent = sum(
-        c.calculated_price or 0 
-        for c in campaigns 
-        if c.status in [models.CampaignStatus.APPROVED, models.CampaignStatus.ACTIVE, models.CampaignStatus.COMPLETED]
-    )
-    total_budget = sum(c.budget for c in campaigns)
+    Returns aggregated metrics across all user campaigns, read from the
+    advertiser's dashboard summary row (no campaign scan).
+    """
+    summary = summaries.get_summary(db, current_user.id)
     
     return {
-        "total_campaigns": len(campaigns),
-        "active_campaigns": active_campaigns,
-        "total_impressions": total_impressions,
-        "total_clicks": total_clicks,
-        "average_ctr": round(average_ctr, 2),
-        "total_spent": round(total_spent, 2),
-        "total_budget": round(total_budget, 2)
+        "total_campaigns": summary["total_campaigns"],
+        "active_campaigns": summary["active_campaigns"],
+        "total_impressions": summary["impressions"],
+        "total_clicks": summary["clicks"],
+        "average_ctr": round(summary["ctr"], 2),
+        "total_spent": round(summary["total_spent"], 2),
+        "total_budget": round(summary["total_budget"], 2),
+        "campaigns_by_status": summary["campaigns_by_status"],
+        "unread_notifications": summary["unread_notifications"]
     }
 
 
@@ -127,11 +273,26 @@ async def record_campaign_event(
     Record analytics events for a campaign (Admin/System only).
     
     This endpoint would typically be called by your ad serving system.
+    Events are counted in memory and written in batches (see
+    app/ingestion.py), so they show up in the counters within
+    INGEST_FLUSH_INTERVAL_MS.
     
     - **event_type**: 'impression' or 'click'
     - **count**: Number of events to record (default: 1)
     """
-    campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
+    event_type = event_type.lower()
+    if event_type not in ingestion.EVENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid event_type. Must be 'impression' or 'click'"
+        )
+    if count < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="count must be at least 1"
+        )
+    
+    campaign = db.execute(select(models.Campaign.name).where(models.Campaign.id == campaign_id)).first()
     
     if not campaign:
         raise HTTPException(
@@ -139,18 +300,144 @@ async def record_campaign_event(
             detail="Campaign not found"
         )
     
-    if event_type.lower() == 'impression':
-        campaign.impressions += count
-    elif event_type.lower() == 'click':
-        campaign.clicks += count
-    else:
+    try:
+        ingestion.record(campaign_id, event_type, count)
+    except ingestion.IngestionBacklog:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid event_type. Must be 'impression' or 'click'"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event ingestion is backlogged, retry shortly",
+            headers={"Retry-After": "1"}
         )
     
-    db.commit()
-    
     return schemas.MessageResponse(
         message=f"Recorded {count} {event_type}(s) for campaign {campaign.name}"
     )
+
+
+_EVENTS = TypeAdapter(List[schemas.CampaignEvent])
+_MAX_REPORTED_ERRORS = 20
+
+
+async def _read_events(request: Request) -> Tuple[List[Any], List[int], List[str]]:
+    """
+    Raw entries of an NDJSON or JSON-array body, with each entry's 1-based
+    position (its line for NDJSON) and errors for NDJSON lines that are not JSON.
+    """
+    body = await request.body()
+    if "ndjson" in request.headers.get("content-type", ""):
+        items, positions, errors = [], [], []
+        for number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(orjson.loads(line))
+                positions.append(number)
+            except orjson.JSONDecodeError:
+                errors.append(f"line {number}: invalid JSON")
+        return items, positions, errors
+    try:
+        items = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array of events")
+    return items, list(range(1, len(items) + 1)), []
+
+
+def _validate_events(items: List[Any], positions: List[int], errors: List[str]) -> List[Tuple[int, schemas.CampaignEvent]]:
+    """
+    Validate the whole batch in one pydantic-core call. Invalid entries are
+    reported in `errors` and left out; returns (position, event) pairs.
+    """
+    try:
+        return list(zip(positions, _EVENTS.validate_python(items)))
+    except ValidationError as e:
+        bad = set()
+        for err in e.errors():
+            index, *field = err["loc"]
+            bad.add(index)
+            errors.append(f"event {positions[index]}: {'.'.join(str(part) for part in field) or 'event'}: {err['msg']}")
+    keep = [i for i in range(len(items)) if i not in bad]
+    events = _EVENTS.validate_python([items[i] for i in keep])
+    return [(positions[i], event) for i, event in zip(keep, events)]
+
+
+@router.post("/events:batch", response_model=schemas.CampaignEventBatchResponse)
+async def record_event_batch(
+    request: Request,
+    current_user: models.User = Depends(auth.get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Record a batch of analytics events (Admin/System only).
+    
+    Send NDJSON (Content-Type: application/x-ndjson) or a JSON array of
+    `{campaign_id, type, count, ts, dims}` objects; `type` is 'impression'
+    or 'click', `count` defaults to 1.
+    
+    `dims` may report the breakdown dimensions device, state and ad_format
+    (e.g. `{"device": "mobile", "state": "CA"}`); other names are ignored.
+    `viewer` is an opaque viewer hash, counted towards unique reach (it is
+    not stored).
+    
+    Invalid entries, unknown campaigns and events more than
+    STATS_LATE_EVENT_DAYS days old are rejected one by one; the rest are
+    counted in memory and written in batches (see app/ingestion.py).
+    If ingestion is backlogged the whole batch is refused with 503, so it
+    can be retried as is.
+    """
+    items, positions, errors = await _read_events(request)
+    received = len(items) + len(errors)
+    if received > settings.INGEST_BATCH_MAX_EVENTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.INGEST_BATCH_MAX_EVENTS} events per batch"
+        )
+    
+    events = _validate_events(items, positions, errors)
+    existing = ingestion.existing_campaigns(db, {event.campaign_id for _, event in events})
+    
+    now = datetime.utcnow()
+    counted = []
+    for position, event in events:
+        if event.campaign_id not in existing:
+            errors.append(f"event {position}: campaign {event.campaign_id} not found")
+            continue
+        bucket = timeseries.event_bucket(event.ts, now)
+        if bucket is None:
+            errors.append(f"event {position}: ts: more than {settings.STATS_LATE_EVENT_DAYS} days old or in the future")
+            continue
+        counted.append((position, event, bucket))
+    # Only events that will be counted may add dimension values
+    dimension_ids = dimensions.encode([event.dims for _, event, _ in counted])
+    
+    deltas: Dict[ingestion.Key, List[int]] = {}
+    viewers: Dict[Tuple[int, date], List[int]] = {}
+    accepted = 0
+    for (position, event, bucket), ids in zip(counted, dimension_ids):
+        if ids is None:
+            errors.append(f"event {position}: dims: too many distinct values for a dimension")
+            continue
+        key = (event.campaign_id, bucket, ids)
+        counters = deltas.get(key)
+        if counters is None:
+            counters = deltas[key] = [0, 0]
+        counters[ingestion.EVENT_TYPES[event.type]] += event.count
+        if event.viewer is not None:
+            viewers.setdefault((event.campaign_id, bucket.date()), []).append(hash_item(event.viewer))
+        accepted += 1
+    
+    try:
+        ingestion.record_many(deltas, viewers)
+    except ingestion.IngestionBacklog:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event ingestion is backlogged, retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    
+    return schemas.CampaignEventBatchResponse(
+        accepted=accepted,
+        rejected=received - accepted,
+        errors=errors[:_MAX_REPORTED_ERRORS]
+    )
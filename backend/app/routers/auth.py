@@ -4,10 +4,10 @@ Authentication router for signup, login, logout, and OAuth.
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from authlib.integrations.starlette_client import OAuth
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 from datetime import datetime
+from functools import lru_cache
 
 from ..database import get_db
 from .. import models, schemas, auth
@@ -15,24 +15,30 @@ from ..config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-# OAuth setup for Google
-# OAuth setup for Google
-oauth = OAuth()
+@lru_cache(maxsize=1)
+def get_oauth():
+    """
+    OAuth registry for Google, built on first use.
+    authlib is imported here rather than at module load to keep start-up fast.
+    """
+    from authlib.integrations.starlette_client import OAuth
 
-# Only register if client ID is provided
-if settings.GOOGLE_CLIENT_ID:
-    try:
-        oauth.register(
-            name='google',
-            client_id=settings.GOOGLE_CLIENT_ID,
-            client_secret=settings.GOOGLE_CLIENT_SECRET,
-            server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-            client_kwargs={'scope': 'openid email profile'}
-        )
-    except Exception as e:
-        # Log error or just pass, as we want to degrade gracefully
-        pass
+    oauth = OAuth()
 
+    # Only register if client ID is provided
+    if settings.GOOGLE_CLIENT_ID:
+        try:
+            oauth.register(
+                name='google',
+                client_id=settings.GOOGLE_CLIENT_ID,
+                client_secret=settings.GOOGLE_CLIENT_SECRET,
+                server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
+                client_kwargs={'scope': 'openid email profile'}
+            )
+        except Exception as e:
+            # Log error or just pass, as we want to degrade gracefully
+            pass
+    return oauth
 
 
 @router.post("/signup", response_model=schemas.Token, status_code=status.HTTP_201_CREATED)
@@ -207,7 +213,7 @@ async def google_login(request: Request):
         )
         
     redirect_uri = settings.GOOGLE_REDIRECT_URI
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    return await get_oauth().google.authorize_redirect(request, redirect_uri)
 
 
 
@@ -218,7 +224,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
     Completes authentication and creates/logs in user.
     """
     try:
-        token = await oauth.google.authorize_access_token(request)
+        token = await get_oauth().google.authorize_access_token(request)
         user_info = token.get('userinfo')
         
         if not user_info:
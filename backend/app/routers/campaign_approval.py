@@ -2,13 +2,15 @@
 Admin Campaign Approval Router.
 Handles campaign submission, approval, rejection, and change requests.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, NamedTuple, Optional
 from datetime import datetime
 
 from ..database import get_db
-from .. import models, schemas, auth
+from .. import models, schemas, auth, summaries
+from ..utils.email import campaign_status_email, send_emails
 
 import logging
 
@@ -16,6 +18,36 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/campaigns/approval", tags=["Campaign Approval"])
 
+PENDING_STATUSES = [models.CampaignStatus.PENDING_REVIEW, models.CampaignStatus.PENDING]
+BULK_ACTION_MAX_CAMPAIGNS = 1000
+
+
+class ApprovalAction(NamedTuple):
+    status: models.CampaignStatus
+    notification_type: models.NotificationType
+    title: str
+    message: str  # formatted with the campaign name and the admin's message
+    default_admin_message: Optional[str]  # None: the admin must give a message
+
+
+APPROVAL_ACTIONS = {
+    "approve": ApprovalAction(
+        models.CampaignStatus.APPROVED, models.NotificationType.CAMPAIGN_APPROVED, "Campaign Approved",
+        "Your campaign '{name}' has been approved and is now active.",
+        "Your campaign has been approved.",
+    ),
+    "reject": ApprovalAction(
+        models.CampaignStatus.REJECTED, models.NotificationType.CAMPAIGN_REJECTED, "Campaign Rejected",
+        "Your campaign '{name}' has been rejected. Reason: {admin_message}",
+        None,
+    ),
+    "request_changes": ApprovalAction(
+        models.CampaignStatus.CHANGES_REQUIRED, models.NotificationType.CHANGES_REQUIRED, "Changes Required",
+        "Your campaign '{name}' requires changes. Details: {admin_message}",
+        None,
+    ),
+}
+
 
 def require_admin(current_user: models.User = Depends(auth.get_current_active_user)):
     """Dependency to ensure only admin users can access."""
@@ -91,7 +123,7 @@ async def submit_campaign_for_review(
     db.commit()
     db.refresh(campaign)
     
-    logger.info(f"📨 Campaign '{campaign.name}' (ID: {campaign.id}) submitted for review by user {current_user.id}")
+    logger.info("📨 Campaign '%s' (ID: %s) submitted for review by user %s", campaign.name, campaign.id, current_user.id)
     
     return schemas.CampaignApprovalResponse(
         campaign_id=campaign.id,
@@ -109,7 +141,10 @@ async def list_pending_campaigns(
     List all campaigns pending admin review.
     Filtered by managed_country if user is a COUNTRY_ADMIN.
     """
-    query = db.query(models.Campaign).filter(
+    # Join the advertiser in the same query (avoids one User lookup per campaign)
+    query = db.query(models.Campaign, models.User.name, models.User.email).outerjoin(
+        models.User, models.User.id == models.Campaign.advertiser_id
+    ).filter(
         models.Campaign.status.in_([
             models.CampaignStatus.PENDING_REVIEW, 
             models.CampaignStatus.PENDING
@@ -125,11 +160,8 @@ async def list_pending_campaigns(
     pending_campaigns = query.order_by(models.Campaign.submitted_at.asc()).all()
     
     result = []
-    for c in pending_campaigns:
+    for c, advertiser_name, advertiser_email in pending_campaigns:
         try:
-            # Get advertiser info
-            advertiser = db.query(models.User).filter(models.User.id == c.advertiser_id).first()
-            
             # Safely get enum values as strings
             status_val = c.status.value if hasattr(c.status, 'value') else str(c.status)
             coverage_val = c.coverage_type.value if hasattr(c.coverage_type, 'value') else str(c.coverage_type)
@@ -138,8 +170,8 @@ async def list_pending_campaigns(
                 id=c.id,
                 name=c.name or "Untitled Campaign",
                 advertiser_id=c.advertiser_id,
-                advertiser_name=advertiser.name if advertiser else "Unknown Advertiser",
-                advertiser_email=advertiser.email if advertiser else "unknown@email.com",
+                advertiser_name=advertiser_name or "Unknown Advertiser",
+                advertiser_email=advertiser_email or "unknown@email.com",
                 industry_type=c.industry_type or "General",
                 ad_format=c.ad_format or "Display",
                 coverage_type=coverage_val,
@@ -150,10 +182,10 @@ async def list_pending_campaigns(
                 status=status_val.lower()
             ))
         except Exception as item_err:
-            logger.error(f"❌ Error processing pending campaign {c.id}: {item_err}")
+            logger.error("❌ Error processing pending campaign %s: %s", c.id, item_err)
             continue
     
-    logger.info(f"📋 Admin {admin_user.email} (Role: {admin_user.role}) fetched {len(result)} pending campaigns")
+    logger.info("📋 Admin %s (Role: %s) fetched %s pending campaigns", admin_user.email, admin_user.role, len(result))
     return result
 
 
@@ -182,7 +214,7 @@ async def take_approval_action(
     if admin_user.role == models.UserRole.COUNTRY_ADMIN:
         managed = (admin_user.managed_country or "").upper()
         if campaign.target_country != managed:
-            logger.warning(f"🚫 UNAUTHORIZED ACCESS: {admin_user.email} tried to manage {campaign.target_country} campaign {campaign.id}")
+            logger.warning("🚫 UNAUTHORIZED ACCESS: %s tried to manage %s campaign %s", admin_user.email, campaign.target_country, campaign.id)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access Denied: You are only authorized to manage campaigns for {managed}."
@@ -213,7 +245,7 @@ async def take_approval_action(
         )
         
         response_message = "Campaign approved and activated successfully"
-        logger.info(f"✅ Campaign '{campaign.name}' (ID: {campaign.id}) APPROVED and ACTIVATED by admin {admin_user.email}")
+        logger.info("✅ Campaign '%s' (ID: %s) APPROVED and ACTIVATED by admin %s", campaign.name, campaign.id, admin_user.email)
         
     elif action == "reject":
         if not action_request.message:
@@ -238,7 +270,7 @@ async def take_approval_action(
         )
         
         response_message = "Campaign rejected"
-        logger.info(f"❌ Campaign '{campaign.name}' (ID: {campaign.id}) REJECTED by admin {admin_user.email}")
+        logger.info("❌ Campaign '%s' (ID: %s) REJECTED by admin %s", campaign.name, campaign.id, admin_user.email)
         
     elif action == "request_changes":
         if not action_request.message:
@@ -263,7 +295,7 @@ async def take_approval_action(
         )
         
         response_message = "Changes requested from advertiser"
-        logger.info(f"📝 Campaign '{campaign.name}' (ID: {campaign.id}) - CHANGES REQUIRED by admin {admin_user.email}")
+        logger.info("📝 Campaign '%s' (ID: %s) - CHANGES REQUIRED by admin %s", campaign.name, campaign.id, admin_user.email)
         
     else:
         raise HTTPException(
@@ -282,6 +314,109 @@ async def take_approval_action(
     )
 
 
+@router.post("/bulk-action", response_model=schemas.CampaignBulkApprovalResponse)
+async def take_bulk_approval_action(
+    action_request: schemas.CampaignBulkApprovalAction,
+    background_tasks: BackgroundTasks,
+    admin_user: models.User = Depends(auth.get_any_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply approve, reject, or request changes to many pending campaigns.
+    
+    One UPDATE per pending status (so the dashboard summaries know which
+    status each campaign left) moves every campaign that is pending review
+    and, for a COUNTRY_ADMIN, targets their managed_country; the rest are
+    returned in `skipped`. Notifications are inserted in one statement and
+    the advertiser emails are sent after the response.
+    """
+    action = action_request.action.lower()
+    spec = APPROVAL_ACTIONS.get(action)
+    if spec is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid action '{action}'. Valid actions: {', '.join(APPROVAL_ACTIONS)}"
+        )
+    admin_message = action_request.message or spec.default_admin_message
+    if not admin_message:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A message is required for this action"
+        )
+    campaign_ids = list(dict.fromkeys(action_request.campaign_ids))
+    if len(campaign_ids) > BULK_ACTION_MAX_CAMPAIGNS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_ACTION_MAX_CAMPAIGNS} campaigns per request"
+        )
+    
+    scope = [models.Campaign.id.in_(campaign_ids)]
+    # PERMISSION CHECK: Country Admin can only manage campaigns for their country
+    if admin_user.role == models.UserRole.COUNTRY_ADMIN:
+        scope.append(models.Campaign.target_country == (admin_user.managed_country or "").upper())
+    
+    # One UPDATE per pending status, so each knows what its rows moved from
+    updated = []
+    reviewed_at = datetime.utcnow()
+    for source in PENDING_STATUSES:
+        rows = db.execute(
+            update(models.Campaign)
+            .where(*scope, models.Campaign.status == source)
+            .values(
+                status=spec.status,
+                admin_message=admin_message,
+                reviewed_by=admin_user.id,
+                reviewed_at=reviewed_at,
+            )
+            .returning(models.Campaign.id, models.Campaign.advertiser_id, models.Campaign.name, models.Campaign.calculated_price)
+            .execution_options(synchronize_session=False)
+        ).all()
+        summaries.move(db, rows, source, spec.status)
+        updated.extend(rows)
+    
+    emails = []
+    if updated:
+        notifications = [
+            {
+                "user_id": row.advertiser_id,
+                "campaign_id": row.id,
+                "notification_type": spec.notification_type,
+                "title": spec.title,
+                "message": spec.message.format(name=row.name, admin_message=admin_message),
+                "is_read": False,
+            }
+            for row in updated
+        ]
+        db.execute(insert(models.Notification), notifications)
+        addresses = dict(
+            db.query(models.User.id, models.User.email)
+            .filter(models.User.id.in_({row.advertiser_id for row in updated}))
+            .all()
+        )
+        emails = [
+            campaign_status_email(addresses[n["user_id"]], n["title"], n["message"])
+            for n in notifications if addresses.get(n["user_id"])
+        ]
+    
+    updated_ids = sorted(row.id for row in updated)
+    skipped = sorted(set(campaign_ids) - set(updated_ids))
+    logger.info(
+        "🗂️ Bulk %s by admin %s: %d updated, %d skipped",
+        action, admin_user.email, len(updated_ids), len(skipped)
+    )
+    db.commit()
+    
+    if emails:
+        background_tasks.add_task(send_emails, emails)
+    return schemas.CampaignBulkApprovalResponse(
+        action=action,
+        status=spec.status,
+        updated=updated_ids,
+        skipped=skipped,
+        message=f"{len(updated_ids)} campaign(s) updated, {len(skipped)} skipped"
+    )
+
+
 @router.get("/notifications", response_model=List[schemas.NotificationResponse])
 async def get_user_notifications(
     current_user: models.User = Depends(auth.get_current_active_user),
@@ -339,13 +474,14 @@ async def mark_all_notifications_read(
     db: Session = Depends(get_db)
 ):
     """Mark all notifications as read for the current user."""
-    db.query(models.Notification).filter(
+    read = db.query(models.Notification).filter(
         models.Notification.user_id == current_user.id,
         models.Notification.is_read == False
     ).update({
         "is_read": True,
         "read_at": datetime.utcnow()
     })
+    summaries.add(db, current_user.id, unread_notifications=-read)
     db.commit()
     
     return {"message": "All notifications marked as read"}
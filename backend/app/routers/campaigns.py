@@ -2,18 +2,39 @@
 Campaign management router.
 Handles CRUD operations for advertising campaigns.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from pydantic import ValidationError
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
+import csv
+import io
+import logging
 
+import orjson
+
+from ..config import settings
 from ..database import get_db
 from .. import models, schemas, auth
+from ..utils.pagination import page_response, paginate
+from ..utils.projection import campaign_summary_columns, rows_as_dicts
 from ..pricing import PricingEngine, get_pricing_engine
-from dateutil.relativedelta import relativedelta
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/campaigns", tags=["Campaigns"])
 
+# Rows per INSERT ... VALUES batch in bulk imports
+BULK_INSERT_CHUNK = 500
+
+
+def _coverage_area(price: Optional[schemas.PricingCalculateResponse], coverage_type) -> str:
+    """A campaign's coverage_area from its price (None when pricing failed)."""
+    if price is None:
+        return f"{coverage_type} coverage"
+    return price.breakdown["coverage_description"]
+
 
 @router.post("", response_model=schemas.CampaignResponse, status_code=status.HTTP_201_CREATED)
 @router.post("/create", response_model=schemas.CampaignResponse, status_code=status.HTTP_201_CREATED)
@@ -38,6 +59,7 @@ async def create_campaign(
             campaign_data.target_country = verified_country
 
         # 1. Handle dates logic robustly
+        from dateutil.relativedelta import relativedelta
         if campaign_data.duration and not campaign_data.end_date:
             campaign_data.end_date = campaign_data.start_date + relativedelta(months=campaign_data.duration)
         elif not campaign_data.end_date:
@@ -58,10 +80,10 @@ async def create_campaign(
                 target_state=campaign_data.target_state,
                 target_country=campaign_data.target_country
             )
-            coverage_area_desc = pricing_result.breakdown.get('coverage_area_description', 'Specified Coverage Area')
         except Exception as pe:
-            logger.error(f"⚠️ Pricing engine error: {pe}")
-            coverage_area_desc = f"{campaign_data.coverage_type} coverage"
+            logger.error("⚠️ Pricing engine error: %s", pe)
+            pricing_result = None
+        coverage_area_desc = _coverage_area(pricing_result, campaign_data.coverage_type)
 
         # 3. Create campaign object
         target_status = campaign_data.status or models.CampaignStatus.PENDING_REVIEW
@@ -100,18 +122,176 @@ async def create_campaign(
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
-        logger.error(f"🔥 CRITICAL ERROR in create_campaign: {e}\n{error_trace}")
+        logger.error("🔥 CRITICAL ERROR in create_campaign: %s\n%s", e, error_trace)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Campaign creation failed: {str(e)}"
         )
 
 
-@router.get("/list", response_model=List[schemas.CampaignResponse])
+def _read_csv(raw: bytes) -> List[Dict[str, Any]]:
+    """CSV rows as dicts; blank cells become None and `tags` is split on ';'."""
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV must be UTF-8 encoded")
+    rows = []
+    for record in csv.DictReader(io.StringIO(text)):
+        row = {key.strip(): (value.strip() or None) if isinstance(value, str) else value
+               for key, value in record.items() if key}
+        if row.get("tags"):
+            row["tags"] = [tag.strip() for tag in row["tags"].split(";") if tag.strip()]
+        rows.append(row)
+    return rows
+
+
+async def _read_bulk_rows(request: Request) -> List[Any]:
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload the CSV as the 'file' field")
+        return _read_csv(await upload.read())
+    body = await request.body()
+    if "csv" in content_type:
+        return _read_csv(body)
+    try:
+        rows = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array of campaigns")
+    return rows
+
+
+def _validation_errors(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in error.errors()]
+
+
+@router.post("/bulk", response_model=schemas.BulkCampaignImportResponse)
+async def bulk_create_campaigns(
+    request: Request,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    verified_country: str = Depends(auth.verify_geo_access),
+    db: Session = Depends(get_db),
+    pricing_engine: PricingEngine = Depends(get_pricing_engine)
+):
+    """
+    Create many campaigns in one request.
+    
+    Send a JSON array of campaigns (same fields as POST /campaigns), or a CSV
+    with those fields as columns, either uploaded as the multipart field
+    `file` or sent as a text/csv body; CSV `tags` are separated by ';'.
+    
+    Each row is validated on its own: valid rows are priced in one batch and
+    created together, invalid rows are skipped and reported with their errors.
+    """
+    rows = await _read_bulk_rows(request)
+    if len(rows) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_IMPORT_MAX_ROWS} campaigns per import"
+        )
+    
+    is_admin = (str(current_user.role).lower() if current_user.role else "") == "admin"
+    results: List[schemas.BulkCampaignRowResult] = []
+    accepted: List[schemas.CampaignCreate] = []
+    pricing_items: List[Dict[str, Any]] = []
+    
+    # 1. Validate every row, applying the same rules as create_campaign
+    for index, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            results.append(schemas.BulkCampaignRowResult(row=index, errors=["row: expected an object"]))
+            continue
+        try:
+            campaign_data = schemas.CampaignCreate.model_validate(row)
+            if not is_admin:
+                campaign_data.target_country = verified_country
+            from dateutil.relativedelta import relativedelta
+            if campaign_data.duration and not campaign_data.end_date:
+                campaign_data.end_date = campaign_data.start_date + relativedelta(months=campaign_data.duration)
+            elif not campaign_data.end_date:
+                campaign_data.end_date = campaign_data.start_date + relativedelta(months=1)
+        except ValidationError as e:
+            results.append(schemas.BulkCampaignRowResult(row=index, name=row.get("name"), errors=_validation_errors(e)))
+            continue
+        results.append(schemas.BulkCampaignRowResult(row=index, name=campaign_data.name))
+        accepted.append(campaign_data)
+        pricing_items.append({
+            "industry_type": campaign_data.industry_type,
+            "advert_type": "display",
+            "coverage_type": campaign_data.coverage_type,
+            "duration_days": max((campaign_data.end_date - campaign_data.start_date).days, 1),
+            "target_postcode": campaign_data.target_postcode,
+            "target_state": campaign_data.target_state,
+            "target_country": campaign_data.target_country,
+        })
+    
+    # 2. Price all valid rows in one pass
+    prices = pricing_engine.calculate_prices(pricing_items) if pricing_items else []
+    
+    now = datetime.utcnow()
+    values = []
+    for campaign_data, price in zip(accepted, prices):
+        target_status = models.CampaignStatus((campaign_data.status or models.CampaignStatus.PENDING_REVIEW).upper())
+        values.append({
+            "advertiser_id": current_user.id,
+            "name": campaign_data.name,
+            "industry_type": campaign_data.industry_type,
+            "start_date": campaign_data.start_date,
+            "end_date": campaign_data.end_date,
+            "budget": campaign_data.budget,
+            "calculated_price": campaign_data.budget,
+            "status": target_status,
+            "submitted_at": now if target_status == models.CampaignStatus.PENDING_REVIEW else None,
+            "coverage_type": campaign_data.coverage_type,
+            "coverage_area": _coverage_area(price, campaign_data.coverage_type),
+            "target_postcode": campaign_data.target_postcode,
+            "target_state": campaign_data.target_state,
+            "target_country": campaign_data.target_country,
+            "description": campaign_data.description,
+            "headline": campaign_data.headline,
+            "landing_page_url": campaign_data.landing_page_url,
+            "ad_format": campaign_data.ad_format,
+            "tags": campaign_data.tags,
+        })
+    
+    # 3. One multi-row INSERT per chunk, one commit for the whole import
+    # SQLite can only honour sort_by_parameter_order one row per statement;
+    # it assigns rowids in VALUES order (writes are serialized), so there the
+    # ids of each batch are simply sorted
+    ordered_returning = db.get_bind().dialect.name != "sqlite"
+    ids: List[int] = []
+    try:
+        statement = insert(models.Campaign).returning(models.Campaign.id, sort_by_parameter_order=ordered_returning)
+        for start in range(0, len(values), BULK_INSERT_CHUNK):
+            chunk_ids = db.scalars(statement, values[start:start + BULK_INSERT_CHUNK]).all()
+            ids.extend(chunk_ids if ordered_returning else sorted(chunk_ids))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error("🔥 Bulk campaign import failed: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bulk import failed: {str(e)}"
+        )
+    
+    created = iter(ids)
+    for result in results:
+        if not result.errors:
+            result.id = next(created)
+    
+    logger.info("📦 Bulk import by user %s: %d created, %d failed", current_user.id, len(ids), len(results) - len(ids))
+    return schemas.BulkCampaignImportResponse(created=len(ids), failed=len(results) - len(ids), results=results)
+
+
+@router.get("/list", response_model=Union[List[schemas.CampaignSummary], schemas.CursorPage[schemas.CampaignSummary]])
 async def list_campaigns(
     status: Optional[str] = Query(None, description="Filter by status"),
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Legacy offset; prefer cursor"),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page (empty for the first page)"),
     current_user: models.User = Depends(auth.get_current_active_user),
     verified_country: str = Depends(auth.verify_geo_access),
     db: Session = Depends(get_db)
@@ -121,8 +301,10 @@ async def list_campaigns(
     
     Admins can see all campaigns, advertisers only see their own
     AND only campaigns within their verified country.
+    Pass ?cursor= (then next_cursor) to page as {items, next_cursor}.
+    Rows are summaries; GET /campaigns/{id} returns the full campaign.
     """
-    query = db.query(models.Campaign)
+    query = db.query(*campaign_summary_columns())
     
     # Role-based & Geo-based filtering
     role = str(current_user.role).lower() if current_user.role else ""
@@ -134,7 +316,7 @@ async def list_campaigns(
         if current_user.managed_country:
             query = query.filter(models.Campaign.target_country == current_user.managed_country)
         else:
-            return []
+            return page_response([], None, cursor)
     else:
         # Advertiser only sees their own campaigns in their verified country
         query = query.filter(
@@ -153,12 +335,10 @@ async def list_campaigns(
                 detail=f"Invalid status value: {status}"
             )
     
-    # Order by created date (newest first)
-    query = query.order_by(models.Campaign.created_at.desc())
-    
-    campaigns = query.offset(skip).limit(limit).all()
+    # Newest first, keyset-paginated on (created_at, id)
+    campaigns, next_cursor = paginate(query, models.Campaign, cursor, limit, offset=skip)
     
-    return campaigns
+    return page_response(rows_as_dicts(campaigns, schemas.CampaignSummary), next_cursor, cursor)
 
 
 @router.get("/{campaign_id}", response_model=schemas.CampaignResponse)
@@ -248,6 +428,7 @@ async def update_campaign(
     
     # Handle duration-based end date update
     if hasattr(campaign_update, 'duration') and campaign_update.duration:
+        from dateutil.relativedelta import relativedelta
         campaign.end_date = campaign.start_date + relativedelta(months=campaign_update.duration)
     
     # Recalculate pricing ONLY for metadata updates (coverage area description), NOT pricing numbers.
@@ -264,7 +445,7 @@ async def update_campaign(
             target_country=campaign.target_country
         )
         # Update descriptive fields only
-        campaign.coverage_area = pricing_result.breakdown['coverage_area_description']
+        campaign.coverage_area = _coverage_area(pricing_result, campaign.coverage_type)
         # DO NOT update campaign.calculated_price or campaign.budget automatically
         # The user sets this manually now.
     
@@ -5,7 +5,7 @@ import os
 import platform
 from datetime import datetime
 
-from ..database import get_db, engine
+from ..database import get_db, engine, replicas
 from ..config import settings
 from .. import models
 
@@ -129,6 +129,14 @@ async def system_debug():
         "database_type": "Postgres" if "postgres" in settings.DATABASE_URL else "SQLite/Other"
     }
 
+@router.get("/replicas")
+async def replicas_debug():
+    """Read replica health and replication lag."""
+    return {
+        "configured": len(replicas.engines),
+        "replicas": replicas.status()
+    }
+
 @router.get("/env")
 async def env_debug():
     """Check critical environment variables (sanitized)."""
@@ -1,17 +1,25 @@
 """
 Frontend compatibility layer - Maps frontend API calls to backend routes.
 """
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
 
+import asyncio
+import hashlib
 import logging
 import json
 
-from .. import models, schemas, auth
-from ..database import get_db
+import orjson
+
+from .. import models, schemas, auth, summaries
+from ..cache import user_scope, version_tag
+from ..database import SessionLocal, get_db
 from ..config import settings
+from ..responses import ORJSONResponse
+from .pricing import build_pricing_config
 
 import logging
 
@@ -19,7 +27,8 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-router = APIRouter(prefix="/api", tags=["Frontend Compatibility"])
+# Routes here mostly return plain dicts, which orjson encodes faster
+router = APIRouter(prefix="/api", tags=["Frontend Compatibility"], default_response_class=ORJSONResponse)
 
 
 @router.get("/")
@@ -78,29 +87,26 @@ async def get_stats(
     """
     Get dashboard statistics for the authenticated user.
     """
+    return _stats_payload(db, current_user)
+
+
+def _stats_payload(db: Session, current_user: models.User) -> dict:
     try:
         # If admin or country_admin
         role = str(current_user.role).lower() if current_user.role else ""
         if role in ["admin", "country_admin"]:
-            from sqlalchemy import func
-            
-            spend_query = db.query(func.sum(models.Campaign.calculated_price)).filter(
-                models.Campaign.status.in_([models.CampaignStatus.APPROVED, models.CampaignStatus.ACTIVE, models.CampaignStatus.COMPLETED])
-            )
-            impressions_query = db.query(func.sum(models.Campaign.impressions))
-            clicks_query = db.query(func.sum(models.Campaign.clicks))
-            
             # Filter by managed country if Country Admin
+            criteria = []
             if role == "country_admin":
                 managed = (current_user.managed_country or "").upper()
                 if managed:
-                    spend_query = spend_query.filter(models.Campaign.target_country == managed)
-                    impressions_query = impressions_query.filter(models.Campaign.target_country == managed)
-                    clicks_query = clicks_query.filter(models.Campaign.target_country == managed)
+                    criteria.append(models.Campaign.target_country == managed)
             
-            total_spend = spend_query.scalar() or 0
-            impressions = impressions_query.scalar() or 0
-            clicks = clicks_query.scalar() or 0
+            # One conditional-aggregate SELECT (shared with the advertiser summaries)
+            totals = summaries.campaign_totals(db, *criteria)
+            total_spend = totals["total_spent"]
+            impressions = totals["impressions"]
+            clicks = totals["clicks"]
             
             return {
                 "totalSpend": round(float(total_spend), 2),
@@ -110,21 +116,18 @@ async def get_stats(
                 "budgetRemaining": 0
             }
         
-        # Calculate for specific user
-        user_campaigns = db.query(models.Campaign).filter(models.Campaign.advertiser_id == current_user.id).all()
-        total_spend = sum(c.calculated_price for c in user_campaigns if c.calculated_price and c.status in [models.CampaignStatus.APPROVED, models.CampaignStatus.ACTIVE, models.CampaignStatus.COMPLETED])
-        impressions = sum(c.impressions for c in user_campaigns)
-        clicks = sum(c.clicks for c in user_campaigns)
+        # Advertiser: one summary row (see app/summaries.py)
+        summary = summaries.get_summary(db, current_user.id)
         
         return {
-            "totalSpend": round(float(total_spend), 2),
-            "impressions": int(impressions),
-            "clicks": int(clicks),
-            "ctr": round((clicks / impressions * 100) if impressions > 0 else 0, 2),
-            "budgetRemaining": sum(c.budget for c in user_campaigns) - total_spend
+            "totalSpend": round(summary["total_spent"], 2),
+            "impressions": summary["impressions"],
+            "clicks": summary["clicks"],
+            "ctr": round(summary["ctr"], 2),
+            "budgetRemaining": summary["total_budget"] - summary["total_spent"]
         }
     except Exception as e:
-        logger.error(f"❌ Error in get_stats: {str(e)}", exc_info=True)
+        logger.error("❌ Error in get_stats: %s", e, exc_info=True)
         # Return empty stats instead of 500
         return {
             "totalSpend": 0,
@@ -145,6 +148,10 @@ async def list_campaigns_compat(
     List campaigns with strict data isolation.
     If admin -> all campaigns. If advertiser -> only own campaigns.
     """
+    return _campaigns_payload(db, current_user)
+
+
+def _campaigns_payload(db: Session, current_user: models.User) -> list:
     try:
         query = db.query(models.Campaign)
         
@@ -198,7 +205,7 @@ async def list_campaigns_compat(
             for c in campaigns
         ]
     except Exception as e:
-        logger.error(f"❌ Error in list_campaigns_compat: {str(e)}", exc_info=True)
+        logger.error("❌ Error in list_campaigns_compat: %s", e, exc_info=True)
         return []
 
 
@@ -220,35 +227,35 @@ async def create_campaign_compat(
         try:
             body = await request.body()
             body_size = len(body)
-            logger.info(f"📦 Campaign creation request size: {body_size} bytes ({body_size / 1024:.2f} KB)")
+            logger.info("📦 Campaign creation request size: %s bytes (%.2f KB)", body_size, body_size / 1024)
             
             # Validate request size (max 5MB for safety)
             if body_size > 5 * 1024 * 1024:
-                logger.error(f"❌ Request too large: {body_size} bytes")
+                logger.error("❌ Request too large: %s bytes", body_size)
                 return JSONResponse(
                     status_code=413,
                     content={"error": "Request too large", "detail": f"Request size {body_size / 1024:.2f} KB exceeds 5MB limit"}
                 )
             
             data = await request.json()
-            logger.info(f"✅ Successfully parsed JSON request")
-            logger.debug(f"Campaign data keys: {list(data.keys())}")
+            logger.info("✅ Successfully parsed JSON request")
+            logger.debug("Campaign data keys: %s", list(data.keys()))
             
         except json.JSONDecodeError as e:
-            logger.error(f"❌ JSON decode error: {str(e)}")
+            logger.error("❌ JSON decode error: %s", e)
             return JSONResponse(
                 status_code=400,
                 content={"error": "Invalid JSON", "detail": str(e)}
             )
         except Exception as e:
-            logger.error(f"❌ Request parsing error: {str(e)}")
+            logger.error("❌ Request parsing error: %s", e)
             return JSONResponse(
                 status_code=400,
                 content={"error": "Request parsing failed", "detail": str(e)}
             )
 
         user = current_user
-        logger.info(f"👤 User: {user.email} (ID: {user.id})")
+        logger.info("👤 User: %s (ID: %s)", user.email, user.id)
 
         # Extract meta and provide robust defaults
         # Map legacy/compat fields to backend schema
@@ -302,7 +309,7 @@ async def create_campaign_compat(
                 
                 duration_days = max((e_date - s_date).days, 1)
             except Exception as de:
-                logger.warning(f"⚠️ Date/Duration calculation failed: {str(de)}")
+                logger.warning("⚠️ Date/Duration calculation failed: %s", de)
                 duration_days = 30
                 s_date = dt.now().date()
                 e_date = s_date + timedelta(days=30)
@@ -318,16 +325,16 @@ async def create_campaign_compat(
             )
             calculated_price = pricing_result.total_price
             coverage_area_desc = pricing_result.breakdown.get("coverage_area_description", coverage_area_desc)
-            logger.info(f"💰 Calculated price: ${calculated_price:.2f}")
+            logger.info("💰 Calculated price: $%.2f", calculated_price)
         except Exception as pricing_err:
-            logger.warning(f"⚠️ Pricing calculation failed, using budget: {str(pricing_err)}")
+            logger.warning("⚠️ Pricing calculation failed, using budget: %s", pricing_err)
             # Initialize dates if they couldn't be parsed above
             if 's_date' not in locals(): s_date = dt.now().date()
             if 'e_date' not in locals(): e_date = s_date + timedelta(days=30)
         
         # Save to database
         try:
-            logger.info(f"💾 Saving campaign to database...")
+            logger.info("💾 Saving campaign to database...")
             # Extract status from request or default to PENDING_REVIEW if not provided
             req_status = data.get("status")
             if req_status:
@@ -350,7 +357,7 @@ async def create_campaign_compat(
                 else:
                     budget_val = float(raw_budget)
             except (ValueError, TypeError):
-                logger.warning(f"⚠️ Could not parse budget '{data.get('budget')}', defaulting to 0")
+                logger.warning("⚠️ Could not parse budget '%s', defaulting to 0", data.get('budget'))
                 budget_val = 0.0
 
             new_campaign = models.Campaign(
@@ -377,13 +384,13 @@ async def create_campaign_compat(
             db.add(new_campaign)
             db.commit()
             db.refresh(new_campaign)
-            logger.info(f"✅ Campaign saved successfully! ID: {new_campaign.id}")
+            logger.info("✅ Campaign saved successfully! ID: %s", new_campaign.id)
         except Exception as dbe:
             db.rollback()
-            logger.error(f"❌ DB Save failed: {str(dbe)}")
+            logger.error("❌ DB Save failed: %s", dbe)
             import traceback
             error_trace = traceback.format_exc()
-            logger.error(f"Traceback: {error_trace}")
+            logger.error("Traceback: %s", error_trace)
             
             # Send the actual error message back so we can see it in frontend console
             return JSONResponse(
@@ -409,14 +416,14 @@ async def create_campaign_compat(
             "ctr": new_campaign.ctr
         }
         
-        logger.info(f"✅ Campaign creation complete, returning response")
+        logger.info("✅ Campaign creation complete, returning response")
         return JSONResponse(status_code=201, content=response_data)
         
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
-        logger.error(f"🔥 FATAL ERROR in create_campaign_compat: {str(e)}")
-        logger.error(f"Traceback:\n{error_trace}")
+        logger.error("🔥 FATAL ERROR in create_campaign_compat: %s", e)
+        logger.error("Traceback:\n%s", error_trace)
         return JSONResponse(
             status_code=500, 
             content={
@@ -436,6 +443,10 @@ async def get_notifications(
     """
     Get notifications for the authenticated user.
     """
+    return _notifications_payload(db, current_user)
+
+
+def _notifications_payload(db: Session, current_user: models.User) -> list:
     try:
         # Check if notifications table exists before querying
         notifications = db.query(models.Notification).filter(
@@ -455,7 +466,7 @@ async def get_notifications(
             for n in notifications
         ]
     except Exception as e:
-        logger.warning(f"Notifications fetch failed (table may not exist yet): {e}")
+        logger.warning("Notifications fetch failed (table may not exist yet): %s", e)
         return []
 
 
@@ -468,6 +479,106 @@ async def mark_notifications_read(current_user: models.User = Depends(auth.get_c
 
 
 
+# ==================== Bootstrap ====================
+
+class BootstrapSection(NamedTuple):
+    load: Callable[[Session, models.User, Optional[str]], Any]
+    tables: Tuple[Any, ...]  # what the section reads; its tag changes when they do
+
+
+BOOTSTRAP_SECTIONS: Dict[str, BootstrapSection] = {
+    "stats": BootstrapSection(
+        lambda db, user, country_code: _stats_payload(db, user),
+        (models.Campaign, models.AdvertiserSummary),
+    ),
+    "campaigns": BootstrapSection(
+        lambda db, user, country_code: _campaigns_payload(db, user),
+        (models.Campaign,),
+    ),
+    "notifications": BootstrapSection(
+        lambda db, user, country_code: _notifications_payload(db, user),
+        (models.Notification,),
+    ),
+    "pricing": BootstrapSection(
+        lambda db, user, country_code: build_pricing_config(db, user, country_code).model_dump(mode="json"),
+        (models.PricingMatrix, models.GeoData),
+    ),
+}
+
+
+def _known_tags(known: Optional[str]) -> Dict[str, str]:
+    tags = {}
+    for pair in (known or "").split(","):
+        name, sep, tag = pair.strip().partition(":")
+        if sep:
+            tags[name] = tag
+    return tags
+
+
+def _load_section(section: BootstrapSection, request: Request, user: models.User, country_code: Optional[str]) -> Any:
+    # Sessions are not thread-safe: one per section
+    db = SessionLocal()
+    db.info["request_state"] = request.state
+    try:
+        return section.load(db, user, country_code)
+    finally:
+        db.close()
+
+
+@router.get("/bootstrap")
+async def bootstrap(
+    request: Request,
+    known: Optional[str] = Query(None, description="Comma-separated section:tag pairs from an earlier bootstrap"),
+    country_code: Optional[str] = Query(None, description="Country for the pricing section (default US)"),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Everything the dashboard loads after login, in one round trip.
+
+    Sections: me (/api/auth/me), stats, campaigns, notifications and pricing
+    (/api/pricing/config). The caller is authenticated once, then the other
+    sections are loaded concurrently, each on its own session. Each section
+    comes back as {"tag": ..., "data": ...}; pass the tags back in `known`
+    (e.g. ?known=me:1f0c...,pricing:9ab2...) and sections that have not
+    changed come back as {"tag": ..., "unchanged": true} without being loaded.
+    """
+    known_tags = _known_tags(known)
+
+    me = schemas.UserResponse.model_validate(current_user).model_dump(mode="json")
+    # The user is fully loaded now: close the session so the worker threads
+    # never lazy-load through it, and hand its connection back to the pool
+    db.close()
+    # last_login is rewritten by every authenticated request, so it is left
+    # out of the tag (as is, it would never match)
+    me_tag = hashlib.blake2b(
+        orjson.dumps({k: v for k, v in me.items() if k != "last_login"}, option=orjson.OPT_SORT_KEYS),
+        digest_size=12,
+    ).hexdigest()
+    sections: Dict[str, Any] = {
+        "me": {"tag": me_tag, "unchanged": True} if known_tags.get("me") == me_tag else {"tag": me_tag, "data": me}
+    }
+
+    scope = (current_user.id, user_scope(current_user), country_code)
+    pending = {}
+    for name, section in BOOTSTRAP_SECTIONS.items():
+        # Taken before loading, so a write that lands meanwhile just makes the next call reload
+        tag = version_tag(("bootstrap", name, scope), *section.tables)
+        if known_tags.get(name) == tag:
+            sections[name] = {"tag": tag, "unchanged": True}
+        else:
+            pending[name] = tag
+
+    results = await asyncio.gather(*(
+        asyncio.to_thread(_load_section, BOOTSTRAP_SECTIONS[name], request, current_user, country_code)
+        for name in pending
+    ))
+    for (name, tag), data in zip(pending.items(), results):
+        sections[name] = {"tag": tag, "data": data}
+
+    return ORJSONResponse(sections, headers={"Cache-Control": "private, no-store"})
+
+
 @router.post("/google-auth")
 async def google_auth_sync(request: Request, db: Session = Depends(get_db)):
     """
@@ -484,7 +595,7 @@ async def google_auth_sync(request: Request, db: Session = Depends(get_db)):
         industry = data.get("industry")
         country = data.get("country")
         
-        logger.info(f"🔄 Google Auth Sync attempt for: {email}")
+        logger.info("🔄 Google Auth Sync attempt for: %s", email)
         
         if not email:
             return JSONResponse(
@@ -512,7 +623,7 @@ async def google_auth_sync(request: Request, db: Session = Depends(get_db)):
             user.last_login = datetime.utcnow()
         else:
             # Create new user
-            logger.info(f"🆕 Creating NEW user from Google: {email}")
+            logger.info("🆕 Creating NEW user from Google: %s", email)
             user = models.User(
                 name=username or email.split('@')[0],
                 email=email,
@@ -530,7 +641,7 @@ async def google_auth_sync(request: Request, db: Session = Depends(get_db)):
         db.refresh(user)
         
         # Return user data in frontend format + JWT tokens
-        logger.info(f"✅ User synced successfully: {user.email}")
+        logger.info("✅ User synced successfully: %s", user.email)
         tokens = auth.create_user_tokens(user)
         
         return {
@@ -549,7 +660,7 @@ async def google_auth_sync(request: Request, db: Session = Depends(get_db)):
             }
         }
     except Exception as e:
-        logger.error(f"🔥 Google Auth Sync failed: {str(e)}", exc_info=True)
+        logger.error("🔥 Google Auth Sync failed: %s", e, exc_info=True)
         return JSONResponse(
             status_code=500,
             content={
@@ -2,10 +2,15 @@ from fastapi import APIRouter, HTTPException, Query, Request, Depends
 from typing import List, Dict, Optional
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+import logging
+from ..cache import cached_response
 from ..database import get_db
+from ..responses import ORJSONResponse
 from .. import models
 from ..utils import geo_ip
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/geo",
     tags=["GeoTargeting"]
@@ -91,21 +96,19 @@ GEO_DATA = {
 }
 
 @router.get("/regions/{country_code}", response_model=List[Region])
+@cached_response(models.GeoData)
 async def get_regions(country_code: str, db: Session = Depends(get_db)):
     """
     Get administrative regions (States/Provinces) for a specific country.
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
     code = (country_code or "US").upper().strip()
-    logger.info(f"📍 Fetching regions for country: {code}")
+    logger.info("📍 Fetching regions for country: %s", code)
     
     try:
         # 1. Try fetching from database first
         db_regions = db.query(models.GeoData).filter(models.GeoData.country_code == code).all()
         if db_regions:
-            logger.info(f"✅ Found {len(db_regions)} regions in database for {code}")
+            logger.info("✅ Found %s regions in database for %s", len(db_regions), code)
             return [
                 Region(
                     name=r.state_name or r.state_code or code or "Unknown", 
@@ -121,17 +124,23 @@ async def get_regions(country_code: str, db: Session = Depends(get_db)):
                     radius_areas_count=r.radius_areas_count or 1
                 ) for r in db_regions
             ]
+        db_failed = False
     except Exception as e:
-        logger.warning(f"⚠️ Database geo lookup failed: {e}")
+        logger.warning("⚠️ Database geo lookup failed: %s", e)
+        db_failed = True
     
     # 2. Fallback to static data if DB is empty for this country
-    logger.info(f"ℹ️ Using static fallback data for {code}")
+    logger.info("ℹ️ Using static fallback data for %s", code)
     if code not in GEO_DATA:
-        logger.warning(f"❌ No static data available for country: {code}")
-        return []
-    
-    regions = GEO_DATA[code]
-    return [Region(name=r["name"], code=r["code"], country_code=code) for r in regions]
+        logger.warning("❌ No static data available for country: %s", code)
+        fallback = []
+    else:
+        fallback = [Region(name=r["name"], code=r["code"], country_code=code) for r in GEO_DATA[code]]
+    if db_failed:
+        # Returned as a response so cached_response doesn't keep it: the
+        # ETag tracks geo_data, which a failed lookup says nothing about
+        return ORJSONResponse([region.model_dump() for region in fallback])
+    return fallback
 
 @router.get("/validate-postcode")
 async def validate_postcode(postcode: str, country_code: str):
@@ -6,10 +6,13 @@ from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
+import logging
 
 from ..database import get_db
 from .. import models, schemas, auth
-from ..utils.file_upload import file_upload_manager
+from ..utils.file_upload import get_file_upload_manager
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/media", tags=["Media"])
 
@@ -48,7 +51,7 @@ async def upload_media(
         )
     
     # Save file and get metadata
-    file_path, metadata = await file_upload_manager.save_file(file, campaign_id)
+    file_path, metadata = await get_file_upload_manager().save_file(file, campaign_id)
     
     # Create media record
     new_media = models.Media(
@@ -156,10 +159,10 @@ async def delete_media(
     
     # Delete file from storage
     try:
-        await file_upload_manager.delete_file(media.file_path)
+        await get_file_upload_manager().delete_file(media.file_path)
     except Exception as e:
         # Log error but continue with database deletion
-        print(f"Error deleting file: {e}")
+        logger.error("Error deleting file %s: %s", media.file_path, e)
     
     # Delete database record
     db.delete(media)
@@ -1,41 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Header, Query
 from sqlalchemy.orm import Session
 from typing import Optional, List
-import stripe
+from functools import lru_cache
 import logging
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from .. import models, schemas, auth
 from ..config import settings
 from ..pricing import PricingEngine, get_pricing_engine
+from ..responses import ORJSONResponse
+from ..utils.pagination import NEXT_CURSOR_HEADER, paginate
 import math
 
-# Initialize Stripe
-stripe.api_version = "2023-10-16"
+@lru_cache(maxsize=1)
+def get_stripe():
+    """
+    Import and configure the Stripe SDK on first use.
+    Deferred so that worker start-up does not pay for the import.
+    """
+    import stripe
+
+    stripe.api_version = "2023-10-16"
 
-# ROBUST KEY HANDLING: Check for user copy-paste errors
-SECRET_KEY_CANDIDATE = settings.STRIPE_SECRET_KEY
-PUBLISHABLE_KEY_CANDIDATE = settings.STRIPE_PUBLISHABLE_KEY
+    # ROBUST KEY HANDLING: Check for user copy-paste errors
+    secret_key_candidate = settings.STRIPE_SECRET_KEY
+    publishable_key_candidate = settings.STRIPE_PUBLISHABLE_KEY
 
-# Swap if user accidentally put pk_ in secret slot and sk_ in public slot
-if SECRET_KEY_CANDIDATE.startswith("pk_") and PUBLISHABLE_KEY_CANDIDATE.startswith("sk_"):
-    logging.warning("⚠️  SWAPPED KEYS DETECTED: Automatically fixing Stripe keys.")
-    SECRET_KEY_CANDIDATE, PUBLISHABLE_KEY_CANDIDATE = PUBLISHABLE_KEY_CANDIDATE, SECRET_KEY_CANDIDATE
+    # Swap if user accidentally put pk_ in secret slot and sk_ in public slot
+    if secret_key_candidate.startswith("pk_") and publishable_key_candidate.startswith("sk_"):
+        logging.warning("⚠️  SWAPPED KEYS DETECTED: Automatically fixing Stripe keys.")
+        secret_key_candidate, publishable_key_candidate = publishable_key_candidate, secret_key_candidate
 
-stripe.api_key = SECRET_KEY_CANDIDATE
+    stripe.api_key = secret_key_candidate
 
-# Validation
-if stripe.api_key and stripe.api_key.startswith("pk_"):
-    logging.error("❌  FATAL STRIPE ERROR: 'STRIPE_SECRET_KEY' contains a PUBLISHABLE key (pk_...). It MUST be a SECRET key (sk_...). Payment will fail.")
+    # Validation
+    if stripe.api_key and stripe.api_key.startswith("pk_"):
+        logging.error("❌  FATAL STRIPE ERROR: 'STRIPE_SECRET_KEY' contains a PUBLISHABLE key (pk_...). It MUST be a SECRET key (sk_...). Payment will fail.")
+
+    return stripe
 
 
 def is_stripe_configured():
     return bool(settings.STRIPE_SECRET_KEY and not settings.STRIPE_SECRET_KEY.startswith("dummy") and settings.STRIPE_SECRET_KEY != "")
 
-router = APIRouter(prefix="/payment", tags=["Payment"])
+# No route here declares a response_model, so orjson beats the stdlib encoder
+router = APIRouter(prefix="/payment", tags=["Payment"], default_response_class=ORJSONResponse)
 
 class CheckoutSessionRequest(BaseModel):
     campaign_id: int
@@ -70,13 +82,13 @@ async def create_checkout_session(
     cancel_url = request_data.cancel_url
     currency = request_data.currency
 
-    logger.info(f"💳 [SESSION] Creating for Campaign {campaign_id} | User: {current_user.email} | Currency: {currency}")
+    logger.info("💳 [SESSION] Creating for Campaign %s | User: %s | Currency: %s", campaign_id, current_user.email, currency)
 
     # Get campaign
     campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
     
     if not campaign:
-        logger.error(f"❌ [SESSION] Campaign {campaign_id} not found")
+        logger.error("❌ [SESSION] Campaign %s not found", campaign_id)
         raise HTTPException(status_code=404, detail="Campaign not found")
     
     # Owner or Admin/CountryAdmin for the campaign's country
@@ -85,7 +97,7 @@ async def create_checkout_session(
     is_country_admin = role == "country_admin" and campaign.target_country == current_user.managed_country
     
     if not (campaign.advertiser_id == current_user.id or is_admin or is_country_admin):
-        logger.error(f"❌ [SESSION] Unauthorized access for user {current_user.id} on campaign {campaign_id}")
+        logger.error("❌ [SESSION] Unauthorized access for user %s on campaign %s", current_user.id, campaign_id)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to pay for this campaign"
@@ -98,7 +110,7 @@ async def create_checkout_session(
     ).first()
     
     if existing_payment:
-        logger.warning(f"⚠️ [SESSION] Campaign {campaign_id} already paid")
+        logger.warning("⚠️ [SESSION] Campaign %s already paid", campaign_id)
         raise HTTPException(status_code=400, detail="Campaign has already been paid for")
     
     # Smallest unit calculation
@@ -122,19 +134,19 @@ async def create_checkout_session(
     # STRIPE LIMIT HANDLING (BDT)
     # Stripe BDT limit is ~999,999.99 BDT. If amount exceeds this, we MUST process in USD.
     if target_currency == 'bdt' and amount_smallest_unit > 99999999:
-        logger.warning(f"⚠️ [PAYMENT] Amount {amount_smallest_unit} BDT exceeds Stripe limit. Converting to USD.")
+        logger.warning("⚠️ [PAYMENT] Amount %s BDT exceeds Stripe limit. Converting to USD.", amount_smallest_unit)
         # Approximate Rate: 1 USD = 120 BDT (Safe fallback)
         usd_amount = base_price / 120.0
         target_currency = 'usd'
         amount_smallest_unit = int(usd_amount * 100) # USD cents
-        logger.info(f"🔄 [PAYMENT] Converted to {amount_smallest_unit} cents (USD)")
+        logger.info("🔄 [PAYMENT] Converted to %s cents (USD)", amount_smallest_unit)
 
     # GLOBAL STRIPE LIMIT CHECK (Max 8 digits: 99,999,999 units)
     # This applies to USD ($999,999.99) and others.
     STRIPE_MAX_UNIT = 99999999
     if amount_smallest_unit > STRIPE_MAX_UNIT:
         if 'sk_test' in settings.STRIPE_SECRET_KEY or 'rk_test' in settings.STRIPE_SECRET_KEY or not is_stripe_configured():
-            logger.warning(f"⚠️ [TEST MODE] Amount {amount_smallest_unit} exceeds global Stripe limit. Capping at 99,999,999 for success.")
+            logger.warning("⚠️ [TEST MODE] Amount %s exceeds global Stripe limit. Capping at 99,999,999 for success.", amount_smallest_unit)
             amount_smallest_unit = STRIPE_MAX_UNIT
         else:
              raise HTTPException(status_code=400, detail="Transaction amount exceeds the online payment limit ($999,999.99). Please contact sales for wire transfer.")
@@ -144,6 +156,7 @@ async def create_checkout_session(
     elif amount_smallest_unit <= 0:
         amount_smallest_unit = 1
 
+    stripe = get_stripe()
     try:
         if not is_stripe_configured():
             logger.warning("⚠️ STRIPE: Not configured, returning mock session")
@@ -183,7 +196,7 @@ async def create_checkout_session(
             }
         )
 
-        logger.info(f"✅ [SESSION] Stripe session created: {checkout_session.id}")
+        logger.info("✅ [SESSION] Stripe session created: %s", checkout_session.id)
         
         # Log transaction
         tx = models.PaymentTransaction(
@@ -201,10 +214,10 @@ async def create_checkout_session(
         return { "checkout_url": checkout_session.url, "session_id": checkout_session.id }
     
     except stripe.error.StripeError as e:
-        logger.error(f"❌ [STRIPE] Error: {str(e)}")
+        logger.error("❌ [STRIPE] Error: %s", e)
         raise HTTPException(status_code=500, detail=f"Stripe Gateway Error: {str(e)}")
     except Exception as e:
-        logger.error(f"🔥 [CRASH] Unexpected error in payment: {str(e)}", exc_info=True)
+        logger.error("🔥 [CRASH] Unexpected error in payment: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error during payment initialization")
 
 class PaymentIntentRequest(BaseModel):
@@ -223,7 +236,7 @@ async def create_payment_intent(
     campaign_id = request_data.campaign_id
     currency = request_data.currency
 
-    logger.info(f"💳 [INTENT] Creating for Campaign {campaign_id} | User: {current_user.email} | Currency: {currency}")
+    logger.info("💳 [INTENT] Creating for Campaign %s | User: %s | Currency: %s", campaign_id, current_user.email, currency)
 
     # Get campaign
     campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
@@ -261,6 +274,7 @@ async def create_payment_intent(
     elif amount_smallest_unit <= 0:
         amount_smallest_unit = 1
 
+    stripe = get_stripe()
     try:
         if not is_stripe_configured():
             # Mock Intent for dev/test without keys
@@ -285,14 +299,15 @@ async def create_payment_intent(
         }
 
     except stripe.error.StripeError as e:
-        logger.error(f"❌ [STRIPE] Intent Error: {str(e)}")
+        logger.error("❌ [STRIPE] Intent Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
-        logger.error(f"🔥 [CRASH] Intent Error: {str(e)}")
+        logger.error("🔥 [CRASH] Intent Error: %s", e)
         raise HTTPException(status_code=500, detail="Internal Error")
 
 @router.get("/session/{session_id}")
 async def get_checkout_session(session_id: str, current_user: models.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    stripe = get_stripe()
     try:
         if session_id.startswith("cs_test_") and not is_stripe_configured():
             return { "id": session_id, "payment_status": "paid", "amount_total": 0, "currency": "usd", "customer_email": current_user.email, "metadata": {} }
@@ -304,6 +319,7 @@ async def get_checkout_session(session_id: str, current_user: models.User = Depe
 @router.post("/webhook")
 async def stripe_webhook(request: Request, stripe_signature: str = Header(None, alias="stripe-signature"), db: Session = Depends(get_db)):
     payload = await request.body()
+    stripe = get_stripe()
     try:
         event = stripe.Webhook.construct_event(payload, stripe_signature, settings.STRIPE_WEBHOOK_SECRET)
     except Exception:
@@ -327,16 +343,38 @@ async def stripe_webhook(request: Request, stripe_signature: str = Header(None,
                     from .. import invoice_service
                     invoice_service.generate_monthly_invoices(db, campaign)
                 except Exception as e:
-                    logger.error(f"Failed to generate invoices: {str(e)}")
+                    logger.error("Failed to generate invoices: %s", e)
             db.commit()
     return {"status": "success"}
 
+USER_TRANSACTION_FIELDS = ("id", "campaign_id", "amount", "currency", "status", "payment_method", "created_at", "completed_at")
+ADMIN_TRANSACTION_FIELDS = ("id", "campaign_id", "user_id", "amount", "currency", "status", "payment_method", "stripe_payment_intent_id", "created_at", "completed_at")
+
+
+def _transactions_page(query, cursor: Optional[str], limit: int, fields) -> ORJSONResponse:
+    transactions, next_cursor = paginate(query, models.PaymentTransaction, cursor, limit)
+    items = [{field: getattr(t, field) for field in fields} for t in transactions]
+    # Returned as a response so the rows skip jsonable_encoder
+    if cursor is not None:
+        return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+    return ORJSONResponse(items, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
 @router.get("/transactions")
-async def get_user_transactions(current_user: models.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    transactions = db.query(models.PaymentTransaction).filter(models.PaymentTransaction.user_id == current_user.id).order_by(models.PaymentTransaction.created_at.desc()).all()
-    return [{ "id": t.id, "campaign_id": t.campaign_id, "amount": t.amount, "currency": t.currency, "status": t.status, "payment_method": t.payment_method, "created_at": t.created_at, "completed_at": t.completed_at } for t in transactions]
+async def get_user_transactions(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Keyset cursor; returns {items, next_cursor} (empty for the first page)"),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    query = db.query(models.PaymentTransaction).filter(models.PaymentTransaction.user_id == current_user.id)
+    return _transactions_page(query, cursor, limit, USER_TRANSACTION_FIELDS)
 
 @router.get("/admin/transactions")
-async def get_all_transactions(current_user: models.User = Depends(auth.get_current_admin_user), db: Session = Depends(get_db)):
-    transactions = db.query(models.PaymentTransaction).order_by(models.PaymentTransaction.created_at.desc()).all()
-    return [{ "id": t.id, "campaign_id": t.campaign_id, "user_id": t.user_id, "amount": t.amount, "currency": t.currency, "status": t.status, "payment_method": t.payment_method, "stripe_payment_intent_id": t.stripe_payment_intent_id, "created_at": t.created_at, "completed_at": t.completed_at } for t in transactions]
+async def get_all_transactions(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Keyset cursor; returns {items, next_cursor} (empty for the first page)"),
+    current_user: models.User = Depends(auth.get_current_admin_user),
+    db: Session = Depends(get_read_db)
+):
+    query = db.query(models.PaymentTransaction)
+    return _transactions_page(query, cursor, limit, ADMIN_TRANSACTION_FIELDS)
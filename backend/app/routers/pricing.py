@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
 from typing import List, Optional, Dict
+from ..cache import cached_response, user_scope
 from ..database import get_db
 from .. import models, schemas, auth
 from ..pricing import PricingEngine, get_pricing_engine
@@ -53,6 +54,7 @@ async def calculate_pricing(
 # ==================== Admin Pricing Management ====================
 
 @router.get("/admin/matrix", response_model=List[schemas.PricingMatrixResponse])
+@cached_response(models.PricingMatrix)
 async def get_pricing_matrix(
     industry_type: Optional[str] = Query(None),
     coverage_type: Optional[str] = Query(None),
@@ -181,6 +183,7 @@ async def delete_pricing_matrix_entry(
         message="Pricing matrix entry deleted successfully"
     )
 @router.get("/config", response_model=schemas.GlobalPricingConfig)
+@cached_response(models.PricingMatrix, models.GeoData, principal=lambda kw: user_scope(kw["current_user"]))
 async def get_global_pricing_config(
     country_code: Optional[str] = Query(None),
     current_user: Optional[models.User] = Depends(auth.get_current_user_optional),
@@ -189,6 +192,18 @@ async def get_global_pricing_config(
     """
     Fetch pricing configuration with robust fallbacks.
     """
+    return build_pricing_config(db, current_user, country_code)
+
+
+def build_pricing_config(
+    db: Session,
+    current_user: Optional[models.User],
+    country_code: Optional[str] = None
+) -> schemas.GlobalPricingConfig:
+    """
+    Pricing configuration for `country_code` (default US) as seen by `current_user`.
+    Shared by /pricing/config and /api/bootstrap.
+    """
     import logging
     logger = logging.getLogger(__name__)
     
@@ -196,28 +211,35 @@ async def get_global_pricing_config(
         from sqlalchemy import func, or_
         
         target_country = (country_code.upper() if country_code else "US").strip()
-        logger.info(f"📊 Fetching pricing config for: {target_country} (User: {current_user.email if current_user else 'Guest'})")
+        logger.info("📊 Fetching pricing config for: %s (User: %s)", target_country, current_user.email if current_user else 'Guest')
         
+        # Load every candidate matrix row once (target country + US/NULL fallback)
+        # instead of one query per industry / ad type.
+        try:
+            matrix_rows = db.query(models.PricingMatrix).filter(
+                or_(
+                    models.PricingMatrix.country_id == target_country,
+                    models.PricingMatrix.country_id == "US",
+                    models.PricingMatrix.country_id.is_(None)
+                )
+            ).all()
+        except Exception as e:
+            logger.warning("⚠️ Matrix lookup failed: %s", e)
+            matrix_rows = []
+
         # helper to getting rates with fallback
         def get_matrix_entries(filters):
-            try:
-                # Try specific country first
-                query = db.query(models.PricingMatrix)
-                for k, v in filters.items():
-                    query = query.filter(getattr(models.PricingMatrix, k) == v)
-                    
-                specific = query.filter(models.PricingMatrix.country_id == target_country).all()
-                if specific:
-                    return specific, True # Found specific
-                    
-                # Fallback to US or NULL
-                fallback = query.filter(
-                    or_(models.PricingMatrix.country_id == "US", models.PricingMatrix.country_id.is_(None))
-                ).all()
-                return fallback, False # Found fallback
-            except Exception as e:
-                logger.warning(f"⚠️ Matrix lookup failed: {e}")
-                return [], False
+            candidates = [
+                row for row in matrix_rows
+                if all(getattr(row, k) == v for k, v in filters.items())
+            ]
+            # Try specific country first
+            specific = [row for row in candidates if row.country_id == target_country]
+            if specific:
+                return specific, True # Found specific
+            # Fallback to US or NULL
+            fallback = [row for row in candidates if row.country_id == "US" or row.country_id is None]
+            return fallback, False # Found fallback
 
         # 1. Industries & Multipliers
         industries = []
@@ -231,7 +253,7 @@ async def get_global_pricing_config(
                     mult = max(mult_list) if mult_list else 1.0
                     industries.append(schemas.IndustryConfig(name=ind_name, multiplier=mult))
         except Exception as e:
-            logger.warning(f"⚠️ Industry fetch failed: {e}")
+            logger.warning("⚠️ Industry fetch failed: %s", e)
         
         # Ensure we always have at least some industries if DB is fresh
         if not industries:
@@ -265,7 +287,7 @@ async def get_global_pricing_config(
                     rate = max(rate_list) if rate_list else 100.0
                     ad_types.append(schemas.AdTypeConfig(name=ad_name, base_rate=rate))
         except Exception as e:
-            logger.warning(f"⚠️ Ad type fetch failed: {e}")
+            logger.warning("⚠️ Ad type fetch failed: %s", e)
             
         if not ad_types:
             ad_types = [
@@ -300,7 +322,7 @@ async def get_global_pricing_config(
                 for row in states_data
             ]
         except Exception as e:
-            logger.warning(f"⚠️ Geo data fetch failed: {e}")
+            logger.warning("⚠️ Geo data fetch failed: %s", e)
             
         if not states:
             states = [
@@ -317,7 +339,7 @@ async def get_global_pricing_config(
                 if states_d: discounts.state = states_d[0]
                 if nats_d: discounts.national = nats_d[0]
         except Exception as e:
-            logger.warning(f"⚠️ Discount fetch failed: {e}")
+            logger.warning("⚠️ Discount fetch failed: %s", e)
 
         # Currency mapping
         currency_map = {
@@ -337,7 +359,7 @@ async def get_global_pricing_config(
             currency=response_currency
         )
     except Exception as e:
-        logger.error(f"🔥 CRITICAL: get_global_pricing_config failed: {e}", exc_info=True)
+        logger.error("🔥 CRITICAL: build_pricing_config failed: %s", e, exc_info=True)
         # Final emergency fallback to avoid 500 error
         return schemas.GlobalPricingConfig(
             industries=[schemas.IndustryConfig(name="General", multiplier=1.0)],
@@ -370,25 +392,25 @@ async def save_global_pricing_config(
         if current_user.role == models.UserRole.COUNTRY_ADMIN:
             managed = (current_user.managed_country or "").upper()
             if managed != target_country:
-                logger.warning(f"🚫 PERMISSION DENIED: {current_user.email} (managed={managed}) attempted to edit {target_country}")
+                logger.warning("🚫 PERMISSION DENIED: %s (managed=%s) attempted to edit %s", current_user.email, managed, target_country)
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Access Denied: You are only authorized to manage pricing for {managed}."
                 )
 
-        logger.info(f"💾 ADMIN SAVE INITIATED by {current_user.email} for {target_country}")
-        logger.info(f"📋 Config data: {len(config.industries)} industries, {len(config.ad_types)} ad types, {len(config.states)} states")
+        logger.info("💾 ADMIN SAVE INITIATED by %s for %s", current_user.email, target_country)
+        logger.info("📋 Config data: %s industries, %s ad types, %s states", len(config.industries), len(config.ad_types), len(config.states))
 
         # 1. Update/Upsert Industry Multipliers in PricingMatrix
         for ind in config.industries:
-            logger.debug(f"Updating industry: {ind.name} for {target_country}")
+            logger.debug("Updating industry: %s for %s", ind.name, target_country)
             affected = db.query(models.PricingMatrix).filter(
                 models.PricingMatrix.industry_type == ind.name,
                 models.PricingMatrix.country_id == target_country
             ).update({"multiplier": ind.multiplier}, synchronize_session=False)
             
             if affected == 0:
-                logger.info(f"Creating new matrix entry for industry: {ind.name} ({target_country})")
+                logger.info("Creating new matrix entry for industry: %s (%s)", ind.name, target_country)
                 new_entry = models.PricingMatrix(
                     industry_type=ind.name,
                     advert_type="display",
@@ -403,14 +425,14 @@ async def save_global_pricing_config(
             
         # 2. Update Ad Type Base Rates
         for ad in config.ad_types:
-            logger.debug(f"Updating ad type: {ad.name} for {target_country}")
+            logger.debug("Updating ad type: %s for %s", ad.name, target_country)
             affected = db.query(models.PricingMatrix).filter(
                 models.PricingMatrix.advert_type == ad.name,
                 models.PricingMatrix.country_id == target_country
             ).update({"base_rate": ad.base_rate}, synchronize_session=False)
             
             if affected == 0:
-                logger.info(f"Creating new matrix entry for ad type: {ad.name} ({target_country})")
+                logger.info("Creating new matrix entry for ad type: %s (%s)", ad.name, target_country)
                 new_entry = models.PricingMatrix(
                     industry_type="General",
                     advert_type=ad.name,
@@ -424,7 +446,7 @@ async def save_global_pricing_config(
                 db.add(new_entry)
             
         # 3. Update Discounts for this country
-        logger.info(f"Updating discounts for {target_country}: State={config.discounts.state}, National={config.discounts.national}")
+        logger.info("Updating discounts for %s: State=%s, National=%s", target_country, config.discounts.state, config.discounts.national)
         db.query(models.PricingMatrix).filter(
             models.PricingMatrix.country_id == target_country
         ).update({
@@ -468,7 +490,7 @@ async def save_global_pricing_config(
         
     except Exception as e:
         db.rollback()
-        logger.error(f"❌ Admin Config Save Failed: {str(e)}", exc_info=True)
+        logger.error("❌ Admin Config Save Failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save configuration: {str(e)}"
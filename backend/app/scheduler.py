@@ -0,0 +1,239 @@
+"""
+Campaign lifecycle scheduler.
+
+Moves campaigns through their date-driven statuses:
+
+- APPROVED -> ACTIVE     once start_date has arrived
+- ACTIVE   -> COMPLETED  once end_date has passed
+
+Each transition is a set-based UPDATE ... RETURNING over batches of
+SCHEDULER_BATCH_SIZE campaigns, followed by one bulk INSERT of the matching
+notifications and a commit. Each pass then rolls hourly campaign stats up
+into daily ones (timeseries.rollup). The loop runs in every API process, but a lease
+row in scheduler_leases makes sure only one of them does the work per
+interval; if the holder dies, another process takes over once the lease
+expires.
+
+Run a single pass by hand (e.g. from cron) with:
+
+    python -m app.scheduler
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, NamedTuple, Optional
+
+from sqlalchemy import and_, bindparam, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from . import models, summaries, timeseries
+from .config import settings
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "campaign_lifecycle"
+# Unique per process, so a restarted worker does not inherit its old lease
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class Transition(NamedTuple):
+    name: str
+    source: models.CampaignStatus
+    target: models.CampaignStatus
+    due: Callable[[date], object]
+    notification_type: models.NotificationType
+    title: str
+    message: str  # formatted with the campaign's name and end_date
+
+
+TRANSITIONS = (
+    Transition(
+        "activate", models.CampaignStatus.APPROVED, models.CampaignStatus.ACTIVE,
+        lambda today: models.Campaign.start_date <= today,
+        models.NotificationType.CAMPAIGN_ACTIVATED, "Campaign Live",
+        "Your campaign '{name}' has reached its start date and is now active.",
+    ),
+    Transition(
+        "complete", models.CampaignStatus.ACTIVE, models.CampaignStatus.COMPLETED,
+        lambda today: models.Campaign.end_date < today,
+        models.NotificationType.CAMPAIGN_COMPLETED, "Campaign Completed",
+        "Your campaign '{name}' ended on {end_date} and is now completed.",
+    ),
+)
+
+def due_filter(transition: Transition, today: date):
+    """Campaigns due for `transition` on `today`."""
+    # The status is rendered inline rather than bound, so the planner can
+    # match the partial index (ix_campaigns_approved_start / _active_end)
+    status = bindparam(None, transition.source, type_=models.Campaign.status.type, literal_execute=True)
+    return and_(models.Campaign.status == status, transition.due(today))
+
+
+# Exposed on /metrics
+STATS = {
+    "runs": {"ran": 0, "skipped": 0, "error": 0},
+    "transitions": {t.name: 0 for t in TRANSITIONS},
+    "rollup_rows": 0,
+    "last_run": 0.0,
+    "last_duration": 0.0,
+}
+
+_task: Optional[asyncio.Task] = None
+
+
+# ==================== Lease ====================
+
+def acquire_lease(db: Session, name: str = LEASE_NAME, ttl: Optional[int] = None) -> bool:
+    """Take (or renew) the lease for `name`; False if another live worker holds it."""
+    now = datetime.utcnow()
+    ttl = ttl if ttl is not None else max(settings.SCHEDULER_INTERVAL * 2, 60)
+    expires_at = now + timedelta(seconds=ttl)
+    Lease = models.SchedulerLease
+
+    taken = db.execute(
+        update(Lease)
+        .where(Lease.name == name, or_(Lease.expires_at.is_(None), Lease.expires_at < now, Lease.owner == OWNER))
+        .values(owner=OWNER, expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not taken:
+        if db.get(Lease, name) is not None:
+            db.rollback()
+            return False
+        # First run against this database; a concurrent creator wins on the primary key
+        db.add(Lease(name=name, owner=OWNER, expires_at=expires_at))
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        return False
+    return True
+
+
+def release_lease(db: Session, name: str = LEASE_NAME):
+    """Let another worker take over right away (called on shutdown)."""
+    Lease = models.SchedulerLease
+    db.execute(
+        update(Lease)
+        .where(Lease.name == name, Lease.owner == OWNER)
+        .values(expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+# ==================== Transitions ====================
+
+def apply_transition(db: Session, transition: Transition, today: date, batch_size: Optional[int] = None) -> int:
+    """Move every due campaign for `transition`, in batches; returns the number moved."""
+    batch_size = batch_size or settings.SCHEDULER_BATCH_SIZE
+    Campaign = models.Campaign
+    moved = 0
+    while True:
+        due = select(Campaign.id).where(due_filter(transition, today)).limit(batch_size)
+        rows = db.execute(
+            update(Campaign)
+            # Status is re-checked so a concurrent manual change wins
+            .where(Campaign.id.in_(due.scalar_subquery()), Campaign.status == transition.source)
+            .values(status=transition.target)
+            .returning(Campaign.id, Campaign.advertiser_id, Campaign.name, Campaign.end_date, Campaign.calculated_price)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if rows:
+            db.execute(insert(models.Notification), [
+                {
+                    "user_id": row.advertiser_id,
+                    "campaign_id": row.id,
+                    "notification_type": transition.notification_type,
+                    "title": transition.title,
+                    "message": transition.message.format(name=row.name, end_date=row.end_date),
+                    "is_read": False,
+                }
+                for row in rows
+            ])
+            summaries.move(db, rows, transition.source, transition.target)
+        db.commit()
+        moved += len(rows)
+        if len(rows) < batch_size:
+            return moved
+
+
+def run_once(today: Optional[date] = None) -> Optional[Dict[str, int]]:
+    """
+    One scheduler pass. Returns campaigns moved per transition, or None if
+    another worker holds the lease.
+    """
+    today = today or datetime.utcnow().date()
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        if not acquire_lease(db):
+            STATS["runs"]["skipped"] += 1
+            return None
+        counts = {t.name: apply_transition(db, t, today) for t in TRANSITIONS}
+        rolled_up = timeseries.rollup(db, today)
+        lease = db.get(models.SchedulerLease, LEASE_NAME)
+        lease.last_run_at = datetime.utcnow()
+        db.commit()
+    except Exception:
+        db.rollback()
+        STATS["runs"]["error"] += 1
+        raise
+    finally:
+        db.close()
+
+    STATS["runs"]["ran"] += 1
+    for name, n in counts.items():
+        STATS["transitions"][name] += n
+    STATS["rollup_rows"] += rolled_up
+    STATS["last_run"] = time.time()
+    STATS["last_duration"] = time.perf_counter() - start
+    if any(counts.values()):
+        logger.info("🗓️ Campaign lifecycle: %s", ", ".join(f"{name} {n}" for name, n in counts.items()))
+    return counts
+
+
+# ==================== Background loop ====================
+
+async def _run_forever(interval: int):
+    while True:
+        try:
+            # Sessions are synchronous; keep the event loop free
+            await asyncio.to_thread(run_once)
+        except Exception as e:
+            logger.error("❌ Campaign lifecycle run failed: %s", e, exc_info=True)
+        await asyncio.sleep(interval)
+
+
+def start():
+    """Start the periodic loop in this process. Call from the startup event."""
+    global _task
+    if _task is None:
+        _task = asyncio.get_running_loop().create_task(_run_forever(settings.SCHEDULER_INTERVAL))
+
+
+async def stop():
+    """Stop the loop and hand the lease back. Call from the shutdown event."""
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    _task = None
+    db = SessionLocal()
+    try:
+        await asyncio.to_thread(release_lease, db)
+    except Exception as e:
+        logger.warning("⚠️ Could not release scheduler lease: %s", e)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    result = run_once()
+    print("Another worker holds the lease; nothing done." if result is None else result)
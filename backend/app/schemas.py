@@ -4,7 +4,7 @@ Ensures type-safe data validation and serialization.
 Compatible with Pydantic v2.
 """
 from pydantic import BaseModel, EmailStr, Field, field_validator, ConfigDict
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict, Generic, Literal, TypeVar, Union
 from datetime import datetime, date
 from enum import Enum
 import re
@@ -203,8 +203,8 @@ class CampaignUpdate(BaseModel):
     tags: Optional[List[str]] = None
 
 
-class CampaignResponse(BaseModel):
-    """Schema for campaign data in responses."""
+class CampaignSummary(BaseModel):
+    """Schema for campaign rows in list responses (no creative or free-text fields)."""
     model_config = ConfigDict(from_attributes=True)
     
     id: int
@@ -224,16 +224,9 @@ class CampaignResponse(BaseModel):
     impressions: int = 0
     clicks: int = 0
     ctr: float = 0.0
-    description: Optional[str] = None
-    headline: Optional[str] = None
-    landing_page_url: Optional[str] = None
-    ad_format: Optional[str] = None
-    tags: Optional[List[str]] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
-    # Admin approval fields
     submitted_at: Optional[datetime] = None
-    admin_message: Optional[str] = None
     reviewed_at: Optional[datetime] = None
     
     @field_validator('status', mode='before')
@@ -246,6 +239,50 @@ class CampaignResponse(BaseModel):
         return v
 
 
+class CampaignSearchHit(CampaignSummary):
+    """Campaign search result; higher rank is a better match."""
+    rank: float
+
+
+class CampaignSearchFacets(BaseModel):
+    """Match counts per status and per target country."""
+    status: Dict[str, int]
+    country: Dict[str, int]
+
+
+class CampaignSearchPage(BaseModel):
+    """One page of campaign search results (facets on the first page only)."""
+    items: List[CampaignSearchHit]
+    next_cursor: Optional[str] = None
+    facets: Optional[CampaignSearchFacets] = None
+
+
+class CampaignResponse(CampaignSummary):
+    """Schema for campaign data in responses."""
+    description: Optional[str] = None
+    headline: Optional[str] = None
+    landing_page_url: Optional[str] = None
+    ad_format: Optional[str] = None
+    tags: Optional[List[str]] = None
+    # Admin approval fields
+    admin_message: Optional[str] = None
+
+
+class BulkCampaignRowResult(BaseModel):
+    """Outcome of one row of a bulk campaign import."""
+    row: int  # 1-based position in the upload (CSV data rows, excluding the header)
+    id: Optional[int] = None
+    name: Optional[str] = None
+    errors: Optional[List[str]] = None
+
+
+class BulkCampaignImportResponse(BaseModel):
+    """Schema for bulk campaign import results."""
+    created: int
+    failed: int
+    results: List[BulkCampaignRowResult]
+
+
 # ==================== Media Schemas ====================
 class MediaUploadResponse(BaseModel):
     """Schema for media upload response."""
@@ -345,6 +382,7 @@ class CampaignAnalytics(BaseModel):
     start_date: date
     end_date: date
     status: str
+    unique_reach: int = 0  # estimated distinct viewers, from events that reported one
     
     @field_validator('status', mode='before')
     @classmethod
@@ -356,6 +394,65 @@ class CampaignAnalytics(BaseModel):
         return v
 
 
+class TimeseriesPoint(BaseModel):
+    """Counts for one hour or day."""
+    bucket: Union[datetime, date]  # start of the hour (UTC) or the day
+    impressions: int
+    clicks: int
+    ctr: float
+
+
+class CampaignTimeseries(BaseModel):
+    """Schema for a campaign's impressions/clicks over time."""
+    campaign_id: int
+    granularity: str  # 'hour' or 'day'
+    start: date = Field(..., serialization_alias="from")
+    end: date = Field(..., serialization_alias="to")
+    points: List[TimeseriesPoint]
+
+
+class BreakdownRow(BaseModel):
+    """Counts for one combination of dimension values."""
+    dimensions: Dict[str, Optional[str]]  # e.g. {"device": "mobile", "state": "CA"}; null: not reported
+    impressions: int
+    clicks: int
+    ctr: float
+
+
+class CampaignBreakdown(BaseModel):
+    """Schema for a campaign's impressions/clicks by dimension."""
+    campaign_id: int
+    by: List[str]
+    start: date = Field(..., serialization_alias="from")
+    end: date = Field(..., serialization_alias="to")
+    rows: List[BreakdownRow]
+
+
+class ReachEstimate(BaseModel):
+    """Schema for the unique reach of one or more campaigns."""
+    campaign_ids: Optional[List[int]] = None  # None: all of the user's campaigns
+    start: Optional[date] = Field(None, serialization_alias="from")
+    end: Optional[date] = Field(None, serialization_alias="to")
+    unique_reach: int
+
+
+class CampaignEvent(BaseModel):
+    """One entry of an event batch sent by the ad server."""
+    campaign_id: int
+    type: Literal["impression", "click"]
+    count: int = Field(1, ge=1, le=1000000)
+    ts: Optional[datetime] = None  # when the events happened (default: when received)
+    dims: Optional[Dict[str, str]] = None  # breakdown dimensions: device, state, ad_format
+    viewer: Optional[str] = Field(None, min_length=1, max_length=128)  # opaque viewer hash, for unique reach
+
+
+class CampaignEventBatchResponse(BaseModel):
+    """Schema for event batch ingestion results."""
+    accepted: int
+    rejected: int
+    errors: List[str] = []  # the first problems found, e.g. "event 3: type: ..."
+
+
 # ==================== Pricing Multi-Config Schemas ====================
 class IndustryConfig(BaseModel):
     name: str
@@ -511,6 +608,15 @@ class PaginatedResponse(BaseModel):
     items: List[dict]
 
 
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """One page of a keyset-paginated listing; pass next_cursor back as ?cursor=."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
 # ==================== Admin Campaign Approval Schemas ====================
 class CampaignSubmitRequest(BaseModel):
     """Schema for submitting a campaign for review."""
@@ -540,6 +646,29 @@ class CampaignApprovalResponse(BaseModel):
         return v
 
 
+class CampaignBulkApprovalAction(CampaignApprovalAction):
+    """Schema for an admin action applied to many campaigns at once."""
+    campaign_ids: List[int] = Field(..., min_length=1)
+
+
+class CampaignBulkApprovalResponse(BaseModel):
+    """Schema for bulk approval response."""
+    action: str
+    status: str
+    updated: List[int]
+    skipped: List[int]  # not found, not pending review, or outside the admin's country
+    message: str
+    
+    @field_validator('status', mode='before')
+    @classmethod
+    def status_to_lowercase(cls, v: Any) -> Any:
+        if hasattr(v, 'value'):
+            return v.value.lower()
+        if isinstance(v, str):
+            return v.lower()
+        return v
+
+
 class PendingCampaignResponse(BaseModel):
     """Schema for pending campaign list (admin view)."""
     model_config = ConfigDict(from_attributes=True)
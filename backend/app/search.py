@@ -0,0 +1,140 @@
+"""
+Campaign full-text search.
+
+Matches campaign name, tags, headline and description against the index
+built by migration 0006:
+
+- PostgreSQL: campaigns.search_vector (generated tsvector, GIN index),
+  ranked with ts_rank_cd
+- SQLite: the campaigns_fts FTS5 table, ranked with bm25
+- anything else (or SQLite without FTS5): LIKE filters, unranked
+
+Every search term is matched as a prefix and all terms must match, so
+"summ sale" finds "Summer Sale". Results are ordered by rank, then newest
+id, and paged with a (rank, id) keyset cursor.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import String, cast, column, func, inspect, literal_column, or_, table, tuple_
+from sqlalchemy.orm import Query, Session
+
+from . import models, schemas
+from .utils.pagination import decode_keyset, encode_keyset
+from .utils.projection import campaign_summary_columns
+
+# Relative weight of each FTS5 column (name, headline, description, tags) in bm25
+_FTS5_WEIGHTS = (10.0, 5.0, 1.0, 5.0)
+_TERM = re.compile(r"\w+", re.UNICODE)
+_MAX_TERMS = 16
+
+_backends: Dict[str, str] = {}
+_fts = table("campaigns_fts", column("rowid"))
+
+
+def search_terms(q: str) -> List[str]:
+    """The words of a user query; punctuation and search operators are dropped."""
+    return _TERM.findall(q.lower())[:_MAX_TERMS]
+
+
+def _backend(db: Session) -> str:
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _backends:
+        dialect = bind.dialect.name
+        if dialect == "sqlite" and not inspect(bind).has_table("campaigns_fts"):
+            dialect = "like"
+        _backends[key] = dialect if dialect in ("postgresql", "sqlite") else "like"
+    return _backends[key]
+
+
+def _match(db: Session, query: Query, terms: List[str]) -> Tuple[Query, Any]:
+    """Restrict `query` to campaigns matching every term; returns it with a rank expression (higher is better)."""
+    backend = _backend(db)
+    if backend == "postgresql":
+        tsquery = func.to_tsquery("english", " & ".join(f"{term}:*" for term in terms))
+        vector = literal_column("campaigns.search_vector")
+        return query.filter(vector.op("@@")(tsquery)), func.ts_rank_cd(vector, tsquery)
+    if backend == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(w) for w in _FTS5_WEIGHTS)
+        hits = (
+            db.query(_fts.c.rowid.label("id"), literal_column(f"-bm25(campaigns_fts, {weights})").label("rank"))
+            .select_from(_fts)
+            .filter(literal_column("campaigns_fts").op("MATCH")(match))
+            .subquery()
+        )
+        return query.join(hits, hits.c.id == models.Campaign.id), hits.c.rank
+    fields = (models.Campaign.name, models.Campaign.headline, models.Campaign.description, cast(models.Campaign.tags, String))
+    for term in terms:
+        query = query.filter(or_(*(field.ilike(f"%{term}%") for field in fields)))
+    return query, literal_column("0.0")
+
+
+def _scoped(query: Query, country: Optional[str], status: Optional[models.CampaignStatus]) -> Query:
+    if country:
+        query = query.filter(models.Campaign.target_country == country.upper())
+    if status:
+        query = query.filter(models.Campaign.status == status)
+    return query
+
+
+def search_campaigns(
+    db: Session,
+    q: str,
+    *,
+    country: Optional[str] = None,
+    status: Optional[models.CampaignStatus] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of campaigns matching `q`, best match first.
+
+    Items are CampaignSummary fields plus `rank`; the second value is the
+    cursor for the next page (None on the last page).
+    """
+    terms = search_terms(q)
+    if not terms:
+        return [], None
+    query, rank = _match(db, db.query(*campaign_summary_columns()), terms)
+    rank = rank.label("rank")
+    query = _scoped(query, country, status).add_columns(rank)
+    if cursor:
+        after_rank, after_id = decode_keyset(cursor, float, int)
+        query = query.filter(tuple_(rank, models.Campaign.id) < tuple_(after_rank, after_id))
+    rows = query.order_by(rank.desc(), models.Campaign.id.desc()).limit(limit + 1).all()
+
+    names = (*schemas.CampaignSummary.model_fields, "rank")
+    items = [dict(zip(names, row)) for row in rows[:limit]]
+    if len(rows) <= limit:
+        return items, None
+    return items, encode_keyset(items[-1]["rank"], items[-1]["id"])
+
+
+def search_facets(
+    db: Session,
+    q: str,
+    *,
+    country: Optional[str] = None,
+    status: Optional[models.CampaignStatus] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Match counts per status and per target country.
+
+    Each facet applies the other facet's filter but not its own, so the
+    counts show what selecting a different value would return.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return {"status": {}, "country": {}}
+    status_name = func.lower(cast(models.Campaign.status, String))
+
+    by_status, _ = _match(db, db.query(status_name, func.count()), terms)
+    by_status = _scoped(by_status, country, None).group_by(status_name)
+    by_country, _ = _match(db, db.query(models.Campaign.target_country, func.count()), terms)
+    by_country = _scoped(by_country, None, status).group_by(models.Campaign.target_country)
+    return {
+        "status": {name: count for name, count in by_status.all()},
+        "country": {code or "": count for code, count in by_country.all()},
+    }
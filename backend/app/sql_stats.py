@@ -0,0 +1,158 @@
+"""
+SQL instrumentation.
+Records per-request statement count, total DB time and repeated statement
+fingerprints (N+1 detection), and reports them as a Server-Timing header.
+"""
+import contextvars
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RepeatedQueryError(RuntimeError):
+    """Raised by QueryStatsMiddleware in strict mode for a request that repeated a statement too often."""
+
+
+# Process-wide totals (read by the metrics endpoint)
+TOTALS = {
+    "requests": 0,
+    "statements": 0,
+    "db_seconds": 0.0,
+    "n_plus_one_requests": 0,
+}
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so that calls differing only by literals match."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryStats:
+    """Statement counters for a single request."""
+
+    __slots__ = ("count", "duration", "fingerprints", "violation")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Dict[str, int] = {}
+        # First repeated-statement message in strict mode. Only recorded here:
+        # raising inside the driver call could be swallowed by the handler.
+        self.violation: Optional[str] = None
+
+    def record_start(self, statement: str):
+        fp = fingerprint(statement)
+        seen = self.fingerprints.get(fp, 0) + 1
+        self.fingerprints[fp] = seen
+        self.count += 1
+        if settings.SQL_STRICT_MODE and seen > settings.SQL_REPEAT_THRESHOLD and self.violation is None:
+            self.violation = f"Statement issued {seen} times in one request (limit {settings.SQL_REPEAT_THRESHOLD}): {fp[:200]}"
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Fingerprints issued more than `threshold` times, most frequent first."""
+        limit = settings.SQL_REPEAT_THRESHOLD if threshold is None else threshold
+        hits = [(fp, n) for fp, n in self.fingerprints.items() if n > limit]
+        return sorted(hits, key=lambda item: item[1], reverse=True)
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_current: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar("sql_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Stats for the request being handled, if any."""
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+    stats.record_start(statement)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    if starts:
+        stats.duration += time.perf_counter() - starts.pop()
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware that collects QueryStats for each HTTP request.
+
+    Stats are available as request.state.sql_stats inside handlers and are
+    reported to the client in a Server-Timing header.
+
+    In strict mode the response is held back until the handler is done; a
+    request that repeated a statement too often raises RepeatedQueryError
+    instead (a 500, or a failing test under TestClient), whatever the
+    handler did with the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        scope.setdefault("state", {})["sql_stats"] = stats
+        token = _current.set(stats)
+        strict = settings.SQL_STRICT_MODE
+        held = []
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            if strict:
+                held.append(message)
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            TOTALS["requests"] += 1
+            TOTALS["statements"] += stats.count
+            TOTALS["db_seconds"] += stats.duration
+            repeated = stats.repeated()
+            if repeated:
+                TOTALS["n_plus_one_requests"] += 1
+                fp, times = repeated[0]
+                logger.warning("🔁 Possible N+1 on %s %s: %d× %s", scope.get("method"), scope.get("path"), times, fp[:200])
+
+        if stats.violation is not None:
+            raise RepeatedQueryError(f"{scope.get('method')} {scope.get('path')}: {stats.violation}")
+        for message in held:
+            await send(message)
@@ -0,0 +1,475 @@
+"""
+Per-advertiser dashboard summaries.
+
+advertiser_summaries keeps one row per advertiser (campaign counts by
+status, budget, spend, impressions, clicks, unread notifications), so the
+dashboard endpoints read a single row instead of scanning the advertiser's
+campaigns.
+
+Maintenance: rows are kept up to date incrementally. Each flushed campaign
+or notification insert, delete or change adds its difference to its
+advertiser's pending deltas (a status change moves one count from the old
+status to the new, and moves calculated_price in or out of total_spent);
+bulk INSERTs with parameter lists are picked up the same way. Bulk
+UPDATE/DELETE statements don't say what they changed, so their callers
+pass it to add() or move(). Just before the session commits, the deltas
+are added to the rows in one UPDATE (`impressions = impressions + :d`, ...),
+and the rows of advertisers deleted through the ORM are deleted.
+An advertiser's row is only computed in full when it doesn't exist yet.
+
+Reads: get_summary() serves rows from an in-process cache. Each advertiser
+has a version counter that is bumped after a commit changes its row; as in
+app/cache.py, writes from another worker are picked up within CACHE_TTL.
+
+Recompute every row from scratch (e.g. after a manual data fix) with:
+
+    python -m app.summaries
+"""
+import logging
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, case, delete, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from . import metrics, models
+from .config import settings
+from .database import SessionLocal, upsert
+
+logger = logging.getLogger(__name__)
+
+_DELTAS_KEY = "summary_deltas"
+_CHANGED_KEY = "summary_changed_advertisers"
+_GONE_KEY = "summary_deleted_advertisers"
+_CHUNK = 500
+
+ACTIVE_STATUSES = (models.CampaignStatus.APPROVED, models.CampaignStatus.ACTIVE)
+SPENT_STATUSES = (models.CampaignStatus.APPROVED, models.CampaignStatus.ACTIVE, models.CampaignStatus.COMPLETED)
+
+# Source table -> the columns its rows add to a summary from (the first
+# names the advertiser)
+_TRACKED: Dict[str, Tuple[str, ...]] = {}
+# Numeric summary columns that take deltas
+_AMOUNTS = ("total_campaigns", "total_budget", "total_spent", "impressions", "clicks", "unread_notifications")
+
+_versions: Dict[int, int] = {}
+# advertiser_id -> ((version, ttl window), summary); OrderedDict as an LRU
+_cache: "OrderedDict[int, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0}
+
+
+# ==================== Change tracking ====================
+
+def _pending(session: Session, advertiser_id: int) -> Dict[str, Any]:
+    pending = session.info.setdefault(_DELTAS_KEY, {})
+    delta = pending.get(advertiser_id)
+    if delta is None:
+        delta = pending[advertiser_id] = {"status_counts": Counter()}
+    return delta
+
+
+def add(session: Session, advertiser_id: Optional[int], status_counts: Optional[Dict[Any, int]] = None, **amounts):
+    """
+    Add to the advertiser's summary when `session` commits: `amounts` to
+    the numeric columns (e.g. impressions=10) and `status_counts` (status
+    -> change) to its campaign counts.
+    """
+    if advertiser_id is None:
+        return
+    delta = _pending(session, advertiser_id)
+    for campaign_status, change in (status_counts or {}).items():
+        delta["status_counts"][_status_key(campaign_status)] += change
+    for column, amount in amounts.items():
+        delta[column] = delta.get(column, 0) + amount
+
+
+def move(session: Session, rows: Iterable[Any], source: Any, target: Any):
+    """
+    Account for campaigns a bulk UPDATE moved from `source` to `target`
+    status; `rows` (e.g. its RETURNING rows) have advertiser_id and
+    calculated_price.
+    """
+    spent = (target in SPENT_STATUSES) - (source in SPENT_STATUSES)
+    for row in rows:
+        add(session, row.advertiser_id, {source: -1, target: 1}, total_spent=spent * (row.calculated_price or 0.0))
+
+
+def _status_key(campaign_status: Any) -> str:
+    return models.CampaignStatus(campaign_status).value.lower()
+
+
+def _add_values(session: Session, table: str, values: Dict[str, Any], sign: int):
+    """Add (sign 1) or take away (sign -1) one campaign or notification row's share of its owner's summary."""
+    if table == "notifications":
+        if values.get("is_read") is False:
+            add(session, values.get("user_id"), unread_notifications=sign)
+        return
+    campaign_status = values.get("status")
+    add(
+        session, values.get("advertiser_id"), {campaign_status: sign},
+        total_campaigns=sign,
+        total_budget=sign * (values.get("budget") or 0.0),
+        total_spent=sign * (values.get("calculated_price") or 0.0) * (campaign_status in SPENT_STATUSES),
+        impressions=sign * (values.get("impressions") or 0),
+        clicks=sign * (values.get("clicks") or 0),
+    )
+
+
+def _tracked(obj) -> Optional[str]:
+    table = getattr(obj, "__tablename__", None)
+    return table if table in _TRACKED else None
+
+
+def _before_and_after(obj, names) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Values of `names` as last loaded from the database and as just flushed."""
+    state = inspect(obj)
+    before, after = {}, {}
+    for name in names:
+        added, unchanged, deleted = state.attrs[name].history
+        if added or deleted:
+            before[name] = deleted[0] if deleted else None
+            after[name] = added[0] if added else None
+        else:
+            before[name] = after[name] = unchanged[0] if unchanged else getattr(obj, name)
+    return before, after
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+# The old values of tracked columns are loaded before they are overwritten,
+# so a flush can take away exactly what the row used to add
+for _table, _names in (
+    (models.Campaign, ("advertiser_id", "status", "budget", "calculated_price", "impressions", "clicks")),
+    (models.Notification, ("user_id", "is_read")),
+):
+    _TRACKED[_table.__tablename__] = _names
+    for _name in _names:
+        event.listen(getattr(_table, _name), "set", _keep_old_value, active_history=True)
+
+
+@event.listens_for(Session, "before_flush")
+def _load_deleted(session, flush_context, instances):
+    # A deleted row can't be loaded after the flush, so read what it adds now
+    for obj in session.deleted:
+        table = _tracked(obj)
+        if table:
+            _before_and_after(obj, _TRACKED[table])
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session, flush_context):
+    for obj in session.deleted:
+        if isinstance(obj, models.User):
+            session.info.setdefault(_GONE_KEY, set()).add(inspect(obj).identity[0])
+    for obj in session.new:
+        table = _tracked(obj)
+        if table:
+            _add_values(session, table, {name: getattr(obj, name) for name in _TRACKED[table]}, 1)
+    for obj in session.deleted:
+        table = _tracked(obj)
+        if table:
+            _add_values(session, table, _before_and_after(obj, _TRACKED[table])[0], -1)
+    for obj in session.dirty:
+        table = _tracked(obj)
+        if table and session.is_modified(obj):
+            before, after = _before_and_after(obj, _TRACKED[table])
+            if before != after:
+                _add_values(session, table, before, -1)
+                _add_values(session, table, after, 1)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_inserts(orm_execute_state):
+    if not orm_execute_state.is_insert:
+        return
+    table = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+    params = orm_execute_state.parameters
+    if table in _TRACKED and params:
+        # Column defaults, as the INSERT will apply them
+        defaults = {"status": models.CampaignStatus.DRAFT} if table == "campaigns" else {"is_read": False}
+        for row in params if isinstance(params, (list, tuple)) else [params]:
+            _add_values(orm_execute_state.session, table, {**defaults, **row}, 1)
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_pending(session):
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    deltas = session.info.pop(_DELTAS_KEY, None) or {}
+    changed = set()
+    gone = session.info.pop(_GONE_KEY, None)
+    if gone:
+        # Explicitly: SQLite only honours the ON DELETE CASCADE with foreign_keys on
+        Summary = models.AdvertiserSummary
+        session.execute(delete(Summary).where(Summary.advertiser_id.in_(gone)))
+        deltas = {advertiser_id: delta for advertiser_id, delta in deltas.items() if advertiser_id not in gone}
+        changed.update(gone)
+    if deltas:
+        changed.update(apply(session, deltas))
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_changed(session):
+    bump(session.info.pop(_CHANGED_KEY, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_DELTAS_KEY, None)
+    session.info.pop(_CHANGED_KEY, None)
+    session.info.pop(_GONE_KEY, None)
+
+
+def bump(advertiser_ids: Iterable[int]):
+    """Invalidate the cached summaries of `advertiser_ids` (after their rows changed)."""
+    for advertiser_id in advertiser_ids:
+        _versions[advertiser_id] = _versions.get(advertiser_id, 0) + 1
+
+
+# ==================== Refresh ====================
+
+def _empty(advertiser_id: int, now: datetime) -> Dict[str, Any]:
+    return {
+        "advertiser_id": advertiser_id,
+        "total_campaigns": 0,
+        "status_counts": {},
+        "total_budget": 0.0,
+        "total_spent": 0.0,
+        "impressions": 0,
+        "clicks": 0,
+        "unread_notifications": 0,
+        "updated_at": now,
+    }
+
+
+def _upsert(db: Session, rows: List[Dict[str, Any]]):
+    upsert(
+        db, models.AdvertiserSummary.__table__, rows, ["advertiser_id"],
+        set_=lambda excluded: {name: excluded[name] for name in rows[0] if name != "advertiser_id"},
+    )
+
+
+def _totals_columns() -> list:
+    """
+    Conditional aggregates over campaigns, in the order _totals() reads
+    them: a count per status, then budget, spend, impressions and clicks.
+    """
+    Campaign = models.Campaign
+    return [
+        *(func.count(case((Campaign.status == campaign_status, 1))) for campaign_status in models.CampaignStatus),
+        func.coalesce(func.sum(Campaign.budget), 0.0),
+        func.coalesce(func.sum(case((Campaign.status.in_(SPENT_STATUSES), Campaign.calculated_price), else_=0.0)), 0.0),
+        func.coalesce(func.sum(Campaign.impressions), 0),
+        func.coalesce(func.sum(Campaign.clicks), 0),
+    ]
+
+
+def _totals(values) -> Dict[str, Any]:
+    statuses = len(models.CampaignStatus)
+    counts = {
+        campaign_status.value.lower(): count
+        for campaign_status, count in zip(models.CampaignStatus, values[:statuses]) if count
+    }
+    budget, spent, impressions, clicks = values[statuses:]
+    return {
+        "total_campaigns": sum(counts.values()),
+        "status_counts": counts,
+        "total_budget": float(budget),
+        "total_spent": float(spent),
+        "impressions": int(impressions),
+        "clicks": int(clicks),
+    }
+
+
+def campaign_totals(db: Session, *criteria) -> Dict[str, Any]:
+    """
+    Totals over every campaign matching `criteria` (e.g. a target country),
+    in one conditional-aggregate SELECT: total_campaigns, status_counts,
+    total_budget, total_spent, impressions and clicks.
+    """
+    return _totals(db.execute(select(*_totals_columns()).where(*criteria)).one())
+
+
+def refresh(db: Session, advertiser_ids: Iterable[int]):
+    """Recompute the summaries of `advertiser_ids` from campaigns and notifications (no commit)."""
+    Campaign, Notification = models.Campaign, models.Notification
+    ids = sorted(set(advertiser_ids))
+    now = datetime.utcnow()
+    for start in range(0, len(ids), _CHUNK):
+        chunk = ids[start:start + _CHUNK]
+        # Lock the advertisers (in id order) so concurrent refreshes of the
+        # same advertiser run one after the other
+        existing = db.scalars(
+            select(models.User.id).where(models.User.id.in_(chunk)).order_by(models.User.id).with_for_update()
+        ).all()
+        gone = set(chunk) - set(existing)
+        if gone:
+            db.execute(delete(models.AdvertiserSummary).where(models.AdvertiserSummary.advertiser_id.in_(gone)))
+        if not existing:
+            continue
+
+        rows = {advertiser_id: _empty(advertiser_id, now) for advertiser_id in existing}
+        totals = db.execute(
+            select(Campaign.advertiser_id, *_totals_columns())
+            .where(Campaign.advertiser_id.in_(existing))
+            .group_by(Campaign.advertiser_id)
+        )
+        for advertiser_id, *values in totals:
+            rows[advertiser_id].update(_totals(values))
+
+        unread = db.execute(
+            select(Notification.user_id, func.count())
+            .where(Notification.user_id.in_(existing), Notification.is_read == False)  # noqa: E712
+            .group_by(Notification.user_id)
+        )
+        for user_id, count in unread:
+            rows[user_id]["unread_notifications"] = count
+
+        _upsert(db, list(rows.values()))
+
+
+def ensure_rows(db: Session, advertiser_ids: Iterable[int], lock: bool = False) -> Dict[int, Dict[str, int]]:
+    """
+    Build the summaries `advertiser_ids` don't have yet, in full (no
+    commit). Returns advertiser_id -> status_counts for the rows that
+    already existed, the ones deltas go to; `lock` locks them first.
+    """
+    Summary = models.AdvertiserSummary
+    ids = sorted(set(advertiser_ids))
+    existing: Dict[int, Dict[str, int]] = {}
+    for start in range(0, len(ids), _CHUNK):
+        chunk = ids[start:start + _CHUNK]
+        query = select(Summary.advertiser_id, Summary.status_counts).where(Summary.advertiser_id.in_(chunk))
+        if lock:
+            query = query.order_by(Summary.advertiser_id).with_for_update()
+        existing.update(db.execute(query).all())
+    # Only the first write for an advertiser (or one racing its first
+    # dashboard load) gets here; refresh() sees this transaction's changes
+    missing = [advertiser_id for advertiser_id in ids if advertiser_id not in existing]
+    if missing:
+        refresh(db, missing)
+    return existing
+
+
+def apply(db: Session, deltas: Dict[int, Dict[str, Any]]) -> Set[int]:
+    """
+    Add `deltas` (advertiser_id -> column -> change, as add() collects
+    them) to the summary rows, in one executemany UPDATE (no commit).
+    Returns the advertisers whose summaries changed.
+    """
+    deltas = {
+        advertiser_id: delta for advertiser_id, delta in deltas.items()
+        if any(delta.get(column) for column in _AMOUNTS) or any(delta["status_counts"].values())
+    }
+    if not deltas:
+        return set()
+    # Locked (in id order) because status_counts is read, changed and written back
+    existing = ensure_rows(db, deltas, lock=True)
+    now = datetime.utcnow()
+    params = []
+    for advertiser_id, status_counts in existing.items():
+        delta = deltas[advertiser_id]
+        counts = Counter(status_counts or {})
+        counts.update(delta["status_counts"])
+        params.append({
+            "s_advertiser_id": advertiser_id,
+            "s_status_counts": {key: count for key, count in counts.items() if count},
+            "s_updated_at": now,
+            **{f"d_{column}": delta.get(column, 0) for column in _AMOUNTS},
+        })
+    if params:
+        table = models.AdvertiserSummary.__table__
+        db.execute(
+            update(table)
+            .where(table.c.advertiser_id == bindparam("s_advertiser_id"))
+            .values(
+                status_counts=bindparam("s_status_counts", type_=table.c.status_counts.type),
+                updated_at=bindparam("s_updated_at"),
+                **{column: table.c[column] + bindparam(f"d_{column}") for column in _AMOUNTS},
+            ),
+            params,
+        )
+    return set(deltas)
+
+
+def rebuild_all(db: Session) -> int:
+    """Recompute every advertiser's summary; returns the number of advertisers."""
+    advertiser_ids = db.scalars(select(models.User.id).order_by(models.User.id)).all()
+    for start in range(0, len(advertiser_ids), _CHUNK):
+        refresh(db, advertiser_ids[start:start + _CHUNK])
+        db.commit()
+    return len(advertiser_ids)
+
+
+# ==================== Reads ====================
+
+def _as_dict(row: models.AdvertiserSummary) -> Dict[str, Any]:
+    counts = dict(row.status_counts or {})
+    return {
+        "advertiser_id": row.advertiser_id,
+        "total_campaigns": row.total_campaigns,
+        "campaigns_by_status": counts,
+        "active_campaigns": sum(counts.get(s.value.lower(), 0) for s in ACTIVE_STATUSES),
+        "total_budget": row.total_budget,
+        "total_spent": row.total_spent,
+        "impressions": row.impressions,
+        "clicks": row.clicks,
+        "ctr": (row.clicks / row.impressions * 100) if row.impressions else 0.0,
+        "unread_notifications": row.unread_notifications,
+    }
+
+
+def _load_missing(advertiser_id: int) -> Dict[str, Any]:
+    """First read for an advertiser with no row yet: build it on the primary."""
+    db = SessionLocal()
+    try:
+        refresh(db, [advertiser_id])
+        db.commit()
+        row = db.get(models.AdvertiserSummary, advertiser_id)
+        return _as_dict(row if row is not None else models.AdvertiserSummary(**_empty(advertiser_id, None)))
+    finally:
+        db.close()
+
+
+def get_summary(db: Session, advertiser_id: int) -> Dict[str, Any]:
+    """
+    The advertiser's dashboard summary: total_campaigns, campaigns_by_status,
+    active_campaigns, total_budget, total_spent, impressions, clicks, ctr and
+    unread_notifications. Treat the returned dict as read-only (it is shared).
+    """
+    ttl = settings.CACHE_TTL
+    stamp = (_versions.get(advertiser_id, 0), int(time.time() // ttl) if ttl > 0 else 0)
+    entry = _cache.get(advertiser_id)
+    if entry is not None and entry[0] == stamp:
+        _stats["hits"] += 1
+        _cache.move_to_end(advertiser_id)
+        return entry[1]
+
+    _stats["misses"] += 1
+    row = db.get(models.AdvertiserSummary, advertiser_id)
+    summary = _as_dict(row) if row is not None else _load_missing(advertiser_id)
+    # Stored under the version read *before* the query, so a refresh that
+    # commits meanwhile just causes one more miss
+    _cache[advertiser_id] = (stamp, summary)
+    _cache.move_to_end(advertiser_id)
+    while len(_cache) > settings.CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return summary
+
+
+metrics.register_cache("advertiser_summaries", lambda: (_stats["hits"], _stats["misses"]))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    db = SessionLocal()
+    try:
+        logger.info("✅ Rebuilt %d advertiser summaries", rebuild_all(db))
+    finally:
+        db.close()
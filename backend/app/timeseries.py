@@ -0,0 +1,284 @@
+"""
+Campaign time series: impressions and clicks per UTC hour and per UTC day.
+
+- campaign_stats_hourly is written by event ingestion: every flush adds its
+  counts to the (campaign_id, hour) rows they fall in (app/ingestion.py).
+- campaign_stats_daily is rolled up from it by rollup(), which the
+  lifecycle scheduler runs on every pass. Each run recomputes the days that
+  may still have changed since the last one, then deletes hourly rows older
+  than STATS_HOURLY_RETENTION_DAYS. How far it has got for good is kept in
+  the ROLLUP_STATE row of scheduler_leases, so after a gap (or with the
+  scheduler off for a while) the next run catches up.
+- campaign_stats_breakdown is also written by ingestion: counts per day and
+  combination of dimension ids (app/dimensions.py). The same counts are
+  added per month to campaign_stats_breakdown_monthly, so breakdown() reads
+  whole months from there and only the partial months at either end of
+  the range from the daily rows.
+
+Events may arrive up to STATS_LATE_EVENT_DAYS late; older ones are refused
+at ingestion, so a day stops changing once it is that old. Until a day has
+been rolled up for good ("open" days, see open_from()), daily series are
+computed from its hourly rows, so they never lag behind the counters.
+The same goes for days the rollup hasn't reached yet.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from . import dimensions, models
+from .config import settings
+from .database import upsert
+
+# Most buckets one series request may cover
+MAX_POINTS = {"hour": 31 * 24, "day": 732}
+# How far in the future an event timestamp may be (producer clock skew)
+MAX_CLOCK_SKEW = timedelta(hours=1)
+# scheduler_leases row recording the rollup's progress (rolled_up_through)
+ROLLUP_STATE = "campaign_stats_rollup"
+_CHUNK = 1000
+
+
+# ==================== Buckets ====================
+
+def hour_bucket(ts: datetime) -> datetime:
+    """Start of the UTC hour `ts` falls in, as a naive datetime (naive means UTC)."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def event_bucket(ts: Optional[datetime], now: datetime) -> Optional[datetime]:
+    """
+    The hour bucket for an event at `ts` (None: now), or None if it is older
+    than STATS_LATE_EVENT_DAYS days or too far in the future.
+    """
+    bucket = hour_bucket(ts or now)
+    oldest = datetime.combine(now.date() - timedelta(days=settings.STATS_LATE_EVENT_DAYS), time())
+    if bucket < oldest or bucket > now + MAX_CLOCK_SKEW:
+        return None
+    return bucket
+
+
+def open_from(today: date) -> date:
+    """
+    First day that may not be rolled up for good yet: events can still
+    arrive for the last STATS_LATE_EVENT_DAYS days, plus one day of slack for
+    the flush and the next scheduler pass.
+    """
+    return today - timedelta(days=settings.STATS_LATE_EVENT_DAYS + 1)
+
+
+def rolled_up_through(db: Session) -> Optional[date]:
+    """Last day rollup() has written for good, or None if it never ran."""
+    Lease = models.SchedulerLease
+    return db.scalar(select(Lease.rolled_up_through).where(Lease.name == ROLLUP_STATE))
+
+
+def _hourly_retention() -> int:
+    # Never drop hours that may still be rolled up
+    return max(settings.STATS_HOURLY_RETENTION_DAYS, settings.STATS_LATE_EVENT_DAYS + 3)
+
+
+# ==================== Writes ====================
+
+def _upsert(db: Session, model, rows: List[Dict[str, Any]], add: bool):
+    """
+    Insert rows keyed by the table's primary key; on conflict add the counts
+    to the existing row (`add`) or replace them.
+    """
+    table = model.__table__
+    upsert(
+        db, table, rows, [column.name for column in table.primary_key.columns],
+        set_=lambda excluded: {
+            name: (table.c[name] + excluded[name]) if add else excluded[name]
+            for name in ("impressions", "clicks")
+        },
+    )
+
+
+def add_hourly(db: Session, rows: List[Dict[str, Any]]):
+    """Add {campaign_id, bucket, impressions, clicks} rows to campaign_stats_hourly (no commit)."""
+    for start in range(0, len(rows), _CHUNK):
+        _upsert(db, models.CampaignStatsHourly, rows[start:start + _CHUNK], add=True)
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def add_breakdown(db: Session, rows: List[Dict[str, Any]]):
+    """
+    Add {campaign_id, bucket (a date), device_id, state_id, ad_format_id,
+    impressions, clicks} rows to campaign_stats_breakdown and their monthly
+    sums to campaign_stats_breakdown_monthly (no commit).
+    """
+    key = [column.name for column in models.CampaignStatsBreakdownMonthly.__table__.primary_key.columns]
+    months: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        month = {**row, "bucket": row["bucket"].replace(day=1)}
+        merged = months.setdefault(tuple(month[name] for name in key), month)
+        if merged is not month:
+            merged["impressions"] += row["impressions"]
+            merged["clicks"] += row["clicks"]
+    for model, model_rows in (
+        (models.CampaignStatsBreakdown, rows),
+        (models.CampaignStatsBreakdownMonthly, list(months.values())),
+    ):
+        for start in range(0, len(model_rows), _CHUNK):
+            _upsert(db, model, model_rows[start:start + _CHUNK], add=True)
+
+
+def rollup(db: Session, today: Optional[date] = None) -> int:
+    """
+    Recompute campaign_stats_daily for the days that may have changed since
+    the last run and drop expired hourly rows, one commit per day. Returns
+    the number of daily rows written.
+    """
+    today = today or datetime.utcnow().date()
+    Hourly = models.CampaignStatsHourly
+    retention = _hourly_retention()
+    # The day leaving the open window is rolled up once more, after its last writes
+    final = open_from(today) - timedelta(days=1)
+    state = db.get(models.SchedulerLease, ROLLUP_STATE)
+    if state is None:
+        state = models.SchedulerLease(name=ROLLUP_STATE)
+        db.add(state)
+    if state.rolled_up_through is not None:
+        day = min(state.rolled_up_through + timedelta(days=1), final)
+    else:
+        oldest = db.scalar(select(func.min(Hourly.bucket)))
+        day = min(oldest.date(), final) if oldest is not None else final
+    # Hours older than the retention may be gone already
+    day = max(day, today - timedelta(days=retention))
+    written = 0
+    while day < today:
+        start = datetime.combine(day, time())
+        totals = db.execute(
+            select(Hourly.campaign_id, func.sum(Hourly.impressions), func.sum(Hourly.clicks))
+            .where(Hourly.bucket >= start, Hourly.bucket < start + timedelta(days=1))
+            .group_by(Hourly.campaign_id)
+        ).all()
+        rows = [
+            {"campaign_id": campaign_id, "bucket": day, "impressions": int(impressions), "clicks": int(clicks)}
+            for campaign_id, impressions, clicks in totals
+        ]
+        for chunk in range(0, len(rows), _CHUNK):
+            _upsert(db, models.CampaignStatsDaily, rows[chunk:chunk + _CHUNK], add=False)
+        if day <= final and (state.rolled_up_through is None or day > state.rolled_up_through):
+            state.rolled_up_through = day
+        db.commit()
+        written += len(rows)
+        day += timedelta(days=1)
+
+    state.last_run_at = datetime.utcnow()
+    db.execute(delete(Hourly).where(Hourly.bucket < datetime.combine(today - timedelta(days=retention), time())))
+    db.commit()
+    return written
+
+
+# ==================== Reads ====================
+
+def _days(start: date, end: date) -> Iterable[date]:
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def _counts(impressions: int, clicks: int) -> Dict[str, Any]:
+    return {
+        "impressions": impressions,
+        "clicks": clicks,
+        "ctr": round(clicks / impressions * 100, 2) if impressions else 0.0,
+    }
+
+
+def _point(bucket, impressions: int, clicks: int) -> Dict[str, Any]:
+    return {"bucket": bucket, **_counts(impressions, clicks)}
+
+
+def series(db: Session, campaign_id: int, start: date, end: date, granularity: str, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    Points for every hour or day from `start` to `end` (inclusive, UTC),
+    zero-filled. Only the buckets in range are read.
+    """
+    Hourly, Daily = models.CampaignStatsHourly, models.CampaignStatsDaily
+    end_exclusive = datetime.combine(end + timedelta(days=1), time())
+
+    if granularity == "hour":
+        hours = {
+            bucket: (impressions, clicks)
+            for bucket, impressions, clicks in db.execute(
+                select(Hourly.bucket, Hourly.impressions, Hourly.clicks)
+                .where(Hourly.campaign_id == campaign_id, Hourly.bucket >= datetime.combine(start, time()), Hourly.bucket < end_exclusive)
+            )
+        }
+        points = []
+        bucket = datetime.combine(start, time())
+        while bucket < end_exclusive:
+            points.append(_point(bucket, *hours.get(bucket, (0, 0))))
+            bucket += timedelta(hours=1)
+        return points
+
+    # Days rolled up for good from the daily rows, the rest summed from their hours
+    rolled = rolled_up_through(db)
+    boundary = open_from(today or datetime.utcnow().date())
+    boundary = start if rolled is None else max(start, min(boundary, rolled + timedelta(days=1)))
+    counts: Dict[date, List[int]] = {}
+    if start < boundary:
+        for day, impressions, clicks in db.execute(
+            select(Daily.bucket, Daily.impressions, Daily.clicks)
+            .where(Daily.campaign_id == campaign_id, Daily.bucket >= start, Daily.bucket < min(boundary, end + timedelta(days=1)))
+        ):
+            counts[day] = [impressions, clicks]
+    if boundary <= end:
+        for bucket, impressions, clicks in db.execute(
+            select(Hourly.bucket, Hourly.impressions, Hourly.clicks)
+            .where(Hourly.campaign_id == campaign_id, Hourly.bucket >= datetime.combine(boundary, time()), Hourly.bucket < end_exclusive)
+        ):
+            day_counts = counts.setdefault(bucket.date(), [0, 0])
+            day_counts[0] += impressions
+            day_counts[1] += clicks
+    return [_point(day, *counts.get(day, (0, 0))) for day in _days(start, end)]
+
+
+def breakdown(db: Session, campaign_id: int, by: Sequence[str], start: date, end: date) -> List[Dict[str, Any]]:
+    """
+    Impressions, clicks and CTR from `start` to `end` (inclusive, UTC) per
+    combination of the `by` dimensions, most impressions first. Grouped on
+    the dimension ids; values are looked up afterwards (None: not reported).
+    """
+    Daily, Monthly = models.CampaignStatsBreakdown, models.CampaignStatsBreakdownMonthly
+    after_end = end + timedelta(days=1)
+    first_month = start if start.day == 1 else _next_month(start)
+    end_month = after_end.replace(day=1)
+    if first_month < end_month:
+        # Whole months, then the days before and after them
+        ranges = [(Monthly, first_month, end_month), (Daily, start, first_month), (Daily, end_month, after_end)]
+    else:
+        ranges = [(Daily, start, after_end)]
+
+    counts: Dict[tuple, List[int]] = {}
+    for model, lower, upper in ranges:
+        if lower >= upper:
+            continue
+        columns = [getattr(model, f"{name}_id") for name in by]
+        for *ids, impressions, clicks in db.execute(
+            select(*columns, func.sum(model.impressions), func.sum(model.clicks))
+            .where(model.campaign_id == campaign_id, model.bucket >= lower, model.bucket < upper)
+            .group_by(*columns)
+        ):
+            sums = counts.setdefault(tuple(ids), [0, 0])
+            sums[0] += int(impressions)
+            sums[1] += int(clicks)
+
+    values = dimensions.decode(db, {value_id for ids in counts for value_id in ids})
+    return [
+        {
+            "dimensions": {name: values[value_id] for name, value_id in zip(by, ids)},
+            **_counts(impressions, clicks),
+        }
+        for ids, (impressions, clicks) in sorted(counts.items(), key=lambda item: -item[1][0])
+    ]
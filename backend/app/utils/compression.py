@@ -0,0 +1,81 @@
+"""
+Response compression helpers.
+
+gzip is always available; brotli is used when the optional `brotli` (or
+`brotlicffi`) package is installed.
+"""
+import gzip
+from typing import Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Content types worth compressing; images/video are already compressed
+COMPRESSIBLE_TYPES = (
+    "application/json", "text/", "application/javascript",
+    "application/xml", "image/svg+xml", "text/csv",
+)
+
+
+def available_encodings() -> tuple:
+    """Encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return any(content_type.startswith(t) for t in COMPRESSIBLE_TYPES)
+
+
+def negotiate_encoding(accept_encoding: str, offered: Optional[Iterable[str]] = None) -> Optional[str]:
+    """
+    Pick the best encoding from an Accept-Encoding header.
+
+    Honours q-values (q=0 means "not acceptable") and the `*` wildcard.
+    Ties go to the order of `offered` (brotli before gzip by default).
+    Returns None when the response should be sent uncompressed.
+    """
+    if not accept_encoding:
+        return None
+    offered = tuple(offered) if offered is not None else available_encodings()
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best, best_q = None, 0.0
+    for encoding in offered:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    Compress `body` with `encoding` ("gzip" or "br").
+    `level` is the gzip level (1-9) or brotli quality (0-11).
+    """
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6 if level is None else level, mtime=0)
+    if encoding == "br":
+        if brotli is None:
+            raise ValueError("brotli is not installed")
+        return brotli.compress(body, quality=4 if level is None else level)
+    raise ValueError(f"Unsupported encoding: {encoding}")
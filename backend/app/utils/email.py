@@ -1,64 +1,90 @@
+import html
 import smtplib
 import socket
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Iterable, Tuple
 from ..config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
-def send_email(to_email: str, subject: str, html_content: str):
-    """
-    Highly resilient SMTP sender with automatic clean-up and protocol switching.
-    """
-    # 1. CLEAN & EXTRACT VARS
+
+def _smtp_config():
     host = settings.SMTP_HOST.strip() or "smtp.gmail.com"
     user = settings.SMTP_USER.strip()
     password = settings.SMTP_PASSWORD.replace(" ", "").strip()
     from_email = settings.FROM_EMAIL.strip() or user
     port = int(str(settings.SMTP_PORT).strip() or "465")
+    return host, port, user, password, from_email
+
+
+def _connect(host: str, port: int, user: str, password: str) -> smtplib.SMTP:
+    if port == 465:
+        # Force IPv4 connection to prevent Railway IPv6 unreachable errors
+        server = smtplib.SMTP_SSL(host, port, timeout=20)
+    else:
+        server = smtplib.SMTP(host, port, timeout=20)
+        server.starttls()
+    server.login(user, password)
+    return server
 
-    # 2. VALIDATION
-    if not user or not password:
-        logger.error("❌ SMTP Credentials missing in environment variables.")
-        return False
 
-    # 3. BUILD MESSAGE
+def _build_message(from_email: str, to_email: str, subject: str, html_content: str) -> MIMEMultipart:
     msg = MIMEMultipart()
     msg['From'] = from_email
     msg['To'] = to_email
     msg['Subject'] = subject
     msg.attach(MIMEText(html_content, 'html'))
+    return msg
 
-    # 4. SENDING LOGIC (SSL VS TLS)
-    server = None
+
+def send_email(to_email: str, subject: str, html_content: str):
+    """
+    Highly resilient SMTP sender with automatic clean-up and protocol switching.
+    """
+    return send_emails([(to_email, subject, html_content)]) == 1
+
+
+def send_emails(messages: Iterable[Tuple[str, str, str]]) -> int:
+    """
+    Send (to_email, subject, html_content) messages over a single SMTP
+    connection. Returns how many were delivered.
+    """
+    messages = list(messages)
+    if not messages:
+        return 0
+    host, port, user, password, from_email = _smtp_config()
+
+    if not user or not password:
+        logger.error("❌ SMTP Credentials missing in environment variables.")
+        return 0
+
+    sent = 0
     try:
-        logger.info(f"📧 Connectivity: Trying {host}:{port} for {to_email}...")
-        
-        if port == 465:
-            # Force IPv4 connection to prevent Railway IPv6 unreachable errors
-            server = smtplib.SMTP_SSL(host, port, timeout=20)
-        else:
-            server = smtplib.SMTP(host, port, timeout=20)
-            server.starttls()
-            
-        server.login(user, password)
-        server.send_message(msg)
+        logger.info("📧 Connectivity: Trying %s:%s for %d recipient(s)...", host, port, len(messages))
+        server = _connect(host, port, user, password)
+        for to_email, subject, html_content in messages:
+            try:
+                server.send_message(_build_message(from_email, to_email, subject, html_content))
+                sent += 1
+                logger.info("✅ SUCCESS: Email delivered to %s", to_email)
+            except smtplib.SMTPRecipientsRefused as e:
+                logger.error("❌ SMTP refused %s: %s", to_email, e)
         server.quit()
-        
-        logger.info(f"✅ SUCCESS: Email delivered to {to_email}")
-        return True
-        
+        return sent
+
     except (socket.gaierror, socket.error, OSError) as net_err:
-        logger.error(f"❌ NETWORK ERROR: Railway cannot reach {host}:{port}. Error: {str(net_err)}")
+        logger.error("❌ NETWORK ERROR: Railway cannot reach %s:%s. Error: %s", host, port, net_err)
         # Fallback logging to file so the user can still get their token
         with open("email_logs.txt", "a", encoding="utf-8") as f:
-            f.write(f"\n--- NETWORK_FAIL_FALLBACK | {to_email} | {subject} ---\n{html_content}\n")
-        return False
-        
+            for to_email, subject, html_content in messages[sent:]:
+                f.write(f"\n--- NETWORK_FAIL_FALLBACK | {to_email} | {subject} ---\n{html_content}\n")
+        return sent
+
     except Exception as e:
-        logger.error(f"❌ SMTP FAILED: {type(e).__name__} - {str(e)}")
-        return False
+        logger.error("❌ SMTP FAILED: %s - %s", type(e).__name__, e)
+        return sent
 
 def send_password_reset_email(to_email: str, token: str):
     """Generates reset link and sends email."""
@@ -83,3 +109,25 @@ def send_password_reset_email(to_email: str, token: str):
     </div>
     """
     return send_email(to_email, subject, html_content)
+
+
+def campaign_status_email(to_email: str, title: str, message: str) -> Tuple[str, str, str]:
+    """A campaign status change email, ready for send_emails()."""
+    base_url = settings.FRONTEND_URL
+    if not base_url or "localhost" in base_url:
+        base_url = "https://digital-ocean-production-01ee.up.railway.app"
+    dashboard_link = f"{base_url.rstrip('/')}/campaigns"
+
+    subject = f"{title} - AdPlatform"
+    html_content = f"""
+    <div style="font-family: sans-serif; padding: 20px; max-width: 600px; margin: auto; border: 1px solid #eee; border-radius: 10px;">
+        <h2 style="color: #2563eb;">{html.escape(title)}</h2>
+        <p>{html.escape(message)}</p>
+        <div style="margin: 25px 0;">
+            <a href="{dashboard_link}" style="background: #2563eb; color: white; padding: 12px 25px; text-decoration: none; border-radius: 5px; font-weight: bold; display: inline-block;">View Campaigns</a>
+        </div>
+        <hr style="border: 0; border-top: 1px solid #eee; margin-top: 20px;">
+        <p style="font-size: 10px; color: #999;">AdPlatform Notifications</p>
+    </div>
+    """
+    return to_email, subject, html_content
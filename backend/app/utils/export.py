@@ -0,0 +1,87 @@
+"""
+Streaming exports.
+
+Rows are read through a server-side cursor (yield_per, which turns on
+stream_results) on a session owned by the generator, and encoded batch by
+batch into NDJSON or CSV. Memory stays flat however many rows match, and
+since the generators are synchronous, Starlette iterates them in its
+threadpool without blocking the event loop.
+
+The session outlives the request's dependencies, so it is opened and
+closed by the generator itself rather than taken from get_db.
+"""
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+import orjson
+from sqlalchemy.orm import Query, Session
+
+from ..database import SessionLocal, replicas
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def stream_query(build_query: Callable[[Session], Query], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Sequence[Sequence[Any]]]:
+    """Batches of rows from `build_query(session)`, read with a server-side cursor."""
+    db = SessionLocal()
+    if replicas:
+        db.info["read_only"] = True
+    try:
+        result = db.execute(build_query(db).statement.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+# Written as-is by csv.writer (None becomes an empty field). Exact types,
+# since str-based enums would otherwise be written as "CoverageType.STATE".
+_CSV_PLAIN = {str, int, float, bool, type(None)}
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        # Same convention as the bulk CSV import (tags separated by ';')
+        return ";".join(str(v) for v in value)
+    if isinstance(value, dict):
+        return orjson.dumps(value).decode()
+    return value
+
+
+def ndjson_chunks(batches: Iterable[Sequence[Sequence[Any]]], names: Sequence[str]) -> Iterator[bytes]:
+    """One JSON object per row; one chunk per batch."""
+    for batch in batches:
+        yield b"".join(orjson.dumps(dict(zip(names, row))) + b"\n" for row in batch)
+
+
+def csv_chunks(batches: Iterable[Sequence[Sequence[Any]]], names: Sequence[str]) -> Iterator[bytes]:
+    """A header line, then one chunk of CSV lines per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for batch in batches:
+        writer.writerows(
+            [value if type(value) in _CSV_PLAIN else _csv_value(value) for value in row]
+            for row in batch
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only: nothing matched
+        yield buffer.getvalue().encode("utf-8")
+
+
+ENCODERS = {"ndjson": ndjson_chunks, "csv": csv_chunks}
@@ -1,17 +1,18 @@
 """
 File upload utilities for media management.
 Handles validation, storage (local/S3), and image processing.
+
+boto3 and Pillow are imported on first use so that importing this module
+(and therefore the media router) does not slow down worker start-up.
 """
 import os
 import uuid
 import mimetypes
+from functools import lru_cache
 from typing import Optional, Tuple
 from pathlib import Path
-from PIL import Image
 from fastapi import UploadFile, HTTPException, status
 import aiofiles
-import boto3
-from botocore.exceptions import ClientError
 
 from ..config import settings
 
@@ -38,14 +39,21 @@ class FileUploadManager:
     
     def __init__(self):
         self.use_s3 = settings.USE_S3
-        if self.use_s3:
-            self.s3_client = boto3.client(
+        self.bucket_name = settings.AWS_S3_BUCKET if self.use_s3 else None
+        self._s3_client = None
+    
+    @property
+    def s3_client(self):
+        """boto3 S3 client, created on first S3 operation."""
+        if self._s3_client is None:
+            import boto3
+            self._s3_client = boto3.client(
                 's3',
                 aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
                 aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
                 region_name=settings.AWS_REGION
             )
-            self.bucket_name = settings.AWS_S3_BUCKET
+        return self._s3_client
     
     async def validate_file(self, file: UploadFile) -> Tuple[str, str]:
         """
@@ -145,6 +153,8 @@ class FileUploadManager:
     
     async def _upload_to_s3(self, key: str, content: bytes, content_type: Optional[str] = None) -> str:
         """Upload file to S3."""
+        from botocore.exceptions import ClientError
+        
         try:
             extra_args = {}
             if content_type:
@@ -197,6 +207,7 @@ class FileUploadManager:
         if file_type == 'image':
             try:
                 from io import BytesIO
+                from PIL import Image
                 image = Image.open(BytesIO(content))
                 metadata['width'] = image.width
                 metadata['height'] = image.height
@@ -230,5 +241,7 @@ class FileUploadManager:
         return 'document'
 
 
-# Global instance
-file_upload_manager = FileUploadManager()
+@lru_cache(maxsize=1)
+def get_file_upload_manager() -> FileUploadManager:
+    """Shared FileUploadManager, constructed on first upload/delete."""
+    return FileUploadManager()
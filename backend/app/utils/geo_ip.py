@@ -19,7 +19,7 @@ async def get_country_from_ip(request: Request) -> Optional[str]:
 
     # 2. Skip detection for local IP
     if ip in ("127.0.0.1", "localhost", "::1"):
-        logger.debug(f"Local IP detected ({ip}), skipping geo-lookup.")
+        logger.debug("Local IP detected (%s), skipping geo-lookup.", ip)
         return None
 
     # 3. Use a geo-lookup service (Mocked for speed, but prepared for real API)
@@ -32,6 +32,6 @@ async def get_country_from_ip(request: Request) -> Optional[str]:
                 if data.get("status") == "success":
                     return data.get("countryCode") # e.g., 'US', 'IN'
     except Exception as e:
-        logger.error(f"GeoIP look up failed for {ip}: {e}")
+        logger.error("GeoIP look up failed for %s: %s", ip, e)
     
     return None
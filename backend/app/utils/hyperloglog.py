@@ -0,0 +1,131 @@
+"""
+HyperLogLog distinct-count sketches.
+
+A sketch estimates how many distinct items were added to it in a fixed
+2**precision registers (4 KiB at the default precision 12, about 1.6%
+standard error), whatever the number of items. Sketches with the same
+precision merge by taking the register-wise maximum, so a sketch per
+campaign per day can be combined into the reach of any range of days or
+set of campaigns without counting anyone twice.
+
+Items are hashed with 64-bit BLAKE2b, so no large-range correction is
+needed; small cardinalities use linear counting. union() merges with numpy
+when it is installed (it comes with pandas), else in pure Python; numpy is
+only imported on the first union(), so it stays out of app start-up.
+"""
+import hashlib
+import math
+from collections import Counter
+from typing import Iterable, List, Union
+
+DEFAULT_PRECISION = 12
+_HASH_BITS = 64
+# Sketches merged per step in union()
+_MERGE_CHUNK = 256
+
+
+def hash_item(item: Union[str, bytes]) -> int:
+    """64-bit hash of `item`, as add_hashes() expects."""
+    if isinstance(item, str):
+        item = item.encode()
+    return int.from_bytes(hashlib.blake2b(item, digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """A distinct-count sketch; serialize with to_bytes() / from_bytes()."""
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Union[bytes, bytearray, None] = None):
+        if not 4 <= precision <= 16:
+            raise ValueError(f"precision must be between 4 and 16, not {precision}")
+        self.precision = precision
+        size = 1 << precision
+        if registers is not None and len(registers) != size:
+            raise ValueError(f"expected {size} registers, got {len(registers)}")
+        self.registers = bytearray(registers) if registers is not None else bytearray(size)
+
+    # ==================== Adding ====================
+
+    def add(self, item: Union[str, bytes]):
+        self.add_hashes((hash_item(item),))
+
+    def add_hashes(self, hashes: Iterable[int]):
+        """Add items by their hash_item() values."""
+        registers = self.registers
+        shift = _HASH_BITS - self.precision
+        mask = (1 << shift) - 1
+        for value in hashes:
+            index = value >> shift
+            # Position of the leftmost 1 bit in the remaining bits
+            rank = shift - (value & mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        """Fold `other` into this sketch (afterwards it counts both)."""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precisions")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    @classmethod
+    def union(cls, sketches: Iterable[bytes], precision: int = DEFAULT_PRECISION) -> "HyperLogLog":
+        """One sketch counting everything in the serialized `sketches`."""
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - optional dependency
+            numpy = None
+        result = cls(precision)
+        chunk: List[bytes] = []
+        for data in sketches:
+            if not data or data[0] != precision or len(data) != len(result.registers) + 1:
+                raise ValueError("cannot merge sketches with different precisions")
+            chunk.append(data)
+            if len(chunk) == _MERGE_CHUNK:
+                result._merge_chunk(chunk, numpy)
+                chunk = []
+        if chunk:
+            result._merge_chunk(chunk, numpy)
+        return result
+
+    def _merge_chunk(self, chunk: List[bytes], numpy):
+        if numpy is not None:
+            stacked = numpy.frombuffer(b"".join(data[1:] for data in chunk), dtype=numpy.uint8)
+            merged = stacked.reshape(len(chunk), -1).max(axis=0)
+            self.registers = bytearray(numpy.maximum(merged, numpy.frombuffer(self.registers, dtype=numpy.uint8)).tobytes())
+        else:
+            self.registers = bytearray(map(max, self.registers, *(memoryview(data)[1:] for data in chunk)))
+
+    # ==================== Estimating ====================
+
+    def count(self) -> int:
+        """Estimated number of distinct items added."""
+        m = len(self.registers)
+        histogram = Counter(self.registers)
+        estimate = _alpha(m) * m * m / math.fsum(n * 2.0 ** -rank for rank, n in histogram.items())
+        zeros = histogram.get(0, 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    # ==================== Serialization ====================
+
+    def to_bytes(self) -> bytes:
+        """One precision byte followed by the registers."""
+        return bytes((self.precision,)) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        if not data:
+            raise ValueError("empty sketch")
+        return cls(data[0], data[1:])
+
+
+def _alpha(m: int) -> float:
+    if m == 16:
+        return 0.673
+    if m == 32:
+        return 0.697
+    if m == 64:
+        return 0.709
+    return 0.7213 / (1 + 1.079 / m)
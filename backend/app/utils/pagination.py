@@ -0,0 +1,119 @@
+"""
+Keyset (cursor) pagination for newest-first listings.
+
+Pages are ordered by (created_at DESC, id DESC) and the next page starts
+strictly after the last row of the previous one, so fetching page 1000 costs
+the same index seek as page 1 (OFFSET has to walk every skipped row).
+
+The cursor is an opaque, URL-safe token; clients pass back `next_cursor`
+unchanged.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import String, literal, tuple_, type_coerce
+from sqlalchemy.orm import Query
+
+from ..responses import ORJSONResponse
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_keyset(*values: Any) -> str:
+    """Opaque cursor for a keyset position (JSON-serializable sort key values)."""
+    raw = json.dumps(list(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_keyset(cursor: str, *types: Callable[[Any], Any]) -> Tuple:
+    """Sort key values of `cursor`, each converted by its type; raises 400 for anything else."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(cursor)
+        return tuple(kind(value) for kind, value in zip(types, values))
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _timestamp_text(value: str) -> str:
+    datetime.fromisoformat(value)
+    return value
+
+
+def encode_cursor(created_at: Union[datetime, str], row_id: int) -> str:
+    return encode_keyset(created_at.isoformat() if isinstance(created_at, datetime) else created_at, row_id)
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """(created_at as sent, id); raises 400 for anything that is not a cursor."""
+    return decode_keyset(cursor, _timestamp_text, int)
+
+
+def paginate(query: Query, model: Any, cursor: Optional[str], limit: int, offset: int = 0) -> Tuple[List[Any], Optional[str]]:
+    """
+    Apply keyset pagination to `query` (already filtered, not yet ordered),
+    either a model query or a column projection of `model` that includes id.
+
+    Returns the page of rows and the cursor for the next page (None on the
+    last page). `offset` is only honoured without a cursor, for clients still
+    sending ?skip=; they get a next cursor too. `model.created_at` must be
+    NOT NULL in practice; migration 0004 backfills legacy rows.
+    """
+    # SQLite keeps DateTime as text in two shapes ("…:43" from CURRENT_TIMESTAMP,
+    # "…:43.000000" from SQLAlchemy), so its cursor carries the stored text and
+    # is compared as text; other databases compare real timestamps.
+    as_text = query.session.get_bind().dialect.name == "sqlite"
+    # Column-projected queries (utils.projection) already return Row tuples;
+    # the extra cursor column is left on them and ignored by the schema
+    descriptions = query.column_descriptions
+    single_entity = len(descriptions) == 1 and descriptions[0]["expr"] is model
+
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        after_created, after_id = decode_cursor(cursor)
+        bound = literal(after_created, String) if as_text else datetime.fromisoformat(after_created)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(bound, after_id))
+    elif offset:
+        query = query.offset(offset)
+    if as_text:
+        query = query.add_columns(type_coerce(model.created_at, String))
+
+    rows = query.limit(limit + 1).all()
+    keys = [row[-1] for row in rows] if as_text else [row.created_at for row in rows]
+    if as_text and single_entity:
+        rows = [row[0] for row in rows]
+    if len(rows) <= limit:
+        return rows, None
+    return rows[:limit], encode_cursor(keys[limit - 1], rows[limit - 1].id)
+
+
+def page_response(items: List[Any], next_cursor: Optional[str], cursor: Optional[str]) -> ORJSONResponse:
+    """
+    page_result() for items that are already JSON-ready (dicts of plain
+    values), returned as a response so they skip validation and
+    jsonable_encoder.
+    """
+    if cursor is not None:
+        return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+    return ORJSONResponse(items, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
+
+def page_result(items: List[Any], next_cursor: Optional[str], cursor: Optional[str], response: Response):
+    """
+    Shape a page for the client.
+
+    Callers that sent `cursor` (an empty value requests the first page) get
+    {"items": [...], "next_cursor": ...}. Legacy callers keep getting a bare
+    list, with the next cursor in the X-Next-Cursor header.
+    """
+    if cursor is not None:
+        return {"items": items, "next_cursor": next_cursor}
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
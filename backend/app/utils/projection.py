@@ -0,0 +1,44 @@
+"""
+Column projection for list endpoints.
+
+Selecting only the columns a response schema declares keeps wide Text/JSON
+columns out of the result set and returns lightweight Row tuples instead of
+identity-mapped ORM objects (no change tracking, no lazy loads). Rows are
+shaped in SQL to match the schema, so they can be serialized directly
+without a pydantic validation pass.
+"""
+from typing import Any, Dict, Iterable, List, Type
+
+from pydantic import BaseModel
+from sqlalchemy import String, cast, func
+
+from .. import models, schemas
+
+
+def columns_for(model: Any, schema: Type[BaseModel], **expressions: Any) -> List[Any]:
+    """
+    The `model` attributes named by `schema`'s fields, labelled by field name.
+
+    Hybrid properties (e.g. Campaign.ctr) are selected through their SQL
+    expression; `expressions` overrides individual fields. Pass the result to
+    `db.query(*columns)`.
+    """
+    return [
+        (expressions[name] if name in expressions else getattr(model, name)).label(name)
+        for name in schema.model_fields
+    ]
+
+
+def rows_as_dicts(rows: Iterable[Any], schema: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """Rows from a `columns_for(…, schema)` query as plain dicts (extra trailing columns are dropped)."""
+    names = tuple(schema.model_fields)
+    return [dict(zip(names, row)) for row in rows]
+
+
+def campaign_summary_columns() -> List[Any]:
+    """Columns for schemas.CampaignSummary (status lowercased in SQL, as its validator does)."""
+    return columns_for(
+        models.Campaign,
+        schemas.CampaignSummary,
+        status=func.lower(cast(models.Campaign.status, String)),
+    )
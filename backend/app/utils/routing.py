@@ -0,0 +1,24 @@
+"""
+Route template lookup for logging and metrics.
+"""
+from typing import Any, Mapping
+
+
+def route_template(scope: Mapping[str, Any]) -> str:
+    """
+    Matched route template (e.g. "/api/campaigns/{campaign_id}") for a request,
+    or the raw path when no route matched (404s).
+
+    Depending on the FastAPI version, scope["route"] may carry the template
+    without the prefix given to app.include_router(); that static prefix is
+    recovered from the leading segments of the actual path.
+    """
+    path = scope.get("path", "")
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not template:
+        return path
+    extra = path.count("/") - template.count("/")
+    if extra <= 0:
+        return template
+    return "/".join(path.split("/")[:extra + 1]) + template
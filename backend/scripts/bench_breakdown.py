@@ -0,0 +1,140 @@
+"""
+Campaign breakdown benchmark: GROUP BY over dictionary-encoded dimensions.
+
+Seeds --days days (default: a year) of breakdown rows for one campaign
+(every combination of a few devices, --states states and ad formats,
+every day) through
+timeseries.add_breakdown(), as ingestion writes them, into a throwaway
+SQLite database (or uses DATABASE_URL with --use-env-db). Then times
+timeseries.breakdown() over the last --days days for several `by`
+combinations (what GET /api/analytics/campaign/{id}/breakdown runs):
+
+- daily rows only: one GROUP BY over every day in the range
+- with monthly rows: whole months from campaign_stats_breakdown_monthly,
+  the partial months at either end from the daily rows
+
+and checks that both, and every grouping, add up to the same totals.
+
+Usage:
+    python scripts/bench_breakdown.py
+    python scripts/bench_breakdown.py --days 365 --states 60
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEVICES = ("desktop", "mobile", "tablet", "ctv", "other")
+FORMATS = ("banner", "video", "native", "audio")
+
+
+def seed(db, models, dimensions, timeseries, days: int, states: int, end: date) -> int:
+    advertiser = models.User(name="Bench", email="bench@example.com", role="advertiser", country="US")
+    db.add(advertiser)
+    db.flush()
+    campaign = models.Campaign(
+        advertiser_id=advertiser.id, name="Campaign", industry_type="Retail",
+        start_date=end - timedelta(days=days), end_date=end, budget=100.0,
+        status=models.CampaignStatus.ACTIVE, coverage_type=models.CoverageType.STATE,
+        target_country="US", impressions=0, clicks=0,
+    )
+    db.add(campaign)
+    db.commit()
+
+    combos = [
+        {"device": device, "state": f"State {s}", "ad_format": ad_format}
+        for device in DEVICES for s in range(states) for ad_format in FORMATS
+    ]
+    ids = dimensions.encode(combos)
+    for day in range(days):
+        bucket = end - timedelta(days=day)
+        timeseries.add_breakdown(db, [
+            {
+                "campaign_id": campaign.id, "bucket": bucket,
+                "device_id": device_id, "state_id": state_id, "ad_format_id": ad_format_id,
+                "impressions": 100 + (n + day) % 900, "clicks": (n + day) % 17,
+            }
+            for n, (device_id, state_id, ad_format_id) in enumerate(ids)
+        ])
+        db.commit()
+    return campaign.id
+
+
+def measure(fn, repeat: int) -> float:
+    """Mean ms for one call of fn."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--states", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--campaign-id", type=int, help="with --use-env-db: campaign to query")
+    parser.add_argument("--use-env-db", action="store_true", help="benchmark DATABASE_URL instead of a temp SQLite DB")
+    args = parser.parse_args()
+
+    if not args.use_env_db:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from sqlalchemy import func, select
+
+    from app import dimensions, models, timeseries
+    from app.database import SessionLocal
+    from app.migrate import run_migrations
+
+    run_migrations()
+    end = date.today()
+    start = end - timedelta(days=args.days - 1)
+    db = SessionLocal()
+    if args.use_env_db:
+        if args.campaign_id is None:
+            raise SystemExit("--campaign-id is required with --use-env-db")
+        campaign_id = args.campaign_id
+    else:
+        combos = len(DEVICES) * args.states * len(FORMATS)
+        print(f"Seeding {args.days} days x {combos:,} dimension combinations = {args.days * combos:,} rows...")
+        campaign_id = seed(db, models, dimensions, timeseries, args.days, args.states, end)
+
+    Daily = models.CampaignStatsBreakdown
+
+    def daily_only(by):
+        columns = [getattr(Daily, f"{name}_id") for name in by]
+        return db.execute(
+            select(*columns, func.sum(Daily.impressions), func.sum(Daily.clicks))
+            .where(Daily.campaign_id == campaign_id, Daily.bucket >= start, Daily.bucket <= end)
+            .group_by(*columns)
+        ).all()
+
+    groupings = (["device"], ["ad_format"], ["device", "state"], ["device", "state", "ad_format"])
+    totals = set()
+    for by in groupings:
+        rows = timeseries.breakdown(db, campaign_id, by, start, end)
+        totals.add((sum(row["impressions"] for row in rows), sum(row["clicks"] for row in rows)))
+        totals.add(tuple(sum(int(row[i]) for row in daily_only(by)) for i in (-2, -1)))
+    assert len(totals) == 1, f"groupings disagree on totals: {totals}"
+
+    print(f"🧮 Campaign breakdown, {start} to {end}")
+    print("=" * 60)
+    print(f"{'':<30} {'rows':>6} {'daily only':>12} {'with monthly':>14}")
+    for by in groupings:
+        rows = len(timeseries.breakdown(db, campaign_id, by, start, end))
+        daily_ms = measure(lambda: daily_only(by), args.repeat)
+        ms = measure(lambda: timeseries.breakdown(db, campaign_id, by, start, end), args.repeat)
+        print(f"{'by=' + ','.join(by):<30} {rows:>6,} {daily_ms:>9.1f} ms {ms:>11.1f} ms")
+    print("All groupings add up to the same totals")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
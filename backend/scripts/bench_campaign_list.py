@@ -0,0 +1,131 @@
+"""
+Campaign list benchmark: full ORM objects vs column projection.
+
+Seeds campaigns with realistic descriptions and tags into a throwaway SQLite
+database (or uses DATABASE_URL with --use-env-db) and, for one 100-row page,
+compares loading full Campaign objects validated through CampaignResponse
+with selecting the CampaignSummary columns as Row tuples and encoding them
+directly (what the list endpoints do now). Reports latency and peak Python
+memory per page, and checks both produce the same summary fields.
+
+Usage:
+    python scripts/bench_campaign_list.py
+    python scripts/bench_campaign_list.py --rows 20000 --page-size 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def seed(db, models, rows: int):
+    start = datetime(2024, 1, 1)
+    description = "Spring sale across all stores, free delivery over $50. " * 40
+    batch = []
+    for i in range(rows):
+        batch.append({
+            "advertiser_id": 1, "name": f"Campaign {i}", "industry_type": "Retail",
+            "start_date": date(2026, 1, 1), "end_date": date(2026, 2, 1), "budget": 100.0,
+            "status": models.CampaignStatus.ACTIVE, "coverage_type": models.CoverageType.STATE,
+            "target_country": "US", "target_state": "California", "impressions": 1000 + i, "clicks": i % 50,
+            "headline": "Spring sale", "landing_page_url": "https://example.com/spring",
+            "description": description, "tags": ["retail", "spring", "sale", f"store-{i % 20}"],
+            "created_at": start + timedelta(seconds=i),
+        })
+        if len(batch) == 5000:
+            db.bulk_insert_mappings(models.Campaign, batch)
+            batch = []
+    if batch:
+        db.bulk_insert_mappings(models.Campaign, batch)
+    db.commit()
+
+
+def measure(fn, repeat: int):
+    """(mean ms, peak KiB) for one call of fn."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) * 1000 / repeat
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--use-env-db", action="store_true", help="benchmark DATABASE_URL instead of a temp SQLite DB")
+    args = parser.parse_args()
+
+    if not args.use_env_db:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    import orjson
+    from pydantic import TypeAdapter
+
+    from app import models, schemas
+    from app.database import SessionLocal
+    from app.migrate import run_migrations
+    from app.utils.pagination import paginate
+    from app.utils.projection import campaign_summary_columns, rows_as_dicts
+
+    run_migrations()
+    if not args.use_env_db:
+        db = SessionLocal()
+        print(f"Seeding {args.rows:,} campaigns...")
+        seed(db, models, args.rows)
+        db.close()
+
+    full_adapter = TypeAdapter(list[schemas.CampaignResponse])
+
+    def page(query_for, encode):
+        def run():
+            # A fresh session per page, as per request
+            db = SessionLocal()
+            try:
+                rows, _ = paginate(query_for(db), models.Campaign, None, args.page_size)
+                return encode(rows)
+            finally:
+                db.close()
+        return run
+
+    full = page(
+        lambda db: db.query(models.Campaign),
+        lambda rows: full_adapter.dump_json(full_adapter.validate_python(rows, from_attributes=True)),
+    )
+    projected = page(
+        lambda db: db.query(*campaign_summary_columns()),
+        lambda rows: orjson.dumps(rows_as_dicts(rows, schemas.CampaignSummary)),
+    )
+
+    # Same summary values either way; pydantic spells UTC as "Z", orjson as "+00:00"
+    summary_fields = schemas.CampaignSummary.model_fields
+    expected = [
+        {k: v.replace("Z", "+00:00") if isinstance(v, str) and k.endswith("_at") else v
+         for k, v in row.items() if k in summary_fields}
+        for row in orjson.loads(full())
+    ]
+    assert orjson.loads(projected()) == expected, "projected rows differ from CampaignResponse"
+
+    print(f"📋 Campaign list, {args.page_size}-row page")
+    print("=" * 60)
+    print(f"{'':<22} {'ms/page':>10} {'peak KiB':>10} {'body KiB':>10}")
+    for label, fn in (("ORM + CampaignResponse", full), ("projected summary", projected)):
+        ms, peak = measure(fn, args.repeat)
+        print(f"{label:<22} {ms:>10.2f} {peak:>10.0f} {len(fn()) / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Event ingestion benchmark: per-event ORM writes vs. in-memory aggregation.
+
+Seeds campaigns into a throwaway SQLite database (or uses DATABASE_URL with
+--use-env-db), then records impressions/clicks for random campaigns:
+
+- per-event: load the Campaign, add to its counter, commit (the old
+  /record endpoint)
+- aggregated: app.ingestion.record() from several threads while a flusher
+  thread calls flush() every INGEST_FLUSH_INTERVAL_MS
+
+Reports events/s for both and checks that the aggregated counts in the
+database add up to exactly what was recorded.
+
+Usage:
+    python scripts/bench_ingestion.py
+    python scripts/bench_ingestion.py --campaigns 5000 --seconds 5 --threads 4
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def seed(db, models, campaigns: int):
+    advertiser = models.User(name="Bench", email="bench@example.com", role="advertiser", country="US")
+    db.add(advertiser)
+    db.flush()
+    db.bulk_insert_mappings(models.Campaign, [
+        {
+            "advertiser_id": advertiser.id, "name": f"Campaign {i}", "industry_type": "Retail",
+            "start_date": date(2026, 1, 1), "end_date": date(2026, 2, 1), "budget": 100.0,
+            "status": models.CampaignStatus.ACTIVE, "coverage_type": models.CoverageType.STATE,
+            "target_country": "US", "impressions": 0, "clicks": 0,
+        }
+        for i in range(campaigns)
+    ])
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--campaigns", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of the aggregated run")
+    parser.add_argument("--threads", type=int, default=4, help="threads calling record()")
+    parser.add_argument("--per-event", type=int, default=500, help="events for the per-event baseline")
+    parser.add_argument("--use-env-db", action="store_true", help="benchmark DATABASE_URL instead of a temp SQLite DB")
+    args = parser.parse_args()
+
+    if not args.use_env_db:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from sqlalchemy import func, select
+
+    from app import ingestion, models
+    from app.config import settings
+    from app.database import SessionLocal
+    from app.migrate import run_migrations
+
+    run_migrations()
+    db = SessionLocal()
+    if not args.use_env_db:
+        print(f"Seeding {args.campaigns:,} campaigns...")
+        seed(db, models, args.campaigns)
+    ids = db.scalars(select(models.Campaign.id)).all()[:args.campaigns]
+
+    def totals():
+        db.expire_all()
+        return db.execute(select(
+            func.coalesce(func.sum(models.Campaign.impressions), 0),
+            func.coalesce(func.sum(models.Campaign.clicks), 0),
+        )).one()
+
+    # Per-event read-modify-write, as /record used to do
+    start = time.perf_counter()
+    for _ in range(args.per_event):
+        campaign = db.query(models.Campaign).filter(models.Campaign.id == random.choice(ids)).first()
+        campaign.impressions += 1
+        db.commit()
+    per_event_rate = args.per_event / (time.perf_counter() - start)
+
+    # Aggregated: producers call record(), a flusher writes batches
+    before = sum(totals())
+    stop = threading.Event()
+    produced = [0] * args.threads
+
+    def produce(slot: int):
+        rng = random.Random(slot)
+        n = 0
+        while not stop.is_set():
+            for _ in range(1000):
+                ingestion.record(rng.choice(ids), "click" if rng.random() < 0.02 else "impression")
+            n += 1000
+        produced[slot] = n
+
+    def flusher():
+        while not stop.is_set():
+            time.sleep(settings.INGEST_FLUSH_INTERVAL_MS / 1000)
+            ingestion.flush()
+
+    workers = [threading.Thread(target=produce, args=(i,)) for i in range(args.threads)]
+    workers.append(threading.Thread(target=flusher))
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    ingestion.flush()
+    elapsed = time.perf_counter() - start
+
+    recorded = sum(produced)
+    written = sum(totals()) - before
+    assert written == recorded, f"recorded {recorded} events but {written} reached the database"
+
+    print(f"📈 Event ingestion, {len(ids):,} campaigns")
+    print("=" * 60)
+    print(f"{'per-event ORM commit':<28} {per_event_rate:>12,.0f} events/s")
+    print(f"{f'aggregated ({args.threads} threads)':<28} {recorded / elapsed:>12,.0f} events/s")
+    print(f"{'flushes':<28} {ingestion.STATS['flushes']['ok']:>12,}  (last {ingestion.STATS['last_flush_duration'] * 1000:.1f} ms)")
+    print(f"All {recorded:,} events reached the database")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Middleware overhead benchmark.
+
+Compares the old @app.middleware("http") request logger (BaseHTTPMiddleware)
+with the pure ASGI RequestLogMiddleware, both behind the same CORSMiddleware.
+The app is driven directly over ASGI (no sockets), so the numbers isolate
+the middleware cost.
+
+Endpoints:
+  /api/health        - tiny JSON body
+  /api/campaigns     - representative list payload (100 campaign-like rows)
+
+Usage:
+    python scripts/bench_middleware.py
+    python scripts/bench_middleware.py --requests 20000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from app.logging_config import ACCESS_LOGGER
+from app.middleware import RequestLogMiddleware
+
+CAMPAIGNS = [
+    {
+        "id": i, "name": f"Campaign {i}", "industry_type": "Retail", "status": "ACTIVE",
+        "coverage_type": "state", "target_country": "US", "target_state": "CA",
+        "budget": 2500.0 + i, "start_date": date(2026, 1, 1).isoformat(), "end_date": date(2026, 12, 31).isoformat(),
+        "impressions": 1000 * i, "clicks": 10 * i,
+    }
+    for i in range(100)
+]
+
+
+def build_app(kind: str) -> FastAPI:
+    app = FastAPI()
+    access_logger = logging.getLogger(ACCESS_LOGGER)
+
+    if kind == "legacy":
+        @app.middleware("http")
+        async def log_requests(request, call_next):
+            start_time = time.time()
+            origin = request.headers.get("origin")
+            path = request.url.path
+            method = request.method
+            try:
+                response = await call_next(request)
+                process_time = (time.time() - start_time) * 1000
+                access_logger.info(
+                    "REQ: %s %s | Status: %d | Time: %.2fms", method, path, response.status_code, process_time,
+                    extra={"method": method, "path": path, "status_code": response.status_code, "origin": origin},
+                )
+                return response
+            except Exception as e:
+                return JSONResponse(status_code=500, content={"detail": "Internal Server Error", "error": str(e)})
+    else:
+        app.add_middleware(RequestLogMiddleware)
+
+    app.add_middleware(
+        CORSMiddleware, allow_origins=["http://localhost:5173"], allow_credentials=True,
+        allow_methods=["*"], allow_headers=["*"],
+    )
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "healthy", "timestamp": time.time()}
+
+    @app.get("/api/campaigns")
+    async def campaigns():
+        return CAMPAIGNS
+
+    return app
+
+
+async def drive(app, path: str, n: int) -> float:
+    """Mean seconds per request over `n` in-process ASGI calls."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"origin", b"http://localhost:5173")],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(min(200, n)):  # warm-up
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    # Measure middleware cost, not log output
+    logging.getLogger(ACCESS_LOGGER).disabled = True
+
+    print("⏱️  Middleware overhead benchmark")
+    print("=" * 60)
+    apps = {kind: build_app(kind) for kind in ("legacy", "asgi")}
+    for path in ("/api/health", "/api/campaigns"):
+        results = {kind: asyncio.run(drive(app, path, args.requests)) for kind, app in apps.items()}
+        legacy, asgi = results["legacy"], results["asgi"]
+        print(f"{path:<16} BaseHTTPMiddleware: {legacy * 1e6:8.1f} µs/req | "
+              f"pure ASGI: {asgi * 1e6:8.1f} µs/req | {(1 - asgi / legacy) * 100:5.1f}% faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Offset vs keyset pagination benchmark.
+
+Seeds campaigns into a throwaway SQLite database (or uses DATABASE_URL when
+--use-env-db is given and the table already has data) and times fetching one
+page at increasing depths with OFFSET and with the (created_at, id) cursor
+used by the list endpoints.
+
+Usage:
+    python scripts/bench_pagination.py
+    python scripts/bench_pagination.py --rows 200000 --page-size 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def seed(db, models, rows: int):
+    start = datetime(2024, 1, 1)
+    batch = []
+    for i in range(rows):
+        batch.append({
+            "advertiser_id": 1, "name": f"Campaign {i}", "industry_type": "Retail",
+            "start_date": date(2026, 1, 1), "end_date": date(2026, 2, 1), "budget": 100.0,
+            "status": models.CampaignStatus.DRAFT, "coverage_type": models.CoverageType.STATE,
+            "target_country": "US", "created_at": start + timedelta(seconds=i // 2),
+        })
+        if len(batch) == 5000:
+            db.bulk_insert_mappings(models.Campaign, batch)
+            batch = []
+    if batch:
+        db.bulk_insert_mappings(models.Campaign, batch)
+    db.commit()
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--use-env-db", action="store_true", help="benchmark DATABASE_URL instead of a temp SQLite DB")
+    args = parser.parse_args()
+
+    if not args.use_env_db:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from app import models
+    from app.database import SessionLocal
+    from app.migrate import run_migrations
+    from app.utils.pagination import paginate
+
+    run_migrations()
+    db = SessionLocal()
+    if not args.use_env_db:
+        print(f"Seeding {args.rows:,} campaigns...")
+        seed(db, models, args.rows)
+    total = db.query(models.Campaign).count()
+
+    print("📄 Pagination benchmark")
+    print("=" * 60)
+    print(f"{'depth (rows)':>14} {'OFFSET ms':>12} {'keyset ms':>12}")
+    base = db.query(models.Campaign)
+    depths = []
+    depth = args.page_size
+    while depth < total - args.page_size:
+        depths.append(depth)
+        depth *= 10
+    depths.append(total - args.page_size)  # last page
+    for depth in depths:
+        # Cursor for the page starting at `depth`, as a client would hold it
+        _, cursor = paginate(base, models.Campaign, None, depth)
+        offset_ms = timed(lambda: paginate(base, models.Campaign, None, args.page_size, offset=depth), args.repeat)
+        keyset_ms = timed(lambda: paginate(base, models.Campaign, cursor, args.page_size), args.repeat)
+        print(f"{depth:>14,} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Payload size / serialization benchmark.
+
+Fetches the large list endpoints and reports, per payload:
+  - identity size, and size + CPU time for gzip (levels 6 and 9) and
+    brotli (qualities 4 and 11, when the brotli package is installed)
+  - encode time with the stdlib json encoder vs orjson
+
+By default the real app runs in-process against a throwaway SQLite database
+seeded with representative rows (real US geo data, campaigns with copy and
+tags, users, transactions). With --base-url the bodies are fetched from a
+running deployment instead.
+
+Usage:
+    python scripts/bench_payloads.py
+    python scripts/bench_payloads.py --rows 2000
+    python scripts/bench_payloads.py --base-url https://api.example.com --token <admin JWT>
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+ENDPOINTS = [
+    "/api/campaigns/list",
+    "/api/admin/users",
+    "/api/admin/geodata",
+    "/api/payment/admin/transactions",
+    "/api/pricing/config",
+    "/api/geo/regions/US",
+]
+
+
+def timed(fn, repeat: int) -> float:
+    """Mean milliseconds per call."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def seed(rows: int):
+    """Create the schema in a temp SQLite DB, seed it and return an admin token."""
+    from app.migrate import run_migrations
+    run_migrations()
+
+    from app import models
+    from app.auth import create_access_token
+    from app.database import SessionLocal
+    from app.utils.geo_data_seed import US_STATES_DATA
+
+    db = SessionLocal()
+    try:
+        admin = models.User(name="Bench Admin", email="bench-admin@example.com", role="admin", country="US")
+        db.add(admin)
+        users = [
+            models.User(name=f"Advertiser {i}", email=f"advertiser{i}@example.com", role="advertiser",
+                        country="US", industry="Retail", created_at=datetime(2026, 1, 1) + timedelta(hours=i))
+            for i in range(min(rows, 100))
+        ]
+        db.add_all(users)
+        db.flush()
+
+        for name, code, fips, pop, dens_mi, rank, pct, area, radius_count, mult in US_STATES_DATA:
+            db.add(models.GeoData(
+                country_code="US", state_code=code, state_name=name, population=pop, land_area_sq_km=area,
+                density_multiplier=mult, fips=fips, density_mi=dens_mi, rank=rank,
+                population_percent=pct, radius_areas_count=radius_count,
+            ))
+
+        states = [row[1] for row in US_STATES_DATA]
+        for i in range(rows):
+            owner = users[i % len(users)]
+            db.add(models.Campaign(
+                advertiser_id=owner.id, name=f"Spring promotion {i}", industry_type="Retail",
+                start_date=date(2026, 3, 1), end_date=date(2026, 5, 31), budget=2500.0 + i,
+                calculated_price=1875.25 + i, status=models.CampaignStatus.ACTIVE,
+                coverage_type=models.CoverageType.STATE, target_country="US", target_state=states[i % len(states)],
+                coverage_area=f"{states[i % len(states)]}, United States", impressions=1000 * i, clicks=13 * i,
+                headline="Save 20% on everything this spring",
+                description="Seasonal campaign targeting returning customers with a limited-time discount.",
+                landing_page_url=f"https://shop.example.com/spring?utm_campaign={i}", ad_format="Leaderboard",
+                tags=["spring", "sale", "retail"], created_at=datetime(2026, 2, 1) + timedelta(minutes=i),
+            ))
+        db.flush()
+
+        for i in range(rows):
+            db.add(models.PaymentTransaction(
+                campaign_id=i + 1, user_id=users[i % len(users)].id, stripe_payment_intent_id=f"pi_bench_{i:08d}",
+                amount=1875.25 + i, currency="USD", status="succeeded", payment_method="card",
+                created_at=datetime(2026, 2, 1) + timedelta(minutes=i), completed_at=datetime(2026, 2, 1) + timedelta(minutes=i, seconds=5),
+            ))
+        db.commit()
+        return create_access_token({"sub": str(admin.id)})
+    finally:
+        db.close()
+
+
+def fetch_local(rows: int, repeat: int):
+    """Yield (path, body, server ms identity, server ms compressed) from the in-process app."""
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("SKIP_GEO_CHECK", "true")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    headers = {"Authorization": f"Bearer {seed(rows)}"}
+    client = TestClient(app)
+    for path in ENDPOINTS:
+        resp = client.get(path, headers={**headers, "Accept-Encoding": "identity"})
+        if resp.status_code != 200:
+            print(f"  {path}: HTTP {resp.status_code}, skipped")
+            continue
+        plain = timed(lambda: client.get(path, headers={**headers, "Accept-Encoding": "identity"}), repeat)
+        encoded = timed(lambda: client.get(path, headers={**headers, "Accept-Encoding": "br, gzip"}), repeat)
+        yield path, resp.content, plain, encoded
+
+
+def fetch_remote(base_url: str, token: str):
+    for path in ENDPOINTS:
+        req = urllib.request.Request(base_url.rstrip("/") + path, headers={
+            "Authorization": f"Bearer {token}", "Accept-Encoding": "identity",
+        })
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                yield path, resp.read(), None, None
+        except OSError as exc:
+            print(f"  {path}: {exc}, skipped")
+
+
+def report(path: str, body: bytes, repeat: int, server_plain=None, server_encoded=None):
+    import orjson
+    from app.utils.compression import available_encodings, compress
+
+    payload = json.loads(body)
+    print(f"\n{path}  ({len(body):,} bytes identity)")
+    stdlib_ms = timed(lambda: json.dumps(payload).encode(), repeat)
+    orjson_ms = timed(lambda: orjson.dumps(payload), repeat)
+    print(f"  encode   stdlib json {stdlib_ms:7.3f} ms | orjson {orjson_ms:7.3f} ms | {stdlib_ms / orjson_ms:4.1f}x")
+
+    levels = [("gzip", 6), ("gzip", 9)]
+    if "br" in available_encodings():
+        levels += [("br", 4), ("br", 11)]
+    for encoding, level in levels:
+        size = len(compress(body, encoding, level))
+        ms = timed(lambda: compress(body, encoding, level), repeat)
+        print(f"  {encoding:<4}-{level:<2}  {size:>9,} bytes ({size / len(body) * 100:5.1f}%) | {ms:7.3f} ms")
+
+    if server_plain is not None:
+        print(f"  request  identity {server_plain:7.2f} ms | compressed {server_encoded:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="campaigns/transactions to seed (local mode)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--base-url", help="benchmark a running deployment instead of the in-process app")
+    parser.add_argument("--token", help="admin bearer token for --base-url")
+    args = parser.parse_args()
+
+    print("📦 Payload benchmark")
+    print("=" * 60)
+    if args.base_url:
+        for path, body, _, _ in fetch_remote(args.base_url, args.token or ""):
+            report(path, body, args.repeat)
+    else:
+        for path, body, plain, encoded in fetch_local(args.rows, args.repeat):
+            report(path, body, args.repeat, plain, encoded)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Startup-time benchmark.
+
+Reports:
+  1. The slowest imports when loading app.main (from `python -X importtime`)
+  2. Whether any deferred heavy dependency was imported at boot
+  3. Time from launching uvicorn until /api/health returns 200
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --top 30 --budget-ms 1500
+
+Exits non-zero if a deferred module is imported at boot or if the
+time-to-first-200 exceeds --budget-ms, so it can run in CI.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that must only be imported on first use, never at worker start
+DEFERRED_MODULES = ["boto3", "botocore", "stripe", "PIL", "authlib", "dateutil", "numpy"]
+
+
+def import_profile():
+    """Run `python -X importtime -c 'import app.main'` and parse its report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, env=_child_env(),
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line.split(":", 1)[1].split("|"))
+        if not self_us.isdigit():
+            continue  # header row
+        rows.append((name, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_200(path: str = "/api/health", timeout: float = 60.0) -> float:
+    """Seconds from spawning uvicorn until `path` answers 200."""
+    port = free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=_child_env(),
+    )
+    try:
+        url = f"http://127.0.0.1:{port}{path}"
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"{path} did not return 200 within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def _child_env():
+    env = dict(os.environ)
+    env.setdefault("DEBUG", "false")
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=20, help="number of slowest imports to show")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if time-to-first-200 exceeds this")
+    parser.add_argument("--path", default="/api/health", help="endpoint to poll for the first 200")
+    args = parser.parse_args()
+
+    print("🚀 Startup benchmark")
+    print("=" * 60)
+
+    rows = import_profile()
+    app_main = next((cum for name, _, cum in rows if name == "app.main"), None)
+    if app_main is not None:
+        print(f"import app.main: {app_main / 1000:.1f} ms cumulative")
+    print(f"\nSlowest {args.top} imports (cumulative ms, self ms):")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:9.1f}  {self_us / 1000:8.1f}  {name}")
+
+    failed = False
+    loaded = {name for name, _, _ in rows}
+    eager = [mod for mod in DEFERRED_MODULES if mod in loaded]
+    if eager:
+        failed = True
+        print(f"\n❌ Deferred modules imported at boot: {', '.join(eager)}")
+    else:
+        print("\n✅ No deferred modules imported at boot")
+
+    elapsed = time_to_first_200(args.path)
+    print(f"\n⏱️  Time to first 200 on {args.path}: {elapsed * 1000:.0f} ms")
+    if args.budget_ms is not None and elapsed * 1000 > args.budget_ms:
+        failed = True
+        print(f"❌ Over budget ({args.budget_ms:.0f} ms)")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Dashboard totals benchmark: ORM hydration vs. one conditional-aggregate SELECT.
+
+Seeds advertisers with campaigns in every status into a throwaway SQLite
+database (or uses DATABASE_URL with --use-env-db) and, for one advertiser,
+compares three ways of producing the /api/stats and
+/api/analytics/user/summary totals:
+
+- ORM + Python sums: load every Campaign and sum impressions, clicks,
+  calculated_price and budget in list comprehensions (what both endpoints
+  used to do)
+- conditional aggregate: summaries.campaign_totals(), one SELECT with
+  SUM/COUNT over CASE on status (what builds a summary row in full, and what
+  the admin /api/stats branch runs)
+- summary read: summaries.get_summary(), the cached summary row the
+  advertiser endpoints serve
+
+Checks that all three agree.
+
+Usage:
+    python scripts/bench_summaries.py
+    python scripts/bench_summaries.py --campaigns 10000 --advertisers 3
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def seed(db, models, advertisers: int, campaigns: int):
+    statuses = list(models.CampaignStatus)
+    for n in range(advertisers):
+        advertiser = models.User(name=f"Bench {n}", email=f"bench{n}@example.com", role="advertiser", country="US")
+        db.add(advertiser)
+        db.flush()
+        batch = []
+        for i in range(campaigns):
+            batch.append({
+                "advertiser_id": advertiser.id, "name": f"Campaign {i}", "industry_type": "Retail",
+                "start_date": date(2026, 1, 1), "end_date": date(2026, 2, 1), "budget": 100.0 + i % 7,
+                "calculated_price": 50.0 + i % 13, "status": statuses[i % len(statuses)],
+                "coverage_type": models.CoverageType.STATE, "target_country": "US",
+                "impressions": 1000 + i, "clicks": i % 50,
+            })
+            if len(batch) == 5000:
+                db.bulk_insert_mappings(models.Campaign, batch)
+                batch = []
+        if batch:
+            db.bulk_insert_mappings(models.Campaign, batch)
+        db.commit()
+
+
+def measure(fn, repeat: int) -> float:
+    """Mean ms for one call of fn."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--campaigns", type=int, default=10000, help="campaigns per advertiser")
+    parser.add_argument("--advertisers", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--use-env-db", action="store_true", help="benchmark DATABASE_URL instead of a temp SQLite DB")
+    args = parser.parse_args()
+
+    if not args.use_env_db:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from sqlalchemy import func, select
+
+    from app import models, summaries
+    from app.database import SessionLocal
+    from app.migrate import run_migrations
+
+    run_migrations()
+    db = SessionLocal()
+    if not args.use_env_db:
+        print(f"Seeding {args.advertisers} advertisers x {args.campaigns:,} campaigns...")
+        seed(db, models, args.advertisers, args.campaigns)
+    advertiser_id = db.scalar(
+        select(models.Campaign.advertiser_id).group_by(models.Campaign.advertiser_id)
+        .order_by(func.count().desc()).limit(1)
+    )
+    if advertiser_id is None:
+        raise SystemExit("No campaigns to benchmark")
+
+    def hydrated():
+        # A fresh session per call, as per request
+        session = SessionLocal()
+        try:
+            campaigns = session.query(models.Campaign).filter(models.Campaign.advertiser_id == advertiser_id).all()
+            return {
+                "total_campaigns": len(campaigns),
+                "active_campaigns": len([c for c in campaigns if c.status in summaries.ACTIVE_STATUSES]),
+                "total_budget": sum(c.budget or 0 for c in campaigns),
+                "total_spent": sum(c.calculated_price or 0 for c in campaigns if c.status in summaries.SPENT_STATUSES),
+                "impressions": sum(c.impressions or 0 for c in campaigns),
+                "clicks": sum(c.clicks or 0 for c in campaigns),
+            }
+        finally:
+            session.close()
+
+    def aggregated():
+        session = SessionLocal()
+        try:
+            totals = summaries.campaign_totals(session, models.Campaign.advertiser_id == advertiser_id)
+            return {
+                **{key: totals[key] for key in ("total_campaigns", "total_budget", "total_spent", "impressions", "clicks")},
+                "active_campaigns": sum(totals["status_counts"].get(s.value.lower(), 0) for s in summaries.ACTIVE_STATUSES),
+            }
+        finally:
+            session.close()
+
+    def summary_read():
+        session = SessionLocal()
+        try:
+            return summaries.get_summary(session, advertiser_id)
+        finally:
+            session.close()
+
+    expected = hydrated()
+    got = aggregated()
+    assert got.keys() == expected.keys() and all(
+        abs(got[key] - expected[key]) < 1e-6 for key in expected
+    ), f"conditional aggregate {got} != ORM sums {expected}"
+    summaries.rebuild_all(db)
+    summary = summary_read()
+    assert all(abs(summary[key] - expected[key]) < 1e-6 for key in expected), f"summary row {summary} != ORM sums {expected}"
+
+    print(f"📊 Dashboard totals, {expected['total_campaigns']:,} campaigns for one advertiser")
+    print("=" * 60)
+    for label, fn in (
+        ("ORM + Python sums", hydrated),
+        ("conditional aggregate", aggregated),
+        ("summary read (cached)", summary_read),
+    ):
+        print(f"{label:<24} {measure(fn, args.repeat):>10.2f} ms")
+    print("All three agree")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
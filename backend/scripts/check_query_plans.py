@@ -0,0 +1,189 @@
+"""
+Query-plan check for the hot queries.
+
+Builds each hot query the way the routers do, asks the database for its
+plan and asserts that the expected index is used. Runs against a throwaway
+SQLite database migrated to head, or against DATABASE_URL with --use-env-db
+(use this for Postgres; sequential scans are disabled for the check so small
+tables still report the index the planner would pick at scale).
+
+Usage:
+    python scripts/check_query_plans.py
+    DATABASE_URL=postgresql://... python scripts/check_query_plans.py --use-env-db
+
+Exits non-zero if any query misses its index, so it can run in CI.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+
+from sqlalchemy import String, func, literal, tuple_
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def hot_queries(db, models):
+    """(description, query, acceptable index names) for every hot path."""
+    Campaign, Notification, Media = models.Campaign, models.Notification, models.Media
+    Invoice, PaymentTransaction = models.Invoice, models.PaymentTransaction
+    Hourly, Daily = models.CampaignStatsHourly, models.CampaignStatsDaily
+    Breakdown, Monthly = models.CampaignStatsBreakdown, models.CampaignStatsBreakdownMonthly
+    Reach = models.CampaignReachDaily
+    from app import scheduler, summaries
+    newest = (Campaign.created_at.desc(), Campaign.id.desc())
+    # Same bound paginate() builds: stored text on SQLite, a timestamp elsewhere
+    if db.get_bind().dialect.name == "sqlite":
+        cursor_bound = literal("2026-01-01 00:00:00", String)
+    else:
+        cursor_bound = datetime(2026, 1, 1)
+
+    return [
+        ("campaigns/list (advertiser, verified country)",
+         db.query(Campaign).filter(Campaign.advertiser_id == 1, Campaign.target_country == "US").order_by(*newest).limit(101),
+         {"ix_campaigns_advertiser_country_created", "ix_campaigns_advertiser_created_id"}),
+        ("campaigns/list (country admin, by status)",
+         db.query(Campaign).filter(Campaign.target_country == "US", Campaign.status == models.CampaignStatus.ACTIVE).order_by(*newest).limit(101),
+         {"ix_campaigns_country_status", "ix_campaigns_country_created_id"}),
+        ("admin/campaigns (keyset page)",
+         db.query(Campaign).filter(tuple_(Campaign.created_at, Campaign.id) < tuple_(cursor_bound, 500)).order_by(*newest).limit(101),
+         {"ix_campaigns_created_id"}),
+        ("approval queue",
+         db.query(Campaign).filter(Campaign.status.in_([models.CampaignStatus.PENDING_REVIEW, models.CampaignStatus.PENDING])).order_by(Campaign.submitted_at.asc()),
+         {"ix_campaigns_status_submitted"}),
+        ("campaigns by advertiser (compat list)",
+         db.query(Campaign).filter(Campaign.advertiser_id == 1),
+         {"ix_campaigns_advertiser_created_id", "ix_campaigns_advertiser_country_created"}),
+        ("advertiser summary refresh",
+         db.query(Campaign.advertiser_id, *summaries._totals_columns()).filter(Campaign.advertiser_id.in_([1, 2]))
+           .group_by(Campaign.advertiser_id),
+         {"ix_campaigns_advertiser_created_id", "ix_campaigns_advertiser_country_created"}),
+        ("notifications feed",
+         db.query(Notification).filter(Notification.user_id == 1).order_by(Notification.created_at.desc()).limit(50),
+         {"ix_notifications_user_created"}),
+        ("notifications mark-all-read",
+         db.query(Notification).filter(Notification.user_id == 1, Notification.is_read == False),  # noqa: E712
+         {"ix_notifications_user_unread"}),
+        ("media pending approval",
+         db.query(Media).filter(Media.approved_status == models.MediaApprovalStatus.PENDING).order_by(Media.uploaded_at.desc()),
+         {"ix_media_status_uploaded"}),
+        ("media by campaign",
+         db.query(Media).filter(Media.campaign_id == 1),
+         {"ix_media_campaign_id"}),
+        ("payment already-paid check",
+         db.query(PaymentTransaction).filter(PaymentTransaction.campaign_id == 1, PaymentTransaction.status == "succeeded"),
+         {"ix_payment_transactions_campaign_status"}),
+        ("payment/transactions (user)",
+         db.query(PaymentTransaction).filter(PaymentTransaction.user_id == 1)
+           .order_by(PaymentTransaction.created_at.desc(), PaymentTransaction.id.desc()).limit(101),
+         {"ix_payment_transactions_user_created_id"}),
+        ("invoices by campaign",
+         db.query(Invoice).filter(Invoice.campaign_id == 1),
+         {"ix_invoices_campaign_id"}),
+        *(("scheduler: " + t.name, db.query(Campaign.id).filter(scheduler.due_filter(t, datetime(2026, 1, 1).date())).limit(500), {index})
+          for t, index in zip(scheduler.TRANSITIONS, ("ix_campaigns_approved_start", "ix_campaigns_active_end"))),
+        ("campaign timeseries (hourly)",
+         db.query(Hourly.bucket, Hourly.impressions, Hourly.clicks)
+           .filter(Hourly.campaign_id == 1, Hourly.bucket >= datetime(2026, 1, 1), Hourly.bucket < datetime(2026, 1, 8)),
+         {"sqlite_autoindex_campaign_stats_hourly_1", "campaign_stats_hourly_pkey"}),
+        ("campaign timeseries (daily)",
+         db.query(Daily.bucket, Daily.impressions, Daily.clicks)
+           .filter(Daily.campaign_id == 1, Daily.bucket >= datetime(2026, 1, 1).date(), Daily.bucket < datetime(2026, 2, 1).date()),
+         {"sqlite_autoindex_campaign_stats_daily_1", "campaign_stats_daily_pkey"}),
+        ("campaign breakdown, days (device, state)",
+         db.query(Breakdown.device_id, Breakdown.state_id, func.sum(Breakdown.impressions), func.sum(Breakdown.clicks))
+           .filter(Breakdown.campaign_id == 1, Breakdown.bucket >= datetime(2026, 1, 15).date(), Breakdown.bucket < datetime(2026, 2, 1).date())
+           .group_by(Breakdown.device_id, Breakdown.state_id),
+         {"sqlite_autoindex_campaign_stats_breakdown_1", "campaign_stats_breakdown_pkey"}),
+        ("campaign breakdown, whole months (device, state)",
+         db.query(Monthly.device_id, Monthly.state_id, func.sum(Monthly.impressions), func.sum(Monthly.clicks))
+           .filter(Monthly.campaign_id == 1, Monthly.bucket >= datetime(2026, 1, 1).date(), Monthly.bucket < datetime(2027, 1, 1).date())
+           .group_by(Monthly.device_id, Monthly.state_id),
+         {"sqlite_autoindex_campaign_stats_breakdown_monthly_1", "campaign_stats_breakdown_monthly_pkey"}),
+        ("campaign unique reach (range)",
+         db.query(Reach.sketch).filter(Reach.campaign_id.in_([1, 2]), Reach.bucket >= datetime(2026, 1, 1).date()),
+         {"sqlite_autoindex_campaign_reach_daily_1", "campaign_reach_daily_pkey"}),
+        ("campaign stats rollup (one day)",
+         db.query(Hourly.campaign_id, func.sum(Hourly.impressions), func.sum(Hourly.clicks))
+           .filter(Hourly.bucket >= datetime(2026, 1, 1), Hourly.bucket < datetime(2026, 1, 2)).group_by(Hourly.campaign_id),
+         {"ix_campaign_stats_hourly_bucket"}),
+        ("invoices by user and status",
+         db.query(Invoice).filter(Invoice.user_id == 1, Invoice.status == "pending"),
+         {"ix_invoices_user_status"}),
+    ]
+
+
+def _sql(conn, query) -> str:
+    return str(query.statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def sqlite_indexes(conn, query):
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + _sql(conn, query)).fetchall()
+    details = [row[-1] for row in rows]
+    return set(re.findall(r"USING (?:COVERING )?INDEX (\w+)", " ".join(details))), details
+
+
+def postgres_indexes(conn, query):
+    conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + _sql(conn, query)).scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    names, nodes = set(), []
+
+    def walk(node):
+        nodes.append(node.get("Node Type"))
+        if "Index Name" in node:
+            names.add(node["Index Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return names, nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--use-env-db", action="store_true", help="check DATABASE_URL instead of a temp SQLite DB")
+    args = parser.parse_args()
+
+    if not args.use_env_db:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/plans.db"
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from app import models
+    from app.database import SessionLocal, engine
+    from app.migrate import run_migrations
+
+    run_migrations()
+    dialect = engine.dialect.name
+    explain = sqlite_indexes if dialect == "sqlite" else postgres_indexes
+
+    print(f"🔎 Query plans ({dialect})")
+    print("=" * 60)
+    db = SessionLocal()
+    failures = 0
+    try:
+        queries = hot_queries(db, models)
+        for description, query, expected in queries:
+            with engine.connect() as conn, conn.begin():
+                used, plan = explain(conn, query)
+            if used & expected:
+                print(f"✅ {description}: {', '.join(sorted(used & expected))}")
+            else:
+                failures += 1
+                print(f"❌ {description}: expected one of {sorted(expected)}, plan: {plan}")
+    finally:
+        db.close()
+
+    if failures:
+        print(f"\n{failures} of {len(queries)} queries missed their index")
+    else:
+        print("\nAll hot queries use an index")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,18 +8,18 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.database import SessionLocal, engine, Base
+from app.database import SessionLocal
+from app.migrate import run_migrations
 from app import models
 from app.auth import get_password_hash
 from app.constants import SUPPORTED_INDUSTRIES
 
 
 def init_database():
-    """Create all database tables if they don't exist."""
-    print("Initializing database tables...")
-    # Base.metadata.drop_all(bind=engine) # RE-RUNNING THIS WIPES ALL DATA. Disabled for persistence.
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables ensured")
+    """Bring the schema up to date by applying all migrations."""
+    print("Applying database migrations...")
+    run_migrations()
+    print("✅ Database schema up to date")
 
 
 def seed_data():